@@ -40,9 +40,100 @@ class Settings(BaseSettings):
         # "x.x.x.x": "CAM-EXIT",
     }
 
+    # ── Camera Polling (pull mode via ISAPI alertStream) ──────────────────
+    CAMERA_POLLING_ENABLED: bool = False          # Pull events instead of waiting for webhooks
+    POLLER_IDLE_TIMEOUT_SECONDS: float = 60.0     # No bytes for this long → stream is stalled
+    POLLER_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    POLLER_STARTUP_SPREAD_SECONDS: float = 10.0   # Spread initial connects over this window
+    POLLER_SHARDING_ENABLED: bool = False         # Split cameras across workers via PG advisory locks
+    POLLER_REBALANCE_SECONDS: float = 15.0        # Ownership rebalance / failover interval
+
+    # ── Event Ingest / Work Queue ─────────────────────────────────────────
+    EVENT_INGEST_MODE: str = "inline"             # inline | queue (enqueue only; workers process)
+    EVENT_QUEUE_WORKERS: int = 0                  # In-process queue worker tasks (0 = none)
+    EVENT_QUEUE_BATCH_SIZE: int = 50
+    EVENT_QUEUE_VISIBILITY_SECONDS: int = 60      # Claimed rows reappear if not acked in time
+    EVENT_QUEUE_MAX_ATTEMPTS: int = 5             # Then moved to event_dead_letter
+    EVENT_QUEUE_POLL_SECONDS: float = 0.5         # Idle poll interval when the queue is empty
+
+    # ── Event Ordering ────────────────────────────────────────────────────
+    EVENT_REORDER_LATENESS_SECONDS: float = 0.0   # Per-camera reorder window on trigger_time (0 = off; inline ingest only)
+
+    # ── Zone Actors ───────────────────────────────────────────────────────
+    ZONE_ACTORS_ENABLED: bool = True              # One single-writer task per occupancy zone
+    ZONE_ACTOR_BATCH_SIZE: int = 100              # Max mailbox messages applied per DB write
+    ZONE_ACTOR_MAX_ATTEMPTS: int = 3              # Then the batch goes to logs/zone_actor_dead_letter.jsonl
+
+    # ── Parking Sessions (Phase 2) ────────────────────────────────────────
+    PARKING_SESSION_MAX_HOURS: int = 24           # Open sessions older than this are expired
+    PARKING_SESSION_SWEEP_SECONDS: int = 300      # Sweeper interval
+    LOCAL_TIMEZONE: str = "Asia/Riyadh"           # "Today" for gate counters rolls over at local midnight
+
+    # ── Overstay Detection (Phase 2) ──────────────────────────────────────
+    OVERSTAY_ENABLED: bool = True
+    OVERSTAY_ALLOWANCE_HOURS: dict = {            # vehicle_type → allowed hours; unlisted types never overstay
+        "visitor": 4,
+        "unknown": 4,
+    }
+    OVERSTAY_TICK_SECONDS: float = 10.0           # Timer wheel resolution
+
+    # ── Parking Analytics Sketches (Phase 2) ──────────────────────────────
+    SKETCH_FLUSH_SECONDS: int = 60                # Merge in-memory sketch deltas into parking_sketches
+    TDIGEST_COMPRESSION: int = 100                # Higher = more accurate percentiles, bigger sketches
+    HLL_PRECISION: int = 12                       # 2^p registers; ~1.6% unique-count error at 12
+
+    # ── Plate Matching (Phase 2) ──────────────────────────────────────────
+    PLATE_FUZZY_MAX_DISTANCE: int = 1             # Edits tolerated after confusable folding when pairing exits (0 = exact only)
+
+    # ── Vehicle Import (Phase 2) ──────────────────────────────────────────
+    VEHICLE_IMPORT_BATCH_SIZE: int = 500          # Rows per INSERT ... ON CONFLICT statement
+    VEHICLE_IMPORT_MAX_ERRORS: int = 1000         # Row errors listed in the import report (all are counted)
+
     # ── Thresholds ────────────────────────────────────────────────────────
     OCCUPANCY_ALERT_THRESHOLD: float = 0.90     # Alert at 90% full
+    OCCUPANCY_CLEAR_THRESHOLD: float = 0.75     # Auto-resolve once back below 75%
     INTRUSION_COOLDOWN_SECONDS: int = 30         # Suppress re-alerts within 30s
+    INCIDENT_WINDOW_SECONDS: int = 30            # Alerts on a zone within 30s form one incident
+
+    # ── Violation Dwell (UC5) ─────────────────────────────────────────────
+    VIOLATION_DWELL_SECONDS: dict = {            # Seeds dwell_seconds of the default zone rules
+        "no-parking-zone": 120,                  # Zones not listed alert immediately
+        "loading-bay": 300,
+    }
+    DWELL_IDLE_TIMEOUT_SECONDS: float = 30.0     # No "active" event for this long = vehicle gone
+    DWELL_TICK_SECONDS: float = 1.0              # Dwell timer resolution
+
+    # ── Alert Sink & Notifications ────────────────────────────────────────
+    ALERT_SINK_ENABLED: bool = True              # Batch alert inserts off the ingest path
+    ALERT_SINK_BATCH_SIZE: int = 200             # Max alerts per insert transaction
+    ALERT_SINK_FLUSH_SECONDS: float = 0.2        # Max time an alert waits for its batch
+    ALERT_SINK_QUEUE_SIZE: int = 10000           # When full, alerts are written inline
+    ALERT_WEBHOOK_URL: Optional[str] = None      # POST each alert as JSON
+    ALERT_SYSLOG_HOST: Optional[str] = None      # UDP syslog target
+    ALERT_SYSLOG_PORT: int = 514
+    ALERT_SMTP_HOST: Optional[str] = None        # e.g. a local relay / MailHog
+    ALERT_SMTP_PORT: int = 25
+    ALERT_SMTP_FROM: str = "damanat-pms@localhost"
+    ALERT_SMTP_TO: str = ""                      # Comma-separated recipients
+    NOTIFIER_QUEUE_SIZE: int = 1000              # Per notifier; overflow goes to the dead-letter log
+    NOTIFIER_MAX_ATTEMPTS: int = 5
+    NOTIFIER_BACKOFF_SECONDS: float = 1.0        # Doubles per retry, capped at 60s
+
+    # ── Live Feed (SSE / WebSocket) ───────────────────────────────────────
+    LIVE_BUFFER_SIZE: int = 1000                 # Messages kept for Last-Event-ID resume
+    LIVE_SUBSCRIBER_QUEUE_SIZE: int = 256        # Per client; a client further behind replays from the buffer
+    LIVE_HEARTBEAT_SECONDS: float = 15.0         # Keep-alive for idle connections
+
+    # ── Dashboard ─────────────────────────────────────────────────────────
+    DASHBOARD_LATEST_ALERTS: int = 20            # Alerts shown in /dashboard/summary
+    DASHBOARD_RESYNC_SECONDS: int = 60           # Reload from DB (picks up other workers' changes)
+
+    # ── Exports ───────────────────────────────────────────────────────────
+    EXPORT_CHUNK_ROWS: int = 5000                # Rows fetched per server-side cursor round trip
+
+    # ── Health Monitor ────────────────────────────────────────────────────
+    HEALTH_CHECK_INTERVAL_SECONDS: int = 30      # Background camera probe interval
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 3.0    # Per-probe timeout (probes run concurrently)
 
     # ── Logging ───────────────────────────────────────────────────────────
     LOG_LEVEL: str = "INFO"
@@ -5,10 +5,16 @@ Uses SQLAlchemy with PostgreSQL. All models are auto-imported here
 so create_tables() creates every table in one call.
 """
 
-from sqlalchemy import create_engine
+import re
+from sqlalchemy import Index, create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateIndex
 from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 engine = create_engine(
     settings.DATABASE_URL,
@@ -40,9 +46,130 @@ def create_tables():
     # Phase 1 models
     from app.models.camera_event import CameraEvent       # noqa
     from app.models.zone_occupancy import ZoneOccupancy   # noqa
+    from app.models.incident import Incident               # noqa
     from app.models.alert import Alert                     # noqa
+    from app.models.zone_rule import ZoneRule              # noqa
     # Phase 2 models
     from app.models.vehicle import Vehicle                 # noqa
     from app.models.entry_exit_log import EntryExitLog     # noqa
+    from app.models.parking_session import ParkingSession  # noqa
+    from app.models.parking_rollup import ParkingRollup    # noqa
+    from app.models.parking_sketch import ParkingSketch    # noqa
+    # Infrastructure
+    from app.models.event_queue import EventQueueItem, EventDeadLetter  # noqa
 
+    create_extensions()
     Base.metadata.create_all(bind=engine)
+    upgrade_schema()
+
+
+# Extensions some indexes depend on. pg_trgm is a trusted extension (PG 13+),
+# so the database owner can create it without superuser rights. A role that
+# may not create it only loses the indexes that need it (see extension_installed).
+SCHEMA_EXTENSIONS = [
+    "pg_trgm",          # trigram GIN indexes for partial plate search
+]
+
+installed_extensions: set[str] = set()
+
+
+def create_extensions():
+    """Create each extension in its own transaction; a failure is logged, not raised."""
+    for name in SCHEMA_EXTENSIONS:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f"CREATE EXTENSION IF NOT EXISTS {name}"))
+            installed_extensions.add(name)
+        except SQLAlchemyError as e:
+            logger.warning(f"[DB] Extension {name} unavailable, indexes that need it are skipped: {e}")
+
+
+def extension_installed(ddl, target, bind, **kw) -> bool:
+    """ddl_if() condition for indexes tagged info={"requires_extension": name}."""
+    required = target.info.get("requires_extension")
+    return required is None or required in installed_extensions
+
+
+# Columns added to existing tables after their first release. create_all() only
+# creates missing tables, so these are applied idempotently on every startup.
+SCHEMA_UPGRADES = [
+    "ALTER TABLE parking_sessions ADD COLUMN IF NOT EXISTS overstay_alerted_at TIMESTAMP",
+    "ALTER TABLE alerts ADD COLUMN IF NOT EXISTS incident_id INTEGER REFERENCES incidents(id)",
+    "ALTER TABLE event_queue ADD COLUMN IF NOT EXISTS camera_event_id BIGINT",
+    "ALTER TABLE event_queue ADD COLUMN IF NOT EXISTS done_handlers VARCHAR(200)",
+]
+
+# Tables that can be big enough for a plain CREATE INDEX to block writes for
+# minutes. Missing indexes on them are not built at startup but by
+# scripts/setup/create_indexes.py with CREATE INDEX CONCURRENTLY.
+LARGE_TABLES = {"camera_events", "alerts", "entry_exit_log", "vehicles"}
+
+# Single-column indexes superseded by composite (…, id) indexes that start with the same column.
+# Dropped by create_indexes.py once the replacements exist.
+RETIRED_INDEXES = [
+    "ix_camera_events_camera_id", "ix_camera_events_event_type", "ix_camera_events_created_at",
+    "ix_alerts_alert_type", "ix_alerts_triggered_at",
+    "ix_entry_exit_log_event_time",
+]
+
+
+def _existing_indexes(conn) -> dict[str, bool]:
+    """Index name → valid. A failed CONCURRENTLY build leaves an invalid index behind."""
+    rows = conn.execute(text(
+        "SELECT c.relname, i.indisvalid FROM pg_index i "
+        "JOIN pg_class c ON c.oid = i.indexrelid "
+        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE n.nspname = current_schema()"
+    ))
+    return {name: valid for name, valid in rows}
+
+
+def _missing_indexes(existing: dict[str, bool]) -> list[Index]:
+    return [
+        index
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+        if not existing.get(index.name) and extension_installed(None, index, None)
+    ]
+
+
+def upgrade_schema():
+    """Add new columns to existing tables and build missing indexes on the small ones."""
+    with engine.begin() as conn:
+        for stmt in SCHEMA_UPGRADES:
+            conn.execute(text(stmt))
+        deferred = []
+        for index in _missing_indexes(_existing_indexes(conn)):
+            if index.table.name in LARGE_TABLES:
+                deferred.append(index.name)
+            else:
+                index.create(conn, checkfirst=True)
+    if deferred:
+        logger.warning(f"[DB] {len(deferred)} index(es) missing on large tables, "
+                       f"run scripts/setup/create_indexes.py: {', '.join(deferred)}")
+
+
+def create_index_concurrently_sql(index: Index) -> str:
+    """CREATE [UNIQUE] INDEX CONCURRENTLY IF NOT EXISTS … for a model index."""
+    sql = str(CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect))
+    return re.sub(r"^CREATE (UNIQUE )?INDEX ", r"CREATE \1INDEX CONCURRENTLY ", sql)
+
+
+def build_indexes_concurrently() -> list[str]:
+    """
+    Build every missing model index without blocking writes, then drop the
+    retired ones. CONCURRENTLY cannot run inside a transaction, so this uses an
+    autocommit connection; invalid leftovers of an interrupted run are rebuilt.
+    Returns the names of the indexes built.
+    """
+    built = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        existing = _existing_indexes(conn)
+        for index in _missing_indexes(existing):
+            if index.name in existing:
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}"))
+            conn.execute(text(create_index_concurrently_sql(index)))
+            built.append(index.name)
+        for name in RETIRED_INDEXES:
+            conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    return built
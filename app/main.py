@@ -8,10 +8,11 @@ from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
-from app.routers import events, occupancy, violations, intrusion, health, alerts
+from app.routers import events, occupancy, violations, intrusion, health, alerts, pollers, zone_rules, incidents, live, dashboard, exports, metrics
 from app.database import create_tables
 from app.config import settings
 from app.utils.logger import get_logger
+from app.utils.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS
 import time
 import asyncio
 
@@ -65,12 +66,37 @@ if settings.API_KEY:
 
 
 # ── Request Timing Middleware ────────────────────────────────────────────────
+def _route_template(request: Request) -> str:
+    """
+    Full route template (/api/v1/vehicles/{plate}) to label metrics with, keeping
+    series bounded. The matched route's own path lacks the include_router prefix,
+    which is whatever precedes the template's segments in the request path.
+    """
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    segments = request.url.path.split("/")
+    prefix = "/".join(segments[:len(segments) - len(route.path.split("/")) + 1])
+    return prefix + route.path
+
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start = time.time()
-    response = await call_next(request)
-    duration = round((time.time() - start) * 1000, 2)
-    logger.debug(f"{request.method} {request.url.path} → {response.status_code} ({duration}ms)")
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception:
+        # The global handler turns this into a 500 outside this middleware; count it here
+        elapsed = time.perf_counter() - start
+        path = _route_template(request)
+        HTTP_REQUEST_SECONDS.labels(request.method, path).observe(elapsed)
+        HTTP_REQUESTS.labels(request.method, path, "500").inc()
+        raise
+    elapsed = time.perf_counter() - start
+    path = _route_template(request)
+    HTTP_REQUEST_SECONDS.labels(request.method, path).observe(elapsed)
+    HTTP_REQUESTS.labels(request.method, path, str(response.status_code)).inc()
+    logger.debug(f"{request.method} {request.url.path} → {response.status_code} ({round(elapsed * 1000, 2)}ms)")
     return response
 
 
@@ -91,6 +117,13 @@ app.include_router(violations.router, prefix="/api/v1", tags=["🚨 Violations 
 app.include_router(intrusion.router,  prefix="/api/v1", tags=["🔒 Intrusion — UC6"])
 app.include_router(health.router,     prefix="/api/v1", tags=["💚 Health"])
 app.include_router(alerts.router,     prefix="/api/v1", tags=["🔔 Alerts"])
+app.include_router(incidents.router,  prefix="/api/v1", tags=["🧩 Incidents"])
+app.include_router(live.router,       prefix="/api/v1", tags=["📺 Live Feed"])
+app.include_router(dashboard.router,  prefix="/api/v1", tags=["📊 Dashboard"])
+app.include_router(exports.router,    prefix="/api/v1", tags=["📦 Exports"])
+app.include_router(metrics.router,    prefix="/api/v1", tags=["📈 Metrics"])
+app.include_router(pollers.router,    prefix="/api/v1", tags=["📡 Camera Pollers"])
+app.include_router(zone_rules.router, prefix="/api/v1", tags=["📐 Zone Rules"])
 
 # Phase 2 — uncomment when ANPR cameras are installed
 # app.include_router(entry_exit.router,    prefix="/api/v1", tags=["🚗 Entry/Exit — UC1"])
@@ -108,12 +141,82 @@ async def startup():
     logger.info(f"🌐 Listening on http://{settings.BACKEND_IP}:{settings.BACKEND_PORT}")
     logger.info("📖 API docs at /docs")
 
+    from app.services.runtime_metrics import register_runtime_gauges
+    register_runtime_gauges()
+
+    # Alerts: batched inserts + outbound notifiers (webhook / syslog / SMTP)
+    from app.services.alert_service import alert_sink
+    from app.services.notifiers import notification_fanout
+    notification_fanout.start()
+    if settings.ALERT_SINK_ENABLED:
+        alert_sink.start()
+
+    # In-memory caches (kept in sync across workers via LISTEN/NOTIFY)
+    from app.services.vehicle_service import start_registry_cache
+    from app.services.parking_session_service import start_open_sessions, run_session_sweeper
+    from app.services.gate_counters import start_gate_counters
+    from app.services.zone_rule_engine import start_zone_rules
+    from app.services.pg_notify import pg_listener
+    start_registry_cache()
+    start_open_sessions()
+    start_gate_counters()
+    start_zone_rules()
+    pg_listener.start()
+    from app.services.dashboard import start_dashboard
+    start_dashboard()
+    asyncio.create_task(run_session_sweeper(), name="parking-session-sweeper")
+    if settings.OVERSTAY_ENABLED:
+        from app.services.overstay_service import overstay_monitor
+        overstay_monitor.start()
+    from app.services.parking_sketches import run_sketch_flusher
+    asyncio.create_task(run_sketch_flusher(), name="parking-sketch-flusher")
+
+    # UC5: dwell timers for no-parking zones
+    from app.services.violation_service import dwell_tracker
+    dwell_tracker.start()
+
+    # Probe cameras in the background so /health answers from cache
+    from app.services.camera_health import health_monitor
+    health_monitor.start()
+
+    # Process queued events in this process (EVENT_INGEST_MODE=queue)
+    if settings.EVENT_QUEUE_WORKERS > 0:
+        from app.services.event_queue import run_queue_worker
+        for i in range(settings.EVENT_QUEUE_WORKERS):
+            asyncio.create_task(run_queue_worker(f"queue-worker-{i}"), name=f"queue-worker-{i}")
+        logger.info(f"📬 {settings.EVENT_QUEUE_WORKERS} event queue workers started")
+
     # Start pulling events from cameras via ISAPI alertStream
-    # from app.services.camera_poller import start_camera_polling
-    # asyncio.create_task(start_camera_polling(settings.CAMERAS))
-    # logger.info("📡 Camera polling started (pull mode)")
+    if settings.CAMERA_POLLING_ENABLED and settings.POLLER_SHARDING_ENABLED:
+        from app.services.poller_ownership import poller_ownership
+        poller_ownership.start()
+        logger.info("📡 Camera polling started (pull mode, sharded across workers)")
+    elif settings.CAMERA_POLLING_ENABLED:
+        from app.services.camera_poller import poller_supervisor
+        poller_supervisor.start(settings.CAMERAS)
+        logger.info("📡 Camera polling started (pull mode)")
 
 
 @app.on_event("shutdown")
 async def shutdown():
     logger.info("🛑 Damanat Backend shutting down...")
+    from app.services.camera_health import health_monitor
+    await health_monitor.stop()
+    from app.services.overstay_service import overstay_monitor
+    await overstay_monitor.stop()
+    from app.services.violation_service import dwell_tracker
+    await dwell_tracker.stop()
+    from app.services.poller_ownership import poller_ownership
+    await poller_ownership.stop()
+    from app.services.event_reorder import reorder_buffer
+    await reorder_buffer.stop()
+    from app.services.zone_actors import zone_actors
+    await zone_actors.stop()
+    from app.services.parking_sketches import flush_now
+    await flush_now()
+    from app.services.alert_service import alert_sink
+    await alert_sink.stop()
+    from app.services.notifiers import notification_fanout
+    await notification_fanout.stop()
+    from app.services.pg_notify import pg_listener
+    pg_listener.stop()
@@ -3,6 +3,12 @@
 
 from app.models.camera_event import CameraEvent       # noqa
 from app.models.zone_occupancy import ZoneOccupancy   # noqa
+from app.models.incident import Incident               # noqa
 from app.models.alert import Alert                     # noqa
+from app.models.zone_rule import ZoneRule              # noqa
 from app.models.vehicle import Vehicle                 # noqa
 from app.models.entry_exit_log import EntryExitLog     # noqa
+from app.models.parking_session import ParkingSession  # noqa
+from app.models.parking_rollup import ParkingRollup    # noqa
+from app.models.parking_sketch import ParkingSketch    # noqa
+from app.models.event_queue import EventQueueItem, EventDeadLetter  # noqa
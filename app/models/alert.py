@@ -2,9 +2,10 @@
 """
 Alerts table — stores all generated alerts (occupancy, violation, intrusion, unknown vehicle).
 Used by violation_service, intrusion_service, occupancy_service, and entry_exit_service.
+Violation and intrusion alerts belong to an incident (see incident_service).
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from app.database import Base
 
 
@@ -12,14 +13,21 @@ class Alert(Base):
     __tablename__ = "alerts"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    alert_type = Column(String(50), nullable=False, index=True)
+    alert_type = Column(String(50), nullable=False)
     camera_id = Column(String(50), nullable=False)
     zone_id = Column(String(100))
     event_type = Column(String(100))
     description = Column(Text)
     is_resolved = Column(Integer, default=0, nullable=False)
-    triggered_at = Column(DateTime, nullable=False, index=True)
+    triggered_at = Column(DateTime, nullable=False)
     resolved_at = Column(DateTime)
+    incident_id = Column(Integer, ForeignKey("incidents.id"), index=True)   # set for correlated alerts
+
+    # Keyset pagination of /alerts, /violations, /intrusions (newest first)
+    __table_args__ = (
+        Index("ix_alerts_triggered_id", "triggered_at", "id"),
+        Index("ix_alerts_type_triggered_id", "alert_type", "triggered_at", "id"),
+    )
 
     def __repr__(self):
         return f"<Alert {self.id} type={self.alert_type} resolved={self.is_resolved}>"
@@ -5,7 +5,7 @@ Stores every event received from all cameras, regardless of type.
 Used for audit trail, debugging, and event replay.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from app.database import Base
 
 
@@ -13,10 +13,10 @@ class CameraEvent(Base):
     __tablename__ = "camera_events"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    camera_id = Column(String(50), nullable=False, index=True)
+    camera_id = Column(String(50), nullable=False)
     device_serial = Column(String(100))
     channel_id = Column(Integer)
-    event_type = Column(String(100), nullable=False, index=True)
+    event_type = Column(String(100), nullable=False)
     event_state = Column(String(20))          # active | inactive
     event_description = Column(String(200))   # human-readable, e.g. "Motion alarm"
     detection_target = Column(String(50))
@@ -25,7 +25,14 @@ class CameraEvent(Base):
     trigger_time = Column(DateTime)
     snapshot_path = Column(String(500))        # path to saved snapshot image
     raw_payload = Column(Text)
-    created_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, nullable=False)
+
+    # Keyset pagination of /events (newest first), unfiltered or by camera / event type
+    __table_args__ = (
+        Index("ix_camera_events_created_id", "created_at", "id"),
+        Index("ix_camera_events_camera_created_id", "camera_id", "created_at", "id"),
+        Index("ix_camera_events_type_created_id", "event_type", "created_at", "id"),
+    )
 
     def __repr__(self):
         return f"<CameraEvent {self.id} type={self.event_type} cam={self.camera_id}>"
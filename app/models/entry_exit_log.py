@@ -5,8 +5,9 @@ Records every vehicle entry and exit event from ANPR cameras.
 Matched pairs are used to calculate parking duration.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime
-from app.database import Base
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from app.database import Base, extension_installed
+from app.utils.plate_matching import plate_search_key
 
 
 class EntryExitLog(Base):
@@ -18,10 +19,20 @@ class EntryExitLog(Base):
     vehicle_type = Column(String(50))        # employee | visitor | unknown
     gate = Column(String(20), nullable=False) # entry | exit
     camera_id = Column(String(50), nullable=False)
-    event_time = Column(DateTime, nullable=False, index=True)
+    event_time = Column(DateTime, nullable=False)
     parking_duration = Column(Integer)        # seconds (set on exit)
     matched_entry_id = Column(Integer)        # cross-reference to matching entry/exit
     created_at = Column(DateTime)
 
+    # Keyset pagination of /entry-exit (newest first), unfiltered or by gate; event_time range scans;
+    # partial plate search (plate_search.py) — trigram GIN on the normalized plate
+    __table_args__ = (
+        Index("ix_entry_exit_log_event_time_id", "event_time", "id"),
+        Index("ix_entry_exit_log_gate_event_time_id", "gate", "event_time", "id"),
+        Index("ix_entry_exit_log_plate_trgm", plate_search_key(plate_number).label("plate_key"),
+              postgresql_using="gin", postgresql_ops={"plate_key": "gin_trgm_ops"},
+              info={"requires_extension": "pg_trgm"}).ddl_if(dialect="postgresql", callable_=extension_installed),
+    )
+
     def __repr__(self):
         return f"<EntryExitLog {self.id} plate={self.plate_number} gate={self.gate}>"
@@ -0,0 +1,51 @@
+# app/models/event_queue.py
+"""
+Postgres-backed work queue for raw camera events.
+Ingest nodes insert rows; queue workers claim them with FOR UPDATE SKIP LOCKED.
+A row is invisible to other workers until available_at (visibility timeout).
+Rows that keep failing are moved to event_dead_letter. A retried row resumes
+where the previous attempt stopped (camera_event_id, done_handlers).
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Text, LargeBinary, Index
+from app.database import Base
+
+
+class EventQueueItem(Base):
+    __tablename__ = "event_queue"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    camera_ip = Column(String(50), nullable=False)
+    content_type = Column(String(200))
+    raw_body = Column(LargeBinary, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    available_at = Column(DateTime, nullable=False)   # claimable when <= now
+    enqueued_at = Column(DateTime, nullable=False)
+    last_error = Column(Text)
+    # Progress kept across retries (event_queue.QueueProgress)
+    camera_event_id = Column(BigInteger)              # camera_events row written for this item
+    done_handlers = Column(String(200))               # comma-separated dispatcher handlers that finished
+
+    __table_args__ = (
+        Index("ix_event_queue_available_id", "available_at", "id"),
+    )
+
+    def __repr__(self):
+        return f"<EventQueueItem {self.id} ip={self.camera_ip} attempts={self.attempts}>"
+
+
+class EventDeadLetter(Base):
+    __tablename__ = "event_dead_letter"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    queue_id = Column(BigInteger)
+    camera_ip = Column(String(50), nullable=False)
+    content_type = Column(String(200))
+    raw_body = Column(LargeBinary, nullable=False)
+    attempts = Column(Integer, nullable=False)
+    last_error = Column(Text)
+    enqueued_at = Column(DateTime)
+    failed_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<EventDeadLetter {self.id} queue_id={self.queue_id} attempts={self.attempts}>"
@@ -0,0 +1,29 @@
+# app/models/incident.py
+"""
+Incidents table — one row per physical incident on a zone.
+Alerts raised by the same camera event, or by events on the same zone within
+INCIDENT_WINDOW_SECONDS, are its children (alerts.incident_id). The incident
+carries the single snapshot taken for all of them.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime
+from app.database import Base
+
+
+class Incident(Base):
+    __tablename__ = "incidents"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    camera_id = Column(String(50), nullable=False)
+    zone_id = Column(String(100), index=True)
+    event_type = Column(String(100))             # event that opened the incident
+    alert_types = Column(String(200))            # comma-separated child alert types
+    alert_count = Column(Integer, default=0, nullable=False)
+    snapshot_path = Column(String(500))
+    opened_at = Column(DateTime, nullable=False, index=True)
+    last_alert_at = Column(DateTime, nullable=False)
+    is_resolved = Column(Integer, default=0, nullable=False)
+    resolved_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<Incident {self.id} zone={self.zone_id} alerts={self.alert_count}>"
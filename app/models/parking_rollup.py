@@ -0,0 +1,25 @@
+# app/models/parking_rollup.py
+"""
+🔜 Phase 2: Hourly parking rollups (UC1 + UC2).
+One row per local (date, hour, gate) with pre-aggregated counts and duration
+sums. Maintained at ingest by parking_rollups.record_rollup() and rebuilt from
+entry_exit_log by backfill_rollups(). Stats endpoints read only this table.
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, String, Date, DateTime
+from app.database import Base
+
+
+class ParkingRollup(Base):
+    __tablename__ = "parking_rollups"
+
+    bucket_date = Column(Date, primary_key=True)           # local date (LOCAL_TIMEZONE)
+    bucket_hour = Column(Integer, primary_key=True)        # local hour 0-23
+    gate = Column(String(20), primary_key=True)            # entry | exit
+    event_count = Column(Integer, nullable=False, default=0)
+    duration_sum = Column(BigInteger, nullable=False, default=0)    # seconds, exits with a matched entry
+    duration_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<ParkingRollup {self.bucket_date} {self.bucket_hour:02d}h {self.gate}={self.event_count}>"
@@ -0,0 +1,38 @@
+# app/models/parking_session.py
+"""
+🔜 Phase 2: Parking sessions table (UC1 + UC2).
+One row per vehicle visit: opened by an ENTRY, closed by the matching EXIT,
+or expired by the sweeper if no exit is ever seen.
+The partial unique index on open rows makes "the open session for this plate"
+a single index probe, and guarantees at most one open session per plate.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, Index, text
+from app.database import Base
+
+
+class ParkingSession(Base):
+    __tablename__ = "parking_sessions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    plate_number = Column(String(50), nullable=False)
+    vehicle_id = Column(Integer)                 # FK to vehicles.id (nullable if unknown)
+    vehicle_type = Column(String(50))            # employee | visitor | unknown
+    camera_id = Column(String(50))               # entry camera
+    entry_log_id = Column(Integer, nullable=False)
+    entry_time = Column(DateTime, nullable=False)
+    status = Column(String(20), nullable=False, default="open")   # open | closed | expired
+    exit_log_id = Column(Integer)
+    closed_at = Column(DateTime)
+    parking_duration = Column(Integer)           # seconds (set on close)
+    overstay_alerted_at = Column(DateTime)       # set once by the worker that raised the overstay alert
+
+    __table_args__ = (
+        Index("uq_parking_sessions_open_plate", "plate_number", unique=True,
+              postgresql_where=text("status = 'open'")),
+        Index("ix_parking_sessions_open_entry_time", "entry_time",
+              postgresql_where=text("status = 'open'")),
+    )
+
+    def __repr__(self):
+        return f"<ParkingSession {self.id} plate={self.plate_number} status={self.status}>"
@@ -0,0 +1,22 @@
+# app/models/parking_sketch.py
+"""
+🔜 Phase 2: Per-day parking sketches (UC1 + UC2).
+kind = "duration" → serialized t-digest of parking durations (seconds, exits)
+kind = "plates"   → serialized HyperLogLog of plates seen at either gate
+Rows are merged with in-memory deltas by parking_sketches.SketchStore.flush().
+"""
+
+from sqlalchemy import Column, String, Date, DateTime, LargeBinary
+from app.database import Base
+
+
+class ParkingSketch(Base):
+    __tablename__ = "parking_sketches"
+
+    bucket_date = Column(Date, primary_key=True)       # local date (LOCAL_TIMEZONE)
+    kind = Column(String(20), primary_key=True)        # duration | plates
+    data = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<ParkingSketch {self.bucket_date} {self.kind}>"
@@ -5,8 +5,9 @@ Stores employee and visitor vehicles by plate number.
 Used by entry_exit_service to identify known vs unknown vehicles.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text
-from app.database import Base
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from app.database import Base, extension_installed
+from app.utils.plate_matching import plate_search_key
 
 
 class Vehicle(Base):
@@ -21,5 +22,12 @@ class Vehicle(Base):
     registered_at = Column(DateTime)
     notes = Column(Text)
 
+    # Partial plate search (plate_search.py) — trigram GIN on the normalized plate
+    __table_args__ = (
+        Index("ix_vehicles_plate_trgm", plate_search_key(plate_number).label("plate_key"),
+              postgresql_using="gin", postgresql_ops={"plate_key": "gin_trgm_ops"},
+              info={"requires_extension": "pg_trgm"}).ddl_if(dialect="postgresql", callable_=extension_installed),
+    )
+
     def __repr__(self):
         return f"<Vehicle {self.plate_number} owner={self.owner_name} type={self.vehicle_type}>"
@@ -0,0 +1,34 @@
+# app/models/zone_rule.py
+"""
+Zone rules — which detections raise a violation (UC5) or intrusion (UC6) alert.
+Replaces the hardcoded RESTRICTED_ZONES / MONITORED_INTRUSION_ZONES sets.
+NULL match columns are wildcards. Compiled into memory by zone_rule_engine.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, Time, Boolean, Text
+from app.database import Base
+
+
+class ZoneRule(Base):
+    __tablename__ = "zone_rules"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # Match (NULL = any). zone_id "-" matches events with no region.
+    zone_id = Column(String(100))
+    camera_id = Column(String(50))
+    event_type = Column(String(100))
+    detection_target = Column(String(20))          # vehicle | human
+    # Schedule in LOCAL_TIMEZONE (NULL = always). end <= start wraps past midnight.
+    days = Column(String(20))                      # "0,1,2,3,4" — Monday = 0
+    start_time = Column(Time)
+    end_time = Column(Time)
+    # Outcome
+    action = Column(String(20), nullable=False)    # violation | intrusion
+    dwell_seconds = Column(Integer)                # violation only: alert after this long parked
+    priority = Column(Integer, nullable=False, default=0)
+    enabled = Column(Boolean, nullable=False, default=True)
+    description = Column(Text)
+    updated_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<ZoneRule {self.id} {self.action} zone={self.zone_id} camera={self.camera_id}>"
@@ -0,0 +1,20 @@
+# app/routers/dashboard.py
+"""Dashboard landing page in one round trip — served from the in-memory read model."""
+
+from fastapi import APIRouter, Request, Response
+from app.services.dashboard import dashboard
+
+router = APIRouter()
+
+
+@router.get("/dashboard/summary", summary="Zones, open alerts, latest alerts and today's gate counts")
+def get_dashboard_summary(request: Request):
+    """
+    Replaces /occupancy + /alerts?is_resolved=0 + /violations + /intrusions +
+    /entry-exit/count/today. Send the last ETag as If-None-Match: 304 when unchanged.
+    """
+    etag, body = dashboard.render()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
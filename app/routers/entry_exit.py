@@ -1,37 +1,48 @@
 # app/routers/entry_exit.py
 """UC1: Entry/Exit Counting endpoints (Phase 2)"""
 
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from app.database import get_db
 from app.models.entry_exit_log import EntryExitLog
 from app.schemas.entry_exit_log import EntryExitLogOut
-from datetime import datetime, date
+from app.services.gate_counters import gate_counters
+from app.services.parking_session_service import open_sessions
+from app.utils.pagination import paginate
+from datetime import datetime
 
 router = APIRouter()
 
 
 @router.get("/entry-exit", response_model=list[EntryExitLogOut], summary="UC1 — Get entry/exit log")
-def get_entry_exit_log(limit: int = 50, gate: str = None, db: Session = Depends(get_db)):
-    """Returns chronological entry/exit events with plate, type, and time."""
+def get_entry_exit_log(response: Response, limit: int = Query(50, ge=1, le=500), cursor: Optional[str] = None,
+                       gate: str = None, db: Session = Depends(get_db)):
+    """Returns entry/exit events with plate, type, and time, newest first. Paged via X-Next-Cursor."""
     q = db.query(EntryExitLog)
     if gate:
         q = q.filter(EntryExitLog.gate == gate)
-    return q.order_by(EntryExitLog.event_time.desc()).limit(limit).all()
+    return paginate(q, response, EntryExitLog.id, cursor, limit, EntryExitLog.event_time, "event_time")
 
 
 @router.get("/entry-exit/count/today", summary="UC1 — Today's vehicle count")
-def get_today_counts(db: Session = Depends(get_db)):
-    """Returns total entries and exits for today."""
-    today = date.today()
-    entries = db.query(func.count(EntryExitLog.id)).filter(
-        EntryExitLog.gate == "entry",
-        func.date(EntryExitLog.event_time) == today,
-    ).scalar()
-    exits = db.query(func.count(EntryExitLog.id)).filter(
-        EntryExitLog.gate == "exit",
-        func.date(EntryExitLog.event_time) == today,
-    ).scalar()
-    return {"date": str(today), "entries": entries, "exits": exits,
-            "currently_parked": max(0, entries - exits)}
+def get_today_counts():
+    """Returns total entries and exits for today (local time) and vehicles currently inside."""
+    counts = gate_counters.snapshot()
+    return {"date": str(counts.day), "entries": counts.entries, "exits": counts.exits,
+            "currently_parked": len(open_sessions)}
+
+
+@router.get("/entry-exit/inside", summary="UC1 — Vehicles currently inside")
+def get_vehicles_inside(limit: int = Query(500, ge=1, le=1000)):
+    """Vehicles with an open parking session, longest dwell first."""
+    now = datetime.utcnow()
+    sessions = sorted(open_sessions.by_plate.values(), key=lambda s: s.entry_time)[:limit]
+    return {
+        "count": len(open_sessions),
+        "vehicles": [
+            {"plate_number": s.plate_number, "vehicle_type": s.vehicle_type, "camera_id": s.camera_id,
+             "entry_time": s.entry_time, "dwell_seconds": int((now - s.entry_time).total_seconds())}
+            for s in sessions
+        ],
+    }
@@ -2,16 +2,18 @@
 """
 Camera event webhook endpoint + raw event log viewer.
 POST /events/camera — receives events from all cameras (XML or JSON).
-GET  /events       — lists raw event log with optional filters.
+GET  /events       — lists raw event log with optional filters (cursor-paginated).
 """
 
-from fastapi import APIRouter, Request, Depends
-from sqlalchemy.orm import Session
-from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Request, Response, Depends, Query
+from sqlalchemy.orm import Session, defer
 from app.database import get_db
-from app.services.event_parser import parse_camera_event
-from app.services.event_dispatcher import dispatch_event
+from app.models.camera_event import CameraEvent
+from app.schemas.camera_event import CameraEventOut, CameraEventRawOut
+from app.services.event_ingest import submit_raw_event
 from app.utils.logger import get_logger
+from app.utils.pagination import paginate
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -22,6 +24,7 @@ async def receive_camera_event(request: Request, db: Session = Depends(get_db)):
     """
     Single entry point for ALL camera events (Phase 1 + Phase 2).
     Always returns HTTP 200 — cameras retry on non-200 and we never want that.
+    With EVENT_INGEST_MODE=queue the raw body is only enqueued for the queue workers.
     """
     try:
         raw_body = await request.body()
@@ -32,36 +35,9 @@ async def receive_camera_event(request: Request, db: Session = Depends(get_db)):
         content_type = request.headers.get("content-type", "")
         logger.info(f"Event from {camera_ip} | {len(raw_body)} bytes | {content_type}")
 
-        # Parse into unified ParsedCameraEvent (handles XML and JSON)
-        event = parse_camera_event(raw_body, camera_ip, content_type)
-        logger.info(
-            f"Parsed: type={event.event_type} state={event.event_state} "
-            f"desc={event.event_description} target={event.detection_target} "
-            f"zone={event.region_id} plate={event.plate_number} "
-            f"snap={event.snapshot_path}"
-        )
-
-        # Persist raw event
-        from app.models.camera_event import CameraEvent
-        db.add(CameraEvent(
-            camera_id=event.camera_id,
-            device_serial=event.device_serial,
-            channel_id=event.channel_id,
-            event_type=event.event_type,
-            event_state=event.event_state,
-            event_description=event.event_description,
-            detection_target=event.detection_target,
-            region_id=event.region_id,
-            channel_name=event.channel_name,
-            trigger_time=event.trigger_time,
-            snapshot_path=event.snapshot_path,
-            raw_payload=event.raw_xml,
-            created_at=datetime.utcnow(),
-        ))
-        db.commit()
-
-        # Dispatch to correct use-case handlers
-        await dispatch_event(event, db)
+        event = await submit_raw_event(raw_body, camera_ip, content_type, db)
+        if event is None:
+            return {"status": "queued"}
         return {"status": "ok", "event_type": event.event_type}
 
     except Exception as e:
@@ -69,15 +45,38 @@ async def receive_camera_event(request: Request, db: Session = Depends(get_db)):
         return {"status": "error", "detail": str(e)}  # Still return 200
 
 
-@router.get("/events", summary="List raw camera events")
-def list_events(limit: int = 50, camera_id: str = None, event_type: str = None,
+@router.get("/events/queue", summary="Event work queue depth and dead letters")
+def get_event_queue_stats(db: Session = Depends(get_db)):
+    """Queue depth, rows ready to claim, oldest pending event and dead-letter count."""
+    from app.services.event_queue import queue_stats
+    return queue_stats(db)
+
+
+@router.get("/events/reorder", summary="Per-camera reorder buffer state")
+def get_reorder_stats():
+    """Buffered and late event counts per camera for the trigger_time reorder stage."""
+    from app.services.event_reorder import reorder_buffer
+    return reorder_buffer.stats()
+
+
+@router.get("/events", response_model=list[CameraEventRawOut], response_model_exclude_unset=True,
+            summary="List raw camera events")
+def list_events(response: Response, limit: int = Query(50, ge=1, le=500), cursor: Optional[str] = None,
+                camera_id: str = None, event_type: str = None, include_raw: bool = False,
                 db: Session = Depends(get_db)):
-    """Returns raw event log with optional camera_id and event_type filters."""
-    from app.models.camera_event import CameraEvent
+    """
+    Raw event log, newest first, with optional camera_id and event_type filters.
+    Page with the X-Next-Cursor response header: pass it back as ?cursor=.
+    raw_payload is only loaded with include_raw=true.
+    """
     q = db.query(CameraEvent)
+    if not include_raw:
+        q = q.options(defer(CameraEvent.raw_payload))
     if camera_id:
         q = q.filter(CameraEvent.camera_id == camera_id)
     if event_type:
         q = q.filter(CameraEvent.event_type == event_type)
-    return q.order_by(CameraEvent.created_at.desc()).limit(limit).all()
-
+    rows = paginate(q, response, CameraEvent.id, cursor, limit, CameraEvent.created_at, "created_at")
+    # Validated here so the deferred raw_payload is never loaded unless requested
+    schema = CameraEventRawOut if include_raw else CameraEventOut
+    return [schema.model_validate(r) for r in rows]
@@ -0,0 +1,36 @@
+# app/routers/exports.py
+"""
+Bulk export for audits — streams a whole filtered table as CSV, NDJSON or Parquet.
+GET /export/{dataset}  — dataset: events | alerts | entry-exit
+"""
+
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.services.export_service import DATASETS, FORMATS, ExportFilter, parquet_available, stream_export
+
+router = APIRouter()
+
+
+@router.get("/export/{dataset}", summary="Stream a dataset as CSV, NDJSON or Parquet")
+def export_dataset(dataset: str, format: str = Query("csv", pattern="^(csv|ndjson|parquet)$"),
+                   start: Optional[datetime] = None, end: Optional[datetime] = None,
+                   camera_id: Optional[str] = None, event_type: Optional[str] = None,
+                   include_raw: bool = False):
+    """
+    All matching rows, oldest first, streamed from a server-side cursor.
+    start is inclusive, end exclusive (UTC unless an offset is given).
+    event_type filters events.event_type, alerts.alert_type or entry-exit gate.
+    include_raw adds raw_payload to events.
+    """
+    if dataset not in DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset '{dataset}' — one of {sorted(DATASETS)}")
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export needs pyarrow (pip install pyarrow)")
+
+    f = ExportFilter(start=start, end=end, camera_id=camera_id, event_type=event_type, include_raw=include_raw)
+    media_type, ext = FORMATS[format]
+    filename = f"{dataset}-{datetime.utcnow():%Y%m%dT%H%M%S}.{ext}"
+    return StreamingResponse(stream_export(dataset, format, f), media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
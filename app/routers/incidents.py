@@ -0,0 +1,68 @@
+# app/routers/incidents.py
+"""UC5 + UC6: Incidents — correlated violation/intrusion alerts with one snapshot."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Optional
+from app.database import get_db
+from app.models.alert import Alert
+from app.models.incident import Incident
+from app.schemas.incident import IncidentOut, IncidentDetailOut
+from app.services.alert_service import alert_sink, announce_resolved
+from app.services.incident_service import incident_correlator
+
+router = APIRouter()
+
+
+@router.get("/incidents", response_model=list[IncidentOut], summary="List incidents")
+def get_incidents(zone_id: Optional[str] = None, is_resolved: Optional[int] = None,
+                  limit: int = Query(50, ge=1, le=500), db: Session = Depends(get_db)):
+    """Incidents newest first. Each groups the alerts raised on one zone within INCIDENT_WINDOW_SECONDS."""
+    q = db.query(Incident)
+    if zone_id:
+        q = q.filter(Incident.zone_id == zone_id)
+    if is_resolved is not None:
+        q = q.filter(Incident.is_resolved == is_resolved)
+    return q.order_by(Incident.opened_at.desc()).limit(limit).all()
+
+
+@router.get("/incidents/{incident_id}", response_model=IncidentDetailOut, summary="Incident with its alerts")
+def get_incident(incident_id: int, db: Session = Depends(get_db)):
+    incident = db.query(Incident).filter(Incident.id == incident_id).first()
+    if not incident:
+        raise HTTPException(status_code=404, detail="Incident not found")
+    alerts = db.query(Alert).filter(Alert.incident_id == incident_id).order_by(Alert.triggered_at).all()
+    return {**IncidentOut.model_validate(incident).model_dump(), "alerts": alerts}
+
+
+@router.put("/incidents/{incident_id}/resolve", summary="Resolve an incident and its alerts")
+async def resolve_incident(incident_id: int, db: Session = Depends(get_db)):
+    """
+    Later alerts on the zone open a new incident. The incident's own alerts may
+    still be queued in the alert sink; they are waited for so none is written
+    unresolved after the incident is closed.
+    """
+    incident = db.query(Incident).filter(Incident.id == incident_id).first()
+    if not incident:
+        raise HTTPException(status_code=404, detail="Incident not found")
+    incident_correlator.forget(incident_id)
+    for alert_type in filter(None, (incident.alert_types or "").split(",")):
+        await alert_sink.wait_written(alert_type, incident.zone_id)
+    now = datetime.utcnow()
+    db.query(Incident).filter(Incident.id == incident_id).update(
+        {Incident.is_resolved: 1, Incident.resolved_at: now})
+    rows = db.execute(
+        update(Alert).where(Alert.incident_id == incident_id, Alert.is_resolved == 0)
+        .values(is_resolved=1, resolved_at=now)
+        .returning(Alert.id, Alert.alert_type, Alert.zone_id)
+    ).all()
+    db.commit()
+    by_type: dict[str, list] = {}
+    for r in rows:
+        by_type.setdefault(r.alert_type, []).append(r)
+    for alert_type, group in by_type.items():
+        announce_resolved(alert_type, len(group), group[0].zone_id, [r.id for r in group])
+    resolved = len(rows)
+    return {"id": incident_id, "status": "resolved", "alerts_resolved": resolved}
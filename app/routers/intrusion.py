@@ -1,22 +1,20 @@
 # app/routers/intrusion.py
 """UC6: Intrusion Detection — list alerts endpoint."""
 
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.alert import Alert
 from app.schemas.alert import AlertOut
+from app.utils.pagination import paginate
 
 router = APIRouter()
 
 
 @router.get("/intrusions", response_model=list[AlertOut], summary="UC6 — List intrusion alerts")
-def get_intrusions(limit: int = 50, db: Session = Depends(get_db)):
-    """Returns intrusion alerts, newest first."""
-    return (
-        db.query(Alert)
-        .filter(Alert.alert_type == "intrusion")
-        .order_by(Alert.triggered_at.desc())
-        .limit(limit)
-        .all()
-    )
+def get_intrusions(response: Response, limit: int = Query(50, ge=1, le=500), cursor: Optional[str] = None,
+                   db: Session = Depends(get_db)):
+    """Returns intrusion alerts, newest first. Paged via X-Next-Cursor."""
+    q = db.query(Alert).filter(Alert.alert_type == "intrusion")
+    return paginate(q, response, Alert.id, cursor, limit, Alert.triggered_at, "triggered_at")
@@ -0,0 +1,76 @@
+# app/routers/live.py
+"""
+Live feed — occupancy, alerts and gate events pushed as they happen (event_bus).
+
+  GET /live/stream  Server-Sent Events. Browsers resume automatically with the
+                    Last-Event-ID header; ?last_event_id= works too.
+  WS  /live/ws      WebSocket, one JSON frame per message: {"id", "topic", "data"}.
+                    Resume with ?last_event_id=.
+
+?topics=occupancy,alert,gate limits the feed (default: all). A "reset" message
+means the client missed more than the server buffers and should reload over REST.
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Header, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from app.config import settings
+from app.services.event_bus import event_bus
+
+router = APIRouter()
+
+_HEARTBEAT = b": keep-alive\n\n"
+
+
+def _topics(topics: Optional[str]) -> Optional[list[str]]:
+    return [t.strip() for t in topics.split(",") if t.strip()] if topics else None
+
+
+def _resume_id(*values) -> Optional[int]:
+    for v in values:
+        if v is not None and str(v).strip().lstrip("-").isdigit():
+            return int(v)
+    return None
+
+
+@router.get("/live/stream", summary="Live feed (Server-Sent Events)")
+async def live_stream(topics: Optional[str] = None, last_event_id: Optional[int] = Query(None),
+                      last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")):
+    sub = event_bus.subscribe(_topics(topics), _resume_id(last_event_id_header, last_event_id))
+
+    async def body():
+        try:
+            yield b"retry: 3000\n\n"
+            async for msg in event_bus.messages(sub, timeout=settings.LIVE_HEARTBEAT_SECONDS):
+                yield _HEARTBEAT if msg is None else msg.sse
+        finally:
+            event_bus.unsubscribe(sub)
+
+    return StreamingResponse(body(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.websocket("/live/ws")
+async def live_ws(websocket: WebSocket, topics: Optional[str] = None, last_event_id: Optional[int] = None,
+                  api_key: Optional[str] = None):
+    # APIKeyMiddleware only sees HTTP requests
+    if settings.API_KEY and (api_key or websocket.headers.get("x-api-key")) != settings.API_KEY:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    sub = event_bus.subscribe(_topics(topics), last_event_id)
+    try:
+        async for msg in event_bus.messages(sub, timeout=settings.LIVE_HEARTBEAT_SECONDS):
+            if msg is None:
+                await websocket.send_text('{"topic":"heartbeat"}')
+            else:
+                await websocket.send_text(msg.ws)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        event_bus.unsubscribe(sub)
+
+
+@router.get("/live/stats", summary="Live feed subscribers and buffer")
+def live_stats():
+    return event_bus.stats()
@@ -0,0 +1,14 @@
+# app/routers/metrics.py
+"""Prometheus scrape endpoint — request and pipeline histograms, event counters, queue and pool gauges."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.utils.metrics import registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, summary="Prometheus metrics")
+def get_metrics():
+    """Text exposition format 0.0.4. Values are per worker process (`pid` label)."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -7,6 +7,9 @@ from datetime import datetime
 from app.database import get_db
 from app.models.zone_occupancy import ZoneOccupancy
 from app.schemas.zone_occupancy import ZoneOccupancyOut, ZoneCapacityUpdate
+from app.services import zone_actors as actors
+from app.services.zone_actors import zone_actors
+from app.services.occupancy_service import publish_occupancy
 
 router = APIRouter()
 
@@ -33,11 +36,16 @@ def get_zone_occupancy(zone_id: str, db: Session = Depends(get_db)):
 
 
 @router.put("/occupancy/{zone_id}/capacity", summary="Set max capacity for a zone")
-def set_zone_capacity(zone_id: str, body: ZoneCapacityUpdate, db: Session = Depends(get_db)):
+async def set_zone_capacity(zone_id: str, body: ZoneCapacityUpdate, db: Session = Depends(get_db)):
     """
     Update the maximum vehicle capacity for a zone.
     Call this once per zone during system setup.
     """
+    if zone_actors.enabled:
+        # The zone's actor is its only writer — route the change through its mailbox
+        await zone_actors.ask(zone_id, actors.SET_CAPACITY, body.max_capacity)
+        return {"zone_id": zone_id, "max_capacity": body.max_capacity, "status": "updated"}
+
     zone = db.query(ZoneOccupancy).filter(ZoneOccupancy.zone_id == zone_id).first()
     if not zone:
         zone = ZoneOccupancy(zone_id=zone_id, camera_id="manual",
@@ -47,16 +55,24 @@ def set_zone_capacity(zone_id: str, body: ZoneCapacityUpdate, db: Session = Depe
     else:
         zone.max_capacity = body.max_capacity
     db.commit()
+    publish_occupancy(zone.zone_id, zone.current_count, zone.max_capacity, zone.last_updated)
     return {"zone_id": zone_id, "max_capacity": body.max_capacity, "status": "updated"}
 
 
 @router.put("/occupancy/{zone_id}/reset", summary="Reset zone count to zero")
-def reset_zone_count(zone_id: str, db: Session = Depends(get_db)):
+async def reset_zone_count(zone_id: str, db: Session = Depends(get_db)):
     """Manually reset zone vehicle count. Use after system restart or miscounts."""
+    if zone_actors.enabled:
+        state = await zone_actors.ask(zone_id, actors.RESET)
+        if state is None:
+            raise HTTPException(status_code=404, detail=f"Zone '{zone_id}' not found")
+        return {"zone_id": zone_id, "current_count": 0, "status": "reset"}
+
     zone = db.query(ZoneOccupancy).filter(ZoneOccupancy.zone_id == zone_id).first()
     if not zone:
         raise HTTPException(status_code=404, detail=f"Zone '{zone_id}' not found")
     zone.current_count = 0
     zone.last_updated = datetime.utcnow()
     db.commit()
+    publish_occupancy(zone.zone_id, zone.current_count, zone.max_capacity, zone.last_updated)
     return {"zone_id": zone_id, "current_count": 0, "status": "reset"}
@@ -1,49 +1,124 @@
 # app/routers/parking_stats.py
-"""UC2: Average Parking Time & Daily Vehicle Count (Phase 2)"""
+"""
+UC2: Average Parking Time & Daily Vehicle Count (Phase 2).
+Counts and averages are served from parking_rollups; percentiles and unique
+plates from the per-day sketches in parking_sketches.
+"""
 
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from app.database import get_db
-from app.models.entry_exit_log import EntryExitLog
-from datetime import date
+from app.services.parking_rollups import (
+    RollupTotals, all_time_totals, daily_totals, hourly_totals, range_totals, local_today,
+)
+from app.services.parking_sketches import load_day_sketches, merge_days
+from datetime import date, timedelta
 
 router = APIRouter()
 
 
+def _date_range(target_date: Optional[date], start_date: Optional[date], end_date: Optional[date]):
+    if start_date or end_date:
+        start, end = start_date or end_date, end_date or start_date
+    else:
+        start = end = target_date or local_today()
+    if start > end:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+    return start, end
+
+
 @router.get("/stats/parking-time", summary="UC2 — Average parking duration")
-def get_avg_parking_time(target_date: str = None, db: Session = Depends(get_db)):
+def get_avg_parking_time(target_date: Optional[date] = None, start_date: Optional[date] = None,
+                         end_date: Optional[date] = None, db: Session = Depends(get_db)):
+    """
+    Returns average parking duration in minutes for a date, a date range, or
+    (no parameters) all history. Only includes vehicles with matched entry+exit pairs.
     """
-    Returns average parking duration in minutes for a given date.
-    Only includes vehicles with matched entry+exit pairs.
+    if not (target_date or start_date or end_date):
+        avg_seconds = all_time_totals(db).avg_duration_seconds
+        result = {"date": str(local_today())}
+    else:
+        start, end = _date_range(target_date, start_date, end_date)
+        avg_seconds = range_totals(db, start, end).avg_duration_seconds
+        result = {"date": str(start)}
+        if start != end:
+            result.update(start_date=str(start), end_date=str(end))
+    result.update(avg_parking_minutes=round(avg_seconds / 60, 1), avg_parking_seconds=round(avg_seconds, 0))
+    return result
+
+
+@router.get("/stats/daily", summary="UC2 — Daily vehicle count summary")
+def get_daily_stats(target_date: Optional[date] = None, start_date: Optional[date] = None,
+                    end_date: Optional[date] = None, db: Session = Depends(get_db)):
     """
-    q = db.query(func.avg(EntryExitLog.parking_duration)).filter(
-        EntryExitLog.gate == "exit",
-        EntryExitLog.parking_duration != None,
-    )
-    if target_date:
-        q = q.filter(func.date(EntryExitLog.event_time) == target_date)
-
-    avg_seconds = q.scalar() or 0
+    Returns total vehicles in/out and average parking time for a date (default
+    today) or date range: totals over the range plus a `days` list, one entry per
+    day with traffic. `date` is the first day, as before ranges were supported.
+    """
+    start, end = _date_range(target_date, start_date, end_date)
+    days = daily_totals(db, start, end)
+    total = RollupTotals()
+    for t in days.values():
+        total.add(t)
     return {
-        "date": target_date or str(date.today()),
-        "avg_parking_minutes": round(avg_seconds / 60, 1),
-        "avg_parking_seconds": round(avg_seconds, 0),
+        "date": str(start), "start_date": str(start), "end_date": str(end),
+        "total_vehicles": total.entries, "total_exits": total.exits,
+        "avg_parking_minutes": round(total.avg_duration_seconds / 60, 1),
+        "days": [{"date": str(d), "total_vehicles": t.entries, "total_exits": t.exits,
+                  "avg_parking_minutes": round(t.avg_duration_seconds / 60, 1)}
+                 for d, t in days.items()],
     }
 
 
-@router.get("/stats/daily", summary="UC2 — Daily vehicle count summary")
-def get_daily_stats(target_date: str = None, db: Session = Depends(get_db)):
-    """Returns total vehicles in/out and average parking time per day."""
-    target = target_date or str(date.today())
-    total = db.query(func.count(EntryExitLog.id)).filter(
-        EntryExitLog.gate == "entry",
-        func.date(EntryExitLog.event_time) == target,
-    ).scalar()
-    avg_dur = db.query(func.avg(EntryExitLog.parking_duration)).filter(
-        EntryExitLog.gate == "exit",
-        EntryExitLog.parking_duration != None,
-        func.date(EntryExitLog.event_time) == target,
-    ).scalar() or 0
-    return {"date": target, "total_vehicles": total,
-            "avg_parking_minutes": round(avg_dur / 60, 1)}
+@router.get("/stats/hourly", summary="UC2 — Hourly vehicle counts for a day")
+def get_hourly_stats(target_date: Optional[date] = None, db: Session = Depends(get_db)):
+    """Entries, exits and average parking time per local hour."""
+    day = target_date or local_today()
+    return {
+        "date": str(day),
+        "hours": [{"hour": h, "entries": t.entries, "exits": t.exits,
+                   "avg_parking_minutes": round(t.avg_duration_seconds / 60, 1)}
+                  for h, t in hourly_totals(db, day).items()],
+    }
+
+
+def _minutes(seconds):
+    return round(seconds / 60, 1) if seconds is not None else None
+
+
+@router.get("/stats/parking-time/percentiles", summary="UC2 — Parking duration percentiles")
+def get_parking_time_percentiles(target_date: Optional[date] = None, start_date: Optional[date] = None,
+                                 end_date: Optional[date] = None, db: Session = Depends(get_db)):
+    """p50 / p90 / p99 parking duration in minutes over a date (default today) or date range."""
+    start, end = _date_range(target_date, start_date, end_date)
+    digest = merge_days(load_day_sketches(db, start, end).values()).durations
+    return {
+        "start_date": str(start), "end_date": str(end),
+        "samples": int(digest.count),
+        "p50_minutes": _minutes(digest.quantile(0.50)),
+        "p90_minutes": _minutes(digest.quantile(0.90)),
+        "p99_minutes": _minutes(digest.quantile(0.99)),
+    }
+
+
+@router.get("/stats/unique-plates", summary="UC1 — Distinct plates per day or week")
+def get_unique_plates(target_date: Optional[date] = None, start_date: Optional[date] = None,
+                      end_date: Optional[date] = None, group_by: str = "day", db: Session = Depends(get_db)):
+    """Approximate distinct plates (±2%) over the range, broken down per day or per ISO week."""
+    if group_by not in ("day", "week"):
+        raise HTTPException(status_code=400, detail="group_by must be 'day' or 'week'")
+    start, end = _date_range(target_date, start_date, end_date)
+    days = load_day_sketches(db, start, end)
+
+    groups: dict[date, list] = {}
+    for d, sketches in days.items():
+        key = d - timedelta(days=d.weekday()) if group_by == "week" else d
+        groups.setdefault(key, []).append(sketches)
+
+    return {
+        "start_date": str(start), "end_date": str(end),
+        "unique_plates": merge_days(days.values()).plates.count(),
+        group_by + "s": [{group_by: str(key), "unique_plates": merge_days(g).plates.count()}
+                         for key, g in groups.items()],
+    }
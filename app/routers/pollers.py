@@ -0,0 +1,57 @@
+# app/routers/pollers.py
+"""
+Camera poller management — inspect alertStream state and add/remove cameras at runtime.
+Changes apply to the running process immediately (no restart); persist them in
+config.py / .env as well so they survive the next deploy.
+"""
+
+from fastapi import APIRouter, HTTPException
+from app.config import settings
+from app.schemas.camera import CameraConfigIn
+from app.services.camera_poller import poller_supervisor
+from app.services.poller_ownership import poller_ownership
+
+router = APIRouter()
+
+
+@router.get("/pollers", summary="alertStream state per camera")
+def get_pollers():
+    """
+    Connection state (connecting / streaming / stalled / backoff), reconnects and last data time.
+    With sharding enabled, only the cameras owned by the worker serving the request are listed.
+    """
+    result = poller_supervisor.status()
+    if settings.POLLER_SHARDING_ENABLED:
+        result["ownership"] = poller_ownership.status()
+    return result
+
+
+@router.put("/pollers/{cam_id}", summary="Add or update a camera at runtime")
+async def upsert_poller(cam_id: str, body: CameraConfigIn):
+    """Registers the camera and (re)starts its alertStream if polling is enabled."""
+    cam = body.model_dump(exclude_none=True)
+    old = settings.CAMERAS.get(cam_id)
+    if old and settings.CAMERA_IP_MAP.get(old["ip"]) == cam_id:
+        del settings.CAMERA_IP_MAP[old["ip"]]
+    settings.CAMERAS[cam_id] = cam
+    settings.CAMERA_IP_MAP[body.ip] = cam_id
+
+    if settings.CAMERA_POLLING_ENABLED and settings.POLLER_SHARDING_ENABLED:
+        poller_ownership.request_rebalance()
+    elif settings.CAMERA_POLLING_ENABLED:
+        poller_supervisor.add_camera(cam_id, cam)
+    return {"camera_id": cam_id, "status": "updated" if old else "added",
+            "polling": settings.CAMERA_POLLING_ENABLED}
+
+
+@router.delete("/pollers/{cam_id}", summary="Remove a camera at runtime")
+async def remove_poller(cam_id: str):
+    cam = settings.CAMERAS.pop(cam_id, None)
+    if cam is None:
+        raise HTTPException(status_code=404, detail=f"Camera '{cam_id}' not found")
+    if settings.CAMERA_IP_MAP.get(cam["ip"]) == cam_id:
+        del settings.CAMERA_IP_MAP[cam["ip"]]
+    await poller_supervisor.remove_camera(cam_id)
+    if settings.POLLER_SHARDING_ENABLED:
+        poller_ownership.request_rebalance()
+    return {"camera_id": cam_id, "status": "removed"}
@@ -1,22 +1,31 @@
 # app/routers/vehicles.py
 """UC4: Vehicle Identity & Classification — CRUD for registered vehicles (Phase 2)"""
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.vehicle import Vehicle
-from app.schemas.vehicle import VehicleCreate, VehicleOut
+from app.schemas.vehicle import VehicleCreate, VehicleLookupRequest, VehicleOut
+from app.services.plate_search import search_plates
+from app.services.vehicle_import import import_vehicles, iter_records
+from app.services.vehicle_service import (
+    lookup_vehicle_by_plate, lookup_vehicles_by_plates, registry_changed, apply_registry_change,
+)
 from datetime import datetime
+from app.utils.pagination import paginate
 
 router = APIRouter()
 
 
 @router.get("/vehicles", response_model=list[VehicleOut], summary="UC4 — List registered vehicles")
-def list_vehicles(vehicle_type: str = None, db: Session = Depends(get_db)):
+def list_vehicles(response: Response, vehicle_type: str = None, limit: int = Query(100, ge=1, le=1000),
+                  cursor: Optional[str] = None, db: Session = Depends(get_db)):
+    """Registered vehicles in registration order. Paged via X-Next-Cursor."""
     q = db.query(Vehicle)
     if vehicle_type:
         q = q.filter(Vehicle.vehicle_type == vehicle_type)
-    return q.all()
+    return paginate(q, response, Vehicle.id, cursor, limit, descending=False)
 
 
 @router.post("/vehicles", summary="UC4 — Register a new vehicle")
@@ -35,24 +44,72 @@ def register_vehicle(body: VehicleCreate, db: Session = Depends(get_db)):
         registered_at=datetime.utcnow(),
     )
     db.add(vehicle)
+    registry_changed(db, body.plate_number)
     db.commit()
+    apply_registry_change(db, body.plate_number)
     return {"status": "registered", "plate": body.plate_number}
 
 
+@router.post("/vehicles/import", summary="UC4 — Bulk import vehicles (CSV / NDJSON)")
+async def import_vehicle_registry(request: Request, format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+                                  update: bool = True, db: Session = Depends(get_db)):
+    """
+    Upload the registry as the raw request body: CSV with a header row
+    (plate_number, owner_name, vehicle_type[, employee_id, notes]) or NDJSON.
+    Format comes from ?format= or the Content-Type. Existing plates are updated
+    unless update=false. Returns counts and per-row errors with line numbers.
+    """
+    fmt = format or ("ndjson" if "json" in request.headers.get("content-type", "") else "csv")
+    try:
+        report = await import_vehicles(db, iter_records(request.stream(), fmt), update)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return report.as_dict()
+
+
 @router.delete("/vehicles/{plate}", summary="UC4 — Remove a vehicle")
 def remove_vehicle(plate: str, db: Session = Depends(get_db)):
     vehicle = db.query(Vehicle).filter(Vehicle.plate_number == plate).first()
     if not vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found")
     db.delete(vehicle)
+    registry_changed(db, plate)
     db.commit()
+    apply_registry_change(db, plate)
     return {"status": "removed", "plate": plate}
 
 
-@router.get("/vehicles/lookup/{plate}", summary="UC4 — Look up a plate number")
-def lookup_vehicle(plate: str, db: Session = Depends(get_db)):
-    vehicle = db.query(Vehicle).filter(Vehicle.plate_number == plate).first()
+@router.get("/vehicles/search", summary="UC4 — Partial plate search (registry + gate history)")
+def search_vehicle_plates(q: str = Query(..., description="Part of a plate, e.g. 1234"),
+                          limit: int = Query(20, ge=1, le=200), days: Optional[int] = Query(None, ge=1),
+                          db: Session = Depends(get_db)):
+    """
+    Substring match on normalized plates (case and separators ignored), ranked
+    exact → prefix → suffix → anywhere. gate_history groups entry_exit_log by
+    plate; days limits it to recent sightings.
+    """
+    try:
+        return search_plates(db, q, limit, days)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _lookup_result(plate: str, vehicle) -> dict:
     if not vehicle:
         return {"plate": plate, "status": "unknown", "registered": False}
     return {"plate": plate, "status": "known", "registered": True,
             "owner": vehicle.owner_name, "type": vehicle.vehicle_type}
+
+
+@router.get("/vehicles/lookup/{plate}", summary="UC4 — Look up a plate number")
+def lookup_vehicle(plate: str, db: Session = Depends(get_db)):
+    return _lookup_result(plate, lookup_vehicle_by_plate(db, plate))
+
+
+@router.post("/vehicles/lookup", summary="UC4 — Look up many plates at once")
+def lookup_vehicles(body: VehicleLookupRequest, db: Session = Depends(get_db)):
+    """Resolves up to 1000 plates from the registry cache (or one query). Duplicates are answered once."""
+    found = lookup_vehicles_by_plates(db, body.plates)
+    results = [_lookup_result(plate, vehicle) for plate, vehicle in found.items()]
+    known = sum(1 for r in results if r["registered"])
+    return {"known": known, "unknown": len(results) - known, "results": results}
@@ -1,32 +1,40 @@
 # app/routers/violations.py
 """UC5: Proactive Violation Alerts — list + resolve endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app.database import get_db
 from app.models.alert import Alert
 from app.schemas.alert import AlertOut
+from app.services.alert_service import announce_resolved
+from app.utils.pagination import paginate
 
 router = APIRouter()
 
 
 @router.get("/violations", response_model=list[AlertOut], summary="UC5 — List violation alerts")
-def get_violations(limit: int = 50, is_resolved: int = None, db: Session = Depends(get_db)):
-    """Returns violation alerts, newest first. Filter by is_resolved (0 or 1)."""
+def get_violations(response: Response, limit: int = Query(50, ge=1, le=500), cursor: Optional[str] = None,
+                   is_resolved: int = None, db: Session = Depends(get_db)):
+    """Returns violation alerts, newest first. Filter by is_resolved (0 or 1). Paged via X-Next-Cursor."""
     q = db.query(Alert).filter(Alert.alert_type == "violation")
     if is_resolved is not None:
         q = q.filter(Alert.is_resolved == is_resolved)
-    return q.order_by(Alert.triggered_at.desc()).limit(limit).all()
+    return paginate(q, response, Alert.id, cursor, limit, Alert.triggered_at, "triggered_at")
 
 
 @router.put("/violations/{alert_id}/resolve", summary="UC5 — Resolve a violation")
 def resolve_violation(alert_id: int, db: Session = Depends(get_db)):
-    """Mark a violation alert as resolved."""
+    """Mark a violation alert as resolved. Resolving it again is a no-op."""
     alert = db.query(Alert).filter(Alert.id == alert_id, Alert.alert_type == "violation").first()
     if not alert:
         raise HTTPException(status_code=404, detail="Violation not found")
-    alert.is_resolved = 1
-    alert.resolved_at = datetime.utcnow()
+    # Conditional update: of two concurrent resolves only one changes the row and announces it
+    updated = db.query(Alert).filter(Alert.id == alert_id, Alert.is_resolved == 0).update(
+        {Alert.is_resolved: 1, Alert.resolved_at: datetime.utcnow()}, synchronize_session=False)
     db.commit()
+    if not updated:
+        return {"id": alert_id, "status": "already_resolved"}
+    announce_resolved("violation", 1, alert.zone_id, [alert_id])
     return {"id": alert_id, "status": "resolved"}
@@ -0,0 +1,68 @@
+# app/routers/zone_rules.py
+"""UC5 + UC6: Zone rule management — changes apply on every worker without a restart."""
+
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.models.zone_rule import ZoneRule
+from app.schemas.zone_rule import ZoneRuleIn, ZoneRuleOut
+from app.services.zone_rule_engine import rule_engine, rules_changed, local_now, NO_REGION
+
+router = APIRouter()
+
+
+def _apply(db: Session, rule_id: int):
+    rules_changed(db, rule_id)
+    db.commit()
+    rule_engine.load(db)
+
+
+@router.get("/zone-rules", response_model=list[ZoneRuleOut], summary="List zone rules")
+def list_rules(action: Optional[str] = None, db: Session = Depends(get_db)):
+    q = db.query(ZoneRule)
+    if action:
+        q = q.filter(ZoneRule.action == action)
+    return q.order_by(ZoneRule.id).all()
+
+
+@router.post("/zone-rules", response_model=ZoneRuleOut, summary="Create a zone rule")
+def create_rule(body: ZoneRuleIn, db: Session = Depends(get_db)):
+    rule = ZoneRule(**body.model_dump(), updated_at=datetime.utcnow())
+    db.add(rule)
+    db.flush()
+    _apply(db, rule.id)
+    return rule
+
+
+@router.put("/zone-rules/{rule_id}", response_model=ZoneRuleOut, summary="Replace a zone rule")
+def update_rule(rule_id: int, body: ZoneRuleIn, db: Session = Depends(get_db)):
+    rule = db.query(ZoneRule).filter(ZoneRule.id == rule_id).first()
+    if not rule:
+        raise HTTPException(status_code=404, detail="Rule not found")
+    for field, value in body.model_dump().items():
+        setattr(rule, field, value)
+    rule.updated_at = datetime.utcnow()
+    _apply(db, rule_id)
+    return rule
+
+
+@router.delete("/zone-rules/{rule_id}", summary="Delete a zone rule")
+def delete_rule(rule_id: int, db: Session = Depends(get_db)):
+    rule = db.query(ZoneRule).filter(ZoneRule.id == rule_id).first()
+    if not rule:
+        raise HTTPException(status_code=404, detail="Rule not found")
+    db.delete(rule)
+    _apply(db, rule_id)
+    return {"status": "deleted", "id": rule_id}
+
+
+@router.get("/zone-rules/evaluate", summary="Which rules would fire for a detection")
+def evaluate_rules(camera_id: str, event_type: str, zone_id: str = NO_REGION,
+                   detection_target: Optional[str] = None, at: Optional[datetime] = None):
+    """Dry-run the compiled rules. `at` is UTC (default now)."""
+    local = local_now(at)
+    winners = rule_engine.evaluate(zone_id, camera_id, event_type, detection_target, local)
+    return {"local_time": local.isoformat(), "rules_compiled": len(rule_engine),
+            "matches": {action: rule.id for action, rule in winners.items()}}
@@ -14,6 +14,7 @@ class AlertOut(BaseModel):
     is_resolved: int
     triggered_at: datetime
     resolved_at: Optional[datetime]
+    incident_id: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,12 @@
+# app/schemas/camera.py
+from pydantic import BaseModel
+from typing import Optional
+
+
+class CameraConfigIn(BaseModel):
+    ip: str
+    user: str
+    password: str
+    name: Optional[str] = None
+    phase: int = 1
+    gate: Optional[str] = None    # entry | exit (ANPR cameras only)
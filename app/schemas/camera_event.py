@@ -7,7 +7,7 @@ from typing import Optional
 class CameraEventOut(BaseModel):
     id: int
     camera_id: str
-    device_serial: str
+    device_serial: Optional[str]
     channel_id: Optional[int]
     event_type: str
     event_state: Optional[str]
@@ -21,3 +21,7 @@ class CameraEventOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class CameraEventRawOut(CameraEventOut):
+    raw_payload: Optional[str] = None       # left unset (and omitted) unless include_raw=true
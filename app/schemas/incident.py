@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+from app.schemas.alert import AlertOut
+
+
+class IncidentOut(BaseModel):
+    id: int
+    camera_id: str
+    zone_id: Optional[str]
+    event_type: Optional[str]
+    alert_types: Optional[str]
+    alert_count: int
+    snapshot_path: Optional[str]
+    opened_at: datetime
+    last_alert_at: datetime
+    is_resolved: int
+    resolved_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+
+class IncidentDetailOut(IncidentOut):
+    alerts: list[AlertOut] = []
@@ -1,5 +1,5 @@
 # app/schemas/vehicle.py  🔜 Phase 2
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
 
@@ -24,3 +24,7 @@ class VehicleOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class VehicleLookupRequest(BaseModel):
+    plates: list[str] = Field(..., min_length=1, max_length=1000)
@@ -0,0 +1,41 @@
+# app/schemas/zone_rule.py
+from pydantic import BaseModel, field_validator
+from datetime import datetime, time
+from typing import Optional
+
+
+class ZoneRuleIn(BaseModel):
+    zone_id: Optional[str] = None            # None = any zone; "-" = events without a region
+    camera_id: Optional[str] = None
+    event_type: Optional[str] = None
+    detection_target: Optional[str] = None   # vehicle | human
+    days: Optional[str] = None               # "0,1,2,3,4" — Monday = 0
+    start_time: Optional[time] = None        # local time; end <= start wraps past midnight
+    end_time: Optional[time] = None
+    action: str                              # violation | intrusion
+    dwell_seconds: Optional[int] = None
+    priority: int = 0
+    enabled: bool = True
+    description: Optional[str] = None
+
+    @field_validator("action")
+    @classmethod
+    def _action(cls, v):
+        if v not in ("violation", "intrusion"):
+            raise ValueError("action must be 'violation' or 'intrusion'")
+        return v
+
+    @field_validator("days")
+    @classmethod
+    def _days(cls, v):
+        if v and not all(d.strip().isdigit() and 0 <= int(d) <= 6 for d in v.split(",")):
+            raise ValueError("days must be comma-separated weekday numbers 0-6 (Monday = 0)")
+        return v
+
+
+class ZoneRuleOut(ZoneRuleIn):
+    id: int
+    updated_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
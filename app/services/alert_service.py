@@ -1,23 +1,214 @@
 # app/services/alert_service.py
 """
 Shared alert creation service.
-Used by occupancy_service, violation_service, intrusion_service, and entry_exit_service.
-Extend here to add push notifications, SMS, email, etc.
+Used by occupancy_service, overstay_service and entry_exit_service; violation and
+intrusion alerts go through incident_service, which writes them the same way.
+
+With the alert sink running, create_alert() only enqueues: a single writer task
+inserts queued alerts in batches (one commit per batch, at most
+ALERT_SINK_BATCH_SIZE rows or ALERT_SINK_FLUSH_SECONDS of waiting), then hands
+them to notification_fanout for webhook/syslog/SMTP delivery and to the
+live feed (event_bus). Ingest never
+waits on the alerts table or on a notifier. Without the sink (scripts, tests,
+or a full queue) the alert is inserted and committed inline, as before.
 """
 
+import asyncio
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
+from typing import Optional
 from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
 from app.models.alert import Alert
+from app.services.event_bus import event_bus
+from app.services.notifiers import notification_fanout
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-async def create_alert(db, alert_type, camera_id, zone_id, event_type, description):
-    """Create and persist an alert record. Always commits immediately."""
-    db.add(Alert(alert_type=alert_type, camera_id=camera_id, zone_id=zone_id,
-                 event_type=event_type, description=description,
-                 is_resolved=0, triggered_at=datetime.utcnow()))
-    db.commit()
+@dataclass
+class AlertRecord:
+    alert_type: str
+    camera_id: Optional[str]
+    zone_id: Optional[str]
+    event_type: Optional[str]
+    description: str
+    triggered_at: datetime = field(default_factory=datetime.utcnow)
+    incident_id: Optional[int] = None
+    id: Optional[int] = None                # set once the row is written
+
+    def to_row(self) -> Alert:
+        return Alert(alert_type=self.alert_type, camera_id=self.camera_id, zone_id=self.zone_id,
+                     event_type=self.event_type, description=self.description,
+                     is_resolved=0, triggered_at=self.triggered_at, incident_id=self.incident_id)
+
+
+class AlertSink:
+    def __init__(self, batch_size: int, flush_seconds: float, queue_size: int):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.queue_size = queue_size
+        self.queue: Optional[asyncio.Queue] = None
+        self.written = 0
+        self._last_raised: dict[tuple[str, Optional[str]], datetime] = {}
+        self._queued: dict[tuple[str, Optional[str]], int] = {}     # not yet written, per type/zone
+        self._written_cond: Optional[asyncio.Condition] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def raised_since(self, alert_type: str, zone_id: Optional[str], since: datetime) -> bool:
+        """
+        Whether this process queued such an alert after `since`. Cooldown checks query the
+        alerts table, which lags the queue by up to one batch; this covers the gap.
+        """
+        if not self.running:
+            return False        # inline writes are already visible to the query
+        last = self._last_raised.get((alert_type, zone_id))
+        return last is not None and last >= since
+
+    def pending(self, alert_type: str, zone_id: Optional[str]) -> bool:
+        """Whether such an alert is queued and not yet in the alerts table."""
+        return self._queued.get((alert_type, zone_id), 0) > 0
+
+    async def wait_written(self, alert_type: str, zone_id: Optional[str]):
+        """Wait until no such alert is queued — e.g. before resolving it in the table."""
+        if self._written_cond is None:
+            return
+        async with self._written_cond:
+            await self._written_cond.wait_for(lambda: not self.pending(alert_type, zone_id))
+
+    def note(self, alert: AlertRecord):
+        self._last_raised[(alert.alert_type, alert.zone_id)] = alert.triggered_at
+
+    def put(self, alert: AlertRecord) -> bool:
+        """Queue an alert for the next batch. False if the sink is not running or is full."""
+        if self.queue is None:
+            return False
+        try:
+            self.queue.put_nowait(alert)
+        except asyncio.QueueFull:
+            return False
+        key = (alert.alert_type, alert.zone_id)
+        self._queued[key] = self._queued.get(key, 0) + 1
+        return True
+
+    def _write(self, batch: list[AlertRecord]):
+        db = SessionLocal()
+        try:
+            write_alerts(db, batch)
+            db.commit()
+        finally:
+            db.close()
+
+    async def _collect(self) -> list[AlertRecord]:
+        batch = [await self.queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.flush_seconds
+        while len(batch) < self.batch_size:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush(self, batch: list[AlertRecord]):
+        try:
+            self._write(batch)
+            stored = batch
+        except Exception as e:
+            logger.error(f"[ALERT] Batch insert of {len(batch)} alerts failed: {e}", exc_info=True)
+            stored = []
+            for alert in batch:
+                try:
+                    self._write([alert])       # isolate the bad row; keep the rest
+                    stored.append(alert)
+                except Exception as row_error:
+                    alert.id = None            # flushed but rolled back
+                    logger.error(f"[ALERT] Dropped alert {alert.alert_type}/{alert.zone_id}: {row_error}")
+        self.written += len(stored)
+        for alert in batch:
+            key = (alert.alert_type, alert.zone_id)
+            left = self._queued.pop(key, 0) - 1
+            if left > 0:
+                self._queued[key] = left
+        async with self._written_cond:
+            self._written_cond.notify_all()
+        for alert in stored:           # a dropped alert was never stored: nothing to notify or resolve
+            announce(alert)
+        for _ in batch:
+            self.queue.task_done()
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            await self._flush(batch)
+
+    def start(self):
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._written_cond = asyncio.Condition()
+        self._task = asyncio.create_task(self._run(), name="alert-sink")
+        logger.info(f"[ALERT] Alert sink started (batch={self.batch_size}, flush={self.flush_seconds}s)")
+
+    async def stop(self):
+        """Write everything still queued, then stop."""
+        if self._task is None:
+            return
+        await self.queue.join()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self.queue = None
+        self._written_cond = None
+
+    def stats(self) -> dict:
+        return {"queued": self.queue.qsize() if self.queue else 0, "written": self.written}
+
+
+def write_alerts(db: Session, alerts: list[AlertRecord]):
+    """Add alert rows to `db` and fill in their ids. Caller commits."""
+    rows = [a.to_row() for a in alerts]
+    db.add_all(rows)
+    db.flush()
+    for a, row in zip(alerts, rows):
+        a.id = row.id
+
+
+def announce(alert: AlertRecord):
+    """After an alert is committed: outbound notifiers + live feed."""
+    notification_fanout.publish(alert)
+    event_bus.publish("alert", **asdict(alert))
+
+
+def announce_resolved(alert_type: str, count: int, zone_id: Optional[str] = None, ids: Optional[list[int]] = None):
+    """After alerts are resolved and committed: tell the live feed / dashboard."""
+    if count:
+        event_bus.publish("alert_resolved", alert_type=alert_type, count=count, zone_id=zone_id, ids=ids)
+
+
+alert_sink = AlertSink(settings.ALERT_SINK_BATCH_SIZE, settings.ALERT_SINK_FLUSH_SECONDS,
+                       settings.ALERT_SINK_QUEUE_SIZE)
+
+
+async def create_alert(db: Session, alert_type, camera_id, zone_id, event_type, description):
+    """
+    Raise an alert. Queued for the batch writer when the sink is running, leaving `db`
+    untouched. When the sink is off or full the alert is added to `db` and the session
+    is committed (with whatever else the caller has pending) so it can be announced.
+    """
+    alert = AlertRecord(alert_type, camera_id, zone_id, event_type, description)
+    alert_sink.note(alert)
     logger.warning(f"[ALERT][{alert_type.upper()}] {description}")
-    # Extend here: push notification, SMS, email, etc.
+    if alert_sink.put(alert):
+        return
+    if alert_sink.running:
+        logger.warning("[ALERT] Alert sink queue full — writing inline")
+    write_alerts(db, [alert])
+    db.commit()
+    announce(alert)
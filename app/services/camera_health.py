@@ -0,0 +1,166 @@
+# app/services/camera_health.py
+"""
+Camera health monitor — probes every configured camera in the background
+and keeps the latest reachability state in memory.
+
+Camera:   all cameras in settings.CAMERAS
+Endpoint: GET http://{cam_ip}/ISAPI/System/deviceInfo
+Used by:  routers/health.py — /health answers from the cached state,
+          /health?deep=true runs a fresh probe round before answering.
+
+All cameras are probed concurrently, so one probe round takes at most
+HEALTH_PROBE_TIMEOUT_SECONDS no matter how many cameras are down.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Optional
+
+import httpx
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import engine
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEVICE_INFO_PATH = "/ISAPI/System/deviceInfo"
+
+# Camera statuses that mark the whole system as degraded
+_DEGRADED_STATUSES = {"unreachable", "timeout"}
+
+
+@dataclass
+class CameraHealth:
+    camera_id: str
+    status: str = "unknown"                 # ok | http_<code> | unreachable | timeout | error | unknown
+    reachable: bool = False
+    latency_ms: Optional[float] = None
+    last_checked: Optional[datetime] = None
+    last_ok: Optional[datetime] = None      # last successful probe
+    last_event_at: Optional[datetime] = None  # last event received from this camera
+    error: Optional[str] = None
+
+
+class CameraHealthMonitor:
+    """Background prober with a cached, lock-free snapshot of camera + DB health."""
+
+    def __init__(self, interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.cameras: dict[str, CameraHealth] = {}
+        self.database = "unknown"
+        self.last_run: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self._run_lock = asyncio.Lock()
+
+    def _state(self, cam_id: str) -> CameraHealth:
+        state = self.cameras.get(cam_id)
+        if state is None:
+            state = self.cameras[cam_id] = CameraHealth(camera_id=cam_id)
+        return state
+
+    async def _probe_camera(self, client: httpx.AsyncClient, cam_id: str, cam: dict):
+        state = self._state(cam_id)
+        started = time.perf_counter()
+        try:
+            resp = await client.get(
+                f"http://{cam['ip']}{DEVICE_INFO_PATH}",
+                auth=httpx.DigestAuth(cam["user"], cam["password"]),
+            )
+            state.status = "ok" if resp.status_code == 200 else f"http_{resp.status_code}"
+            state.reachable = True
+            state.error = None
+        except httpx.ConnectError as e:
+            state.status, state.reachable, state.error = "unreachable", False, str(e)
+        except httpx.TimeoutException:
+            state.status, state.reachable, state.error = "timeout", False, None
+        except Exception as e:
+            state.status, state.reachable, state.error = "error", False, str(e)
+
+        now = datetime.utcnow()
+        state.latency_ms = round((time.perf_counter() - started) * 1000, 1) if state.reachable else None
+        state.last_checked = now
+        if state.status == "ok":
+            state.last_ok = now
+
+    async def _probe_database(self):
+        def ping():
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        try:
+            await asyncio.wait_for(asyncio.to_thread(ping), timeout=self.timeout)
+            self.database = "ok"
+        except asyncio.TimeoutError:
+            self.database = "error: timeout"
+        except Exception as e:
+            self.database = f"error: {str(e)}"
+
+    async def run_once(self):
+        """Probe the database and all cameras concurrently, then update the cache."""
+        async with self._run_lock:
+            cameras = dict(settings.CAMERAS)
+            # Drop state for cameras that were removed from the config
+            for cam_id in set(self.cameras) - set(cameras):
+                del self.cameras[cam_id]
+
+            limits = httpx.Limits(max_connections=max(len(cameras), 1))
+            async with httpx.AsyncClient(timeout=self.timeout, limits=limits) as client:
+                await asyncio.gather(
+                    self._probe_database(),
+                    *(self._probe_camera(client, cam_id, cam) for cam_id, cam in cameras.items()),
+                )
+            self.last_run = datetime.utcnow()
+
+    def record_event(self, camera_id: str, when: Optional[datetime] = None):
+        """Mark that an event just arrived from a camera (webhook or alertStream)."""
+        if camera_id in settings.CAMERAS:
+            self._state(camera_id).last_event_at = when or datetime.utcnow()
+
+    def snapshot(self) -> dict:
+        """Current cached health, shaped like the /health response."""
+        degraded = self.database not in ("ok", "unknown") or any(
+            c.status in _DEGRADED_STATUSES for c in self.cameras.values()
+        )
+        return {
+            "status": "degraded" if degraded else "ok",
+            "timestamp": datetime.utcnow().isoformat(),
+            "checked_at": self.last_run.isoformat() if self.last_run else None,
+            "backend": "ok",
+            "database": self.database,
+            "cameras": {cam_id: c.status for cam_id, c in self.cameras.items()},
+            "camera_details": {cam_id: asdict(c) for cam_id, c in self.cameras.items()},
+        }
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"[HEALTH] Probe round failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start the background probe loop. Called once at backend startup."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="camera-health-monitor")
+            logger.info(f"[HEALTH] Monitor started — every {self.interval}s for {len(settings.CAMERAS)} cameras")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+health_monitor = CameraHealthMonitor(
+    interval=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+)
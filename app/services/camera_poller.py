@@ -8,19 +8,37 @@ on their alertStream endpoint in real-time.
 
 Endpoint: GET http://{cam_ip}/ISAPI/Event/notification/alertStream
 Protocol: HTTP multipart stream — camera sends XML event chunks continuously.
+
+One PollerSupervisor owns every stream. Each camera runs a small state machine:
+
+    connecting → streaming → (stalled | backoff) → connecting → ...
+
+  - stalled:  no bytes (events or heartbeats) for POLLER_IDLE_TIMEOUT_SECONDS —
+              catches half-open TCP streams that would otherwise hang forever.
+  - backoff:  waiting before the next connect; exponential with full jitter so
+              hundreds of cameras never retry in lockstep.
+
+Cameras can be added, updated and removed at runtime (see routers/pollers.py).
+All streams share one httpx client, so 500 streams cost 500 sockets and
+500 lightweight tasks — nothing per-camera beyond the stream state.
 """
 
 import asyncio
+import random
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
 import httpx
 from app.config import settings
-from app.services.event_parser import parse_camera_event
-from app.services.event_dispatcher import dispatch_event
+from app.services.event_ingest import submit_raw_event
 from app.database import SessionLocal
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-# Reconnect delay in seconds (doubles on each failure, max 60s)
+# Reconnect delay in seconds (exponential with full jitter, max 60s)
 _MIN_BACKOFF = 3
 _MAX_BACKOFF = 60
 
@@ -29,104 +47,232 @@ _BOUNDARY_MARKER = b"--boundary"
 _EVENT_START     = b"<EventNotificationAlert"
 _EVENT_END       = b"</EventNotificationAlert>"
 
+# Drop buffered bytes that never form an event (e.g. image parts) past this size
+_MAX_BUFFER_BYTES = 1024 * 1024
 
-async def _poll_camera(cam_id: str, cam: dict):
-    """
-    Opens a persistent connection to one camera's alertStream and dispatches
-    events as they arrive. Reconnects automatically on failure.
-    """
-    url = f"http://{cam['ip']}/ISAPI/Event/notification/alertStream"
-    backoff = _MIN_BACKOFF
 
-    while True:
-        logger.info(f"📡 Connecting to alertStream: {cam_id} ({cam['ip']})")
+class StreamState(str, Enum):
+    CONNECTING = "connecting"
+    STREAMING = "streaming"
+    STALLED = "stalled"
+    BACKOFF = "backoff"
+    STOPPED = "stopped"
+
+
+@dataclass
+class CameraStream:
+    cam_id: str
+    cam: dict
+    state: StreamState = StreamState.CONNECTING
+    failures: int = 0                       # consecutive failed connects (drives backoff)
+    reconnects: int = 0
+    events_received: int = 0
+    connected_at: Optional[datetime] = None
+    last_data_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.cam['ip']}/ISAPI/Event/notification/alertStream"
+
+    def as_dict(self) -> dict:
+        return {
+            "camera_id": self.cam_id,
+            "ip": self.cam.get("ip"),
+            "state": self.state.value,
+            "failures": self.failures,
+            "reconnects": self.reconnects,
+            "events_received": self.events_received,
+            "connected_at": self.connected_at,
+            "last_data_at": self.last_data_at,
+            "last_error": self.last_error,
+        }
+
+
+def _backoff_delay(failures: int) -> float:
+    """Full-jitter exponential backoff: uniform(MIN, min(MAX, MIN * 2^failures))."""
+    ceiling = min(_MAX_BACKOFF, _MIN_BACKOFF * (2 ** min(failures, 10)))
+    return random.uniform(_MIN_BACKOFF, max(ceiling, _MIN_BACKOFF))
+
+
+class PollerSupervisor:
+    """Owns one alertStream task per camera and restarts them as config changes."""
+
+    def __init__(self):
+        self.streams: dict[str, CameraStream] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                # read = idle timeout between chunks; cameras send heartbeats well inside it
+                timeout=httpx.Timeout(
+                    connect=settings.POLLER_CONNECT_TIMEOUT_SECONDS,
+                    read=settings.POLLER_IDLE_TIMEOUT_SECONDS,
+                    write=10,
+                    pool=None,
+                ),
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=0),
+            )
+        return self._client
+
+    # ── Lifecycle ────────────────────────────────────────────────────────
+    def start(self, cameras: dict):
+        """Start a stream for every camera. Initial connects are spread out."""
+        if not cameras:
+            logger.warning("No cameras configured — polling disabled.")
+            return
+        logger.info(f"🚀 Starting camera polling for {len(cameras)} cameras...")
+        for cam_id, cam in cameras.items():
+            self.add_camera(cam_id, cam, initial_delay=random.uniform(0, settings.POLLER_STARTUP_SPREAD_SECONDS))
+
+    async def stop(self):
+        for cam_id in list(self.streams):
+            await self.remove_camera(cam_id)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def add_camera(self, cam_id: str, cam: dict, initial_delay: float = 0.0):
+        """Start polling a camera. If it is already polled with a different config, restart it."""
+        existing = self.streams.get(cam_id)
+        if existing is not None:
+            if existing.cam == cam and existing.task and not existing.task.done():
+                return
+            existing.task.cancel()
+
+        stream = CameraStream(cam_id=cam_id, cam=dict(cam))
+        stream.task = asyncio.create_task(self._run(stream, initial_delay), name=f"poller-{cam_id}")
+        self.streams[cam_id] = stream
+
+    async def remove_camera(self, cam_id: str):
+        stream = self.streams.pop(cam_id, None)
+        if stream is None:
+            return
+        stream.task.cancel()
         try:
-            # Hikvision requires HTTP Digest Auth (not Basic)
-            auth = httpx.DigestAuth(cam["user"], cam["password"])
-            async with httpx.AsyncClient(auth=auth, timeout=None) as client:
-                async with client.stream("GET", url) as response:
+            await stream.task
+        except asyncio.CancelledError:
+            pass
+        stream.state = StreamState.STOPPED
+        logger.info(f"🛑 {cam_id} alertStream stopped")
+
+    async def reconcile(self, cameras: dict):
+        """Make the running streams match `cameras` exactly (add, restart changed, remove)."""
+        for cam_id in set(self.streams) - set(cameras):
+            await self.remove_camera(cam_id)
+        for cam_id, cam in cameras.items():
+            self.add_camera(cam_id, cam)
+
+    def status(self) -> dict:
+        counts: dict[str, int] = {}
+        for s in self.streams.values():
+            counts[s.state.value] = counts.get(s.state.value, 0) + 1
+        return {
+            "total": len(self.streams),
+            "by_state": counts,
+            "cameras": {cam_id: s.as_dict() for cam_id, s in self.streams.items()},
+        }
+
+    # ── Per-camera loop ──────────────────────────────────────────────────
+    async def _run(self, stream: CameraStream, initial_delay: float = 0.0):
+        """
+        Opens a persistent connection to one camera's alertStream and dispatches
+        events as they arrive. Reconnects with jittered backoff on failure.
+        """
+        if initial_delay:
+            await asyncio.sleep(initial_delay)
+
+        cam_id, cam = stream.cam_id, stream.cam
+        auth = httpx.DigestAuth(cam["user"], cam["password"])   # Hikvision requires Digest, not Basic
+
+        while True:
+            stream.state = StreamState.CONNECTING
+            logger.info(f"📡 Connecting to alertStream: {cam_id} ({cam['ip']})")
+            try:
+                async with self._get_client().stream("GET", stream.url, auth=auth) as response:
                     if response.status_code != 200:
-                        logger.warning(
-                            f"⚠️  {cam_id} alertStream returned HTTP {response.status_code}"
+                        raise httpx.HTTPStatusError(
+                            f"HTTP {response.status_code}", request=response.request, response=response
                         )
-                        await asyncio.sleep(backoff)
-                        backoff = min(backoff * 2, _MAX_BACKOFF)
-                        continue
 
                     logger.info(f"✅ {cam_id} alertStream connected — listening for events...")
-                    backoff = _MIN_BACKOFF  # reset on success
+                    stream.state = StreamState.STREAMING
+                    stream.connected_at = datetime.utcnow()
+                    stream.failures = 0
+                    stream.last_error = None
 
-                    buffer = b""
+                    buffer = bytearray()
                     async for chunk in response.aiter_bytes(chunk_size=4096):
+                        stream.last_data_at = datetime.utcnow()
                         buffer += chunk
                         # Extract complete XML events from the buffer
-                        while _EVENT_START in buffer and _EVENT_END in buffer:
+                        while True:
                             start = buffer.find(_EVENT_START)
-                            end   = buffer.find(_EVENT_END) + len(_EVENT_END)
-                            xml_bytes = buffer[start:end]
-                            buffer = buffer[end:]
+                            if start < 0:
+                                if len(buffer) > _MAX_BUFFER_BYTES:
+                                    del buffer[:-len(_EVENT_START)]
+                                break
+                            end = buffer.find(_EVENT_END, start)
+                            if end < 0:
+                                break
+                            end += len(_EVENT_END)
+                            xml_bytes = bytes(buffer[start:end])
+                            del buffer[:end]
+                            stream.events_received += 1
                             await _handle_event(xml_bytes, cam_id, cam["ip"])
 
-        except httpx.ConnectError:
-            logger.warning(f"❌ {cam_id} — connection refused. Retry in {backoff}s")
-        except httpx.ReadTimeout:
-            logger.warning(f"⏱  {cam_id} — read timeout. Reconnecting...")
-        except Exception as e:
-            logger.error(f"❌ {cam_id} — unexpected error: {e}", exc_info=True)
+                stream.last_error = "stream closed by camera"
+                logger.warning(f"⚠️  {cam_id} alertStream closed by camera")
+
+            except httpx.ReadTimeout:
+                stream.state = StreamState.STALLED
+                stream.last_error = f"no data for {settings.POLLER_IDLE_TIMEOUT_SECONDS}s"
+                logger.warning(f"⏱  {cam_id} — stream stalled ({stream.last_error}). Reconnecting...")
+            except httpx.ConnectError:
+                stream.last_error = "connection refused"
+                logger.warning(f"❌ {cam_id} — connection refused")
+            except httpx.ConnectTimeout:
+                stream.last_error = "connect timeout"
+                logger.warning(f"❌ {cam_id} — connect timeout")
+            except httpx.HTTPStatusError as e:
+                stream.last_error = str(e)
+                logger.warning(f"⚠️  {cam_id} alertStream returned {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stream.last_error = str(e)
+                logger.error(f"❌ {cam_id} — unexpected error: {e}", exc_info=True)
 
-        await asyncio.sleep(backoff)
-        backoff = min(backoff * 2, _MAX_BACKOFF)
+            stream.failures += 1
+            stream.reconnects += 1
+            delay = _backoff_delay(stream.failures)
+            if stream.state != StreamState.STALLED:
+                stream.state = StreamState.BACKOFF
+            logger.info(f"↻ {cam_id} — retry in {delay:.1f}s")
+            await asyncio.sleep(delay)
 
 
 async def _handle_event(xml_bytes: bytes, cam_id: str, cam_ip: str):
-    """Parse and dispatch a single XML event from the stream."""
+    """Parse and dispatch (or enqueue) a single XML event from the stream."""
+    logger.debug(f"🔍 RAW XML from {cam_id}:\n{xml_bytes.decode('utf-8', errors='replace')}")
+    # Use a fresh DB session per event
+    db = SessionLocal()
     try:
-        logger.debug(f"🔍 RAW XML from {cam_id}:\n{xml_bytes.decode('utf-8', errors='replace')}")
-        event = parse_camera_event(xml_bytes, cam_ip, "application/xml")
-        logger.info(
-            f"📥 {cam_id} | type={event.event_type} "
-            f"target={event.detection_target} zone={event.region_id}"
-        )
-
-        # Use a fresh DB session per event
-        db = SessionLocal()
-        try:
-            from datetime import datetime
-            from app.models.camera_event import CameraEvent
-            db.add(CameraEvent(
-                camera_id=event.camera_id,
-                device_serial=event.device_serial,
-                channel_id=event.channel_id,
-                event_type=event.event_type,
-                detection_target=event.detection_target,
-                region_id=event.region_id,
-                channel_name=event.channel_name,
-                trigger_time=event.trigger_time,
-                raw_payload=xml_bytes.decode("utf-8", errors="replace"),
-                created_at=datetime.utcnow(),
-            ))
-            db.commit()
-            await dispatch_event(event, db)
-        finally:
-            db.close()
-
+        await submit_raw_event(xml_bytes, cam_ip, "application/xml", db)
     except Exception as e:
         logger.error(f"Event handling error from {cam_id}: {e}", exc_info=True)
+    finally:
+        db.close()
+
+
+poller_supervisor = PollerSupervisor()
 
 
 async def start_camera_polling(cameras: dict):
     """
-    Launch one polling task per camera concurrently.
-    Called once at backend startup.
+    Start supervised polling for all cameras.
+    Called once at backend startup. Returns immediately — streams run as tasks.
     """
-    if not cameras:
-        logger.warning("No cameras configured — polling disabled.")
-        return
-
-    logger.info(f"🚀 Starting camera polling for {len(cameras)} cameras...")
-    tasks = [
-        asyncio.create_task(_poll_camera(cam_id, cam), name=f"poller-{cam_id}")
-        for cam_id, cam in cameras.items()
-    ]
-    # Run all pollers concurrently (they loop forever internally)
-    await asyncio.gather(*tasks, return_exceptions=True)
+    poller_supervisor.start(cameras)
@@ -0,0 +1,139 @@
+# app/services/dashboard.py
+"""
+Dashboard read model — everything the landing page shows, kept in memory.
+
+  zones        occupancy per zone          ← "occupancy" messages
+  open_alerts  unresolved alerts per type  ← "alert" / "alert_resolved" messages
+  latest       last DASHBOARD_LATEST_ALERTS alerts
+  gates        today's entry/exit counts and vehicles inside (gate_counters,
+               open_sessions — already in memory)
+
+The services publish to event_bus after they commit; this model is a listener
+on the bus, so it changes exactly when the live feed does. Every change bumps
+`version`; the rendered summary is cached per (version, gate counts) and served
+with a matching ETag, so an unchanged poll costs a string comparison.
+
+Other workers' zone and alert changes only reach this process's bus through
+the database, so the model is reloaded every DASHBOARD_RESYNC_SECONDS.
+"""
+
+import asyncio
+import json
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.alert import Alert
+from app.models.zone_occupancy import ZoneOccupancy
+from app.services.event_bus import Message, event_bus, json_default
+from app.services.gate_counters import gate_counters
+from app.services.parking_session_service import open_sessions
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_ALERT_FIELDS = ("id", "alert_type", "camera_id", "zone_id", "event_type", "description",
+                 "triggered_at", "incident_id")
+
+
+class DashboardModel:
+    def __init__(self, latest_size: int):
+        self.zones: dict[str, dict] = {}
+        self.open_alerts: dict[str, int] = {}
+        self.latest: deque[dict] = deque(maxlen=latest_size)
+        self.version = 0
+        self.loaded = False
+        self._boot = uuid.uuid4().hex[:8]       # ETags from another process/run never match
+        self._rendered: Optional[tuple[tuple, str, bytes]] = None
+
+    # ── updates ──
+    def on_message(self, msg: Message):
+        if msg.topic == "occupancy":
+            self.zones[msg.data["zone_id"]] = msg.data
+        elif msg.topic == "alert":
+            d = msg.data
+            self.open_alerts[d["alert_type"]] = self.open_alerts.get(d["alert_type"], 0) + 1
+            self.latest.appendleft({k: d.get(k) for k in _ALERT_FIELDS} | {"is_resolved": 0})
+        elif msg.topic == "alert_resolved":
+            d = msg.data
+            self.open_alerts[d["alert_type"]] = max(self.open_alerts.get(d["alert_type"], 0) - d["count"], 0)
+            ids = set(d.get("ids") or ())
+            for a in self.latest:
+                if a["id"] in ids or (not ids and a["alert_type"] == d["alert_type"]
+                                      and a["zone_id"] == d.get("zone_id")):
+                    a["is_resolved"] = 1
+        else:
+            return
+        self.version += 1
+
+    def load(self, db: Session):
+        zones = {}
+        for z in db.query(ZoneOccupancy).all():
+            zones[z.zone_id] = {
+                "zone_id": z.zone_id, "current_count": z.current_count, "max_capacity": z.max_capacity,
+                "occupancy_percent": round(z.current_count / z.max_capacity * 100, 1) if z.max_capacity else 0,
+                "is_full": z.current_count >= z.max_capacity, "last_updated": z.last_updated,
+            }
+        open_alerts = dict(db.query(Alert.alert_type, func.count(Alert.id))
+                           .filter(Alert.is_resolved == 0).group_by(Alert.alert_type).all())
+        latest = [{**{k: getattr(a, k) for k in _ALERT_FIELDS}, "is_resolved": a.is_resolved}
+                  for a in db.query(Alert).order_by(Alert.triggered_at.desc()).limit(self.latest.maxlen)]
+        self.loaded = True
+        if (zones, open_alerts, latest) == (self.zones, self.open_alerts, list(self.latest)):
+            return                      # keep the ETag when a resync finds nothing new
+        self.zones, self.open_alerts = zones, open_alerts
+        self.latest.clear()
+        self.latest.extend(latest)
+        self.version += 1
+
+    # ── reads ──
+    def render(self) -> tuple[str, bytes]:
+        """(etag, JSON body) of the current summary. Rebuilt only when something changed."""
+        counts = gate_counters.snapshot()
+        key = (self.version, counts.day, counts.entries, counts.exits, len(open_sessions))
+        if self._rendered is None or self._rendered[0] != key:
+            body = {
+                "zones": sorted(self.zones.values(), key=lambda z: z["zone_id"]),
+                "open_alerts": {t: n for t, n in sorted(self.open_alerts.items()) if n},
+                "open_alerts_total": sum(self.open_alerts.values()),
+                "latest_alerts": list(self.latest),
+                "gates": {"date": counts.day, "total_entries": counts.entries, "total_exits": counts.exits,
+                          "currently_parked": len(open_sessions)},
+                "generated_at": datetime.utcnow(),
+            }
+            etag = f'W/"{self._boot}-{self.version}-{counts.entries}-{counts.exits}-{len(open_sessions)}-{counts.day}"'
+            self._rendered = (key, etag, json.dumps(body, default=json_default).encode())
+        return self._rendered[1], self._rendered[2]
+
+
+dashboard = DashboardModel(settings.DASHBOARD_LATEST_ALERTS)
+
+
+def _reload():
+    db = SessionLocal()
+    try:
+        dashboard.load(db)
+    finally:
+        db.close()
+
+
+async def run_dashboard_resync():
+    while True:
+        await asyncio.sleep(settings.DASHBOARD_RESYNC_SECONDS)
+        try:
+            _reload()
+        except Exception as e:
+            logger.error(f"[DASHBOARD] Resync failed: {e}", exc_info=True)
+
+
+def start_dashboard():
+    """Load the read model and follow the bus. Called once at startup."""
+    event_bus.add_listener(dashboard.on_message)
+    _reload()
+    logger.info(f"[DASHBOARD] Read model loaded: {len(dashboard.zones)} zones, "
+                f"{sum(dashboard.open_alerts.values())} open alerts")
+    asyncio.create_task(run_dashboard_resync(), name="dashboard-resync")
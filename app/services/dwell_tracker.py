@@ -0,0 +1,106 @@
+# app/services/dwell_tracker.py
+"""
+Streaming dwell tracking per (camera, region).
+
+Cameras report a target in a region as a run of eventState=active events,
+ended by eventState=inactive (or by silence if that one is lost). The tracker
+pairs these transitions: the first active event opens a dwell, inactive or
+DWELL_IDLE_TIMEOUT_SECONDS without an active event closes it. Two deadline
+timers per open dwell live in a timer wheel — the threshold (fires the
+on_threshold callback once) and the idle timeout (re-armed on every active
+event) — so nothing is polled.
+
+Used by violation_service for zones in VIOLATION_DWELL_SECONDS.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Hashable, Optional
+from app.utils.logger import get_logger
+from app.utils.timer_wheel import TimerWheel
+
+logger = get_logger(__name__)
+
+THRESHOLD = "threshold"
+IDLE = "idle"
+
+
+@dataclass
+class DwellState:
+    camera_id: str
+    zone_id: str
+    first_seen: datetime           # trigger_time of the first active event
+    last_seen: datetime            # trigger_time of the latest active event
+    threshold_seconds: float
+    event_type: Optional[str] = None
+    alerted: bool = False
+
+    @property
+    def dwell_seconds(self) -> float:
+        return (self.last_seen - self.first_seen).total_seconds()
+
+
+class DwellTracker:
+    def __init__(self, on_threshold: Callable[[DwellState], Awaitable[None]],
+                 idle_timeout: float, tick_seconds: float):
+        self.on_threshold = on_threshold
+        self.idle_timeout = idle_timeout
+        self.wheel = TimerWheel(tick_seconds, start=time.time())
+        self.states: dict[Hashable, DwellState] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def observe(self, camera_id: str, zone_id: str, event_state: Optional[str], event_time: datetime,
+                threshold_seconds: float, event_type: Optional[str] = None) -> Optional[DwellState]:
+        """Feed one region event. Returns the closed DwellState when this event ends a dwell."""
+        key = (camera_id, zone_id)
+        if event_state == "inactive":
+            return self.close(key)
+
+        now = time.time()
+        state = self.states.get(key)
+        if state is None:
+            state = self.states[key] = DwellState(camera_id, zone_id, event_time, event_time,
+                                                  threshold_seconds, event_type)
+            self.wheel.schedule((THRESHOLD, key), now + threshold_seconds, key)
+        elif event_time > state.last_seen:
+            state.last_seen = event_time
+        self.wheel.schedule((IDLE, key), now + self.idle_timeout, key)
+        return None
+
+    def close(self, key: Hashable) -> Optional[DwellState]:
+        state = self.states.pop(key, None)
+        self.wheel.cancel((THRESHOLD, key))
+        self.wheel.cancel((IDLE, key))
+        if state is not None:
+            logger.info(f"[UC5] {state.zone_id} on {state.camera_id}: vehicle left after "
+                        f"{state.dwell_seconds:.0f}s{' (alerted)' if state.alerted else ''}")
+        return state
+
+    async def tick(self, now: Optional[float] = None):
+        for (kind, _), key in self.wheel.advance(now if now is not None else time.time()):
+            if kind == IDLE:
+                self.close(key)
+            elif kind == THRESHOLD and key in self.states:
+                state = self.states[key]
+                state.alerted = True
+                try:
+                    await self.on_threshold(state)
+                except Exception as e:
+                    logger.error(f"[UC5] Dwell alert failed for {key}: {e}", exc_info=True)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.wheel.tick_seconds)
+            await self.tick()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="dwell-tracker")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
@@ -8,17 +8,34 @@ Key field: event.plate_number (= cardNo from camera)
 How it works:
   - CAM-ENTRY fires AccessControllerEvent → handle_anpr_event logs ENTRY + resolves vehicle
   - CAM-EXIT fires AccessControllerEvent  → handle_anpr_event logs EXIT + calculates duration
-  - Both are stored in entry_exit_log table
-  - Daily counts + avg duration derived via SQL queries in parking_stats router
+  - Both are stored in entry_exit_log table; ENTRY opens a parking session and
+    EXIT closes it (parking_session_service — no search over the log)
+  - OCR misreads ("ABC-1234" vs "A8C1234") fall back to a confusable-folded
+    match against the registry, and to a fuzzy match against the open sessions
+    when pairing an exit (utils/plate_matching)
+  - Today's entry/exit counts are kept in memory (gate_counters); vehicles
+    currently inside are the open sessions
+  - Every event also bumps its hourly bucket in parking_rollups, which the
+    parking_stats router reads; duration/plate sketches (parking_sketches)
+    feed the percentile and unique-plate stats
+  - Committed gate events are pushed to the live feed (event_bus, topic "gate")
 """
 
 from datetime import datetime
 from sqlalchemy.orm import Session
 from app.models.entry_exit_log import EntryExitLog
-from app.models.vehicle import Vehicle
+from app.services.vehicle_service import lookup_vehicle_by_plate, fuzzy_lookup_vehicle
+from app.services.parking_session_service import (
+    open_session, close_session, open_sessions, apply_session_opened, apply_session_closed,
+)
+from app.services.parking_rollups import record_rollup
+from app.services.parking_sketches import sketch_store
+from app.services.gate_counters import gate_counters, publish_gate_event
 from app.services.event_parser import ParsedCameraEvent
 from app.services.alert_service import create_alert
+from app.services.event_bus import event_bus
 from app.utils.logger import get_logger
+from app.utils.time_utils import to_naive_utc
 
 logger = get_logger(__name__)
 
@@ -31,42 +48,47 @@ async def handle_anpr_event(event: ParsedCameraEvent, db: Session):
         logger.warning(f"[Phase2] ANPR event with no plate from {event.camera_id} — skipped")
         return
 
-    # UC4: Resolve vehicle identity from DB
-    vehicle = db.query(Vehicle).filter(Vehicle.plate_number == plate).first()
+    # UC4: Resolve vehicle identity (in-memory registry cache, DB fallback)
+    vehicle = lookup_vehicle_by_plate(db, plate)
+    if not vehicle:
+        vehicle = fuzzy_lookup_vehicle(plate)
+        if vehicle:
+            logger.info(f"[UC4] Plate {plate} matched registered plate {vehicle.plate_number} (OCR confusables)")
     vehicle_type = vehicle.vehicle_type if vehicle else "unknown"
     person_name = vehicle.owner_name if vehicle else event.person_name or "Unknown"
 
     logger.info(f"[UC1] Gate={gate} | Plate={plate} | Type={vehicle_type} | Name={person_name}")
 
-    # Create entry/exit log record
+    # Create entry/exit log record — flushed first so the session rows can reference its id
+    event_time = to_naive_utc(event.trigger_time)
     log_entry = EntryExitLog(
         plate_number=plate,
         vehicle_id=vehicle.id if vehicle else None,
         vehicle_type=vehicle_type,
         gate=gate,
         camera_id=event.camera_id,
-        event_time=event.trigger_time,
+        event_time=event_time,
         created_at=datetime.utcnow(),
     )
+    db.add(log_entry)
+    db.flush()
 
-    # UC2: If this is an EXIT, find the matching ENTRY and calculate duration
-    if gate == "exit":
-        matching_entry = (
-            db.query(EntryExitLog)
-            .filter(
-                EntryExitLog.plate_number == plate,
-                EntryExitLog.gate == "entry",
-                EntryExitLog.matched_entry_id == None,  # not yet matched
-            )
-            .order_by(EntryExitLog.event_time.desc())
-            .first()
-        )
-        if matching_entry:
-            duration_seconds = int((event.trigger_time - matching_entry.event_time).total_seconds())
-            log_entry.matched_entry_id = matching_entry.id
-            log_entry.parking_duration = duration_seconds
-            matching_entry.matched_entry_id = log_entry.id  # cross-reference
-            logger.info(f"[UC2] Plate={plate} parked for {duration_seconds // 60} min")
+    opened = closed = None
+    if gate == "entry":
+        opened = open_session(db, log_entry)
+
+    # UC2: If this is an EXIT, close the plate's open session and record the duration
+    elif gate == "exit":
+        session = close_session(db, log_entry)
+        if session is None:
+            candidate = open_sessions.fuzzy_match(plate)
+            if candidate:
+                session = close_session(db, log_entry, plate=candidate)
+                if session:
+                    logger.info(f"[UC2] Exit plate {plate} paired with open session for {candidate} (OCR tolerance)")
+        if session:
+            closed = session.plate_number
+            logger.info(f"[UC2] Plate={plate} parked for {log_entry.parking_duration // 60} min")
         else:
             logger.warning(f"[UC2] No matching entry found for plate {plate} at exit")
 
@@ -81,5 +103,16 @@ async def handle_anpr_event(event: ParsedCameraEvent, db: Session):
             description=f"Unregistered vehicle at {gate} gate: plate {plate}",
         )
 
-    db.add(log_entry)
+    log_id, duration = log_entry.id, log_entry.parking_duration if gate == "exit" else None
+    record_rollup(db, gate, event_time, duration)
+    publish_gate_event(db, gate, event_time)
     db.commit()
+    if opened:
+        apply_session_opened(opened)
+    if closed:
+        apply_session_closed(closed)
+    gate_counters.record(gate, event_time)
+    sketch_store.record(event_time, plate, duration)
+    event_bus.publish("gate", id=log_id, gate=gate, plate_number=plate, camera_id=event.camera_id,
+                      vehicle_type=vehicle_type, is_registered=vehicle is not None, event_time=event_time,
+                      parking_duration=duration, currently_parked=len(open_sessions))
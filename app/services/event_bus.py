@@ -0,0 +1,174 @@
+# app/services/event_bus.py
+"""
+In-process pub/sub bus for the live dashboard feed (routers/live.py).
+
+Publishers: zone_actors / occupancy_service ("occupancy"), alert_service and
+incident_service ("alert"), alert resolution ("alert_resolved"), entry_exit_service ("gate").
+In-process read models (dashboard.py) register a synchronous listener.
+
+publish() serializes a message once — JSON body, SSE frame and WebSocket frame
+are built on first use and shared by every subscriber — stamps it with a
+sequence id and keeps the last LIVE_BUFFER_SIZE messages in a ring buffer.
+
+Each subscriber has a bounded queue. A subscriber that falls LIVE_SUBSCRIBER_QUEUE_SIZE
+messages behind is not allowed to slow the publisher: its queue is dropped and
+it catches up from the ring buffer, the same path used to resume from a client's
+Last-Event-ID. When the gap is older than the buffer it gets a "reset" message
+and should reload its state over REST.
+
+The bus is per process: with several uvicorn workers, a client only sees events
+handled by the worker it is connected to.
+"""
+
+import asyncio
+import itertools
+import json
+from collections import deque
+from datetime import datetime
+from typing import AsyncIterator, Iterable, Optional
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RESET = "reset"
+
+
+class Message:
+    __slots__ = ("id", "topic", "data", "_json", "_sse", "_ws")
+
+    def __init__(self, msg_id: int, topic: str, data: dict):
+        self.id = msg_id
+        self.topic = topic
+        self.data = data
+        self._json = self._sse = self._ws = None
+
+    @property
+    def json(self) -> str:
+        if self._json is None:
+            self._json = json.dumps(self.data, default=json_default, separators=(",", ":"))
+        return self._json
+
+    @property
+    def sse(self) -> bytes:
+        if self._sse is None:
+            self._sse = f"id: {self.id}\nevent: {self.topic}\ndata: {self.json}\n\n".encode()
+        return self._sse
+
+    @property
+    def ws(self) -> str:
+        if self._ws is None:
+            self._ws = f'{{"id":{self.id},"topic":"{self.topic}","data":{self.json}}}'
+        return self._ws
+
+
+def json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class Subscriber:
+    def __init__(self, topics: Optional[set[str]], queue_size: int, last_id: int):
+        self.topics = topics
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.last_id = last_id
+        self.lagged = False
+        self.dropped = 0
+
+    def wants(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+
+class EventBus:
+    def __init__(self, buffer_size: int, queue_size: int):
+        self.buffer: deque[Message] = deque(maxlen=buffer_size)
+        self.queue_size = queue_size
+        self.subscribers: set[Subscriber] = set()
+        self.listeners: list = []
+        self._ids = itertools.count(1)
+        self.last_id = 0
+
+    def publish(self, topic: str, **data) -> Message:
+        msg = Message(next(self._ids), topic, data)
+        self.last_id = msg.id
+        self.buffer.append(msg)
+        for listener in self.listeners:
+            try:
+                listener(msg)
+            except Exception as e:
+                logger.error(f"[LIVE] Listener failed on {topic}: {e}", exc_info=True)
+        for sub in self.subscribers:
+            if sub.lagged or not sub.wants(topic):
+                continue
+            try:
+                sub.queue.put_nowait(msg)
+            except asyncio.QueueFull:
+                sub.lagged = True           # stop queueing; it catches up from the buffer
+                sub.dropped += 1
+        return msg
+
+    def since(self, last_id: int, topics: Optional[set[str]] = None) -> Optional[list[Message]]:
+        """Buffered messages after last_id, or None if some of them have already left the buffer."""
+        if last_id >= self.last_id:
+            return []
+        if not self.buffer or self.buffer[0].id > last_id + 1:
+            return None
+        start = last_id + 1 - self.buffer[0].id
+        return [m for m in itertools.islice(self.buffer, start, None) if topics is None or m.topic in topics]
+
+    def subscribe(self, topics: Optional[Iterable[str]] = None, last_event_id: Optional[int] = None) -> Subscriber:
+        """Register a subscriber. With last_event_id it first replays what it missed."""
+        if last_event_id is not None and last_event_id > self.last_id:
+            last_event_id = -1              # id from before a restart: force a reset
+        sub = Subscriber(set(topics) if topics else None, self.queue_size,
+                         self.last_id if last_event_id is None else last_event_id)
+        sub.lagged = last_event_id is not None and last_event_id < self.last_id
+        self.subscribers.add(sub)
+        return sub
+
+    def add_listener(self, listener):
+        """Call listener(msg) synchronously on every publish (in-process read models)."""
+        self.listeners.append(listener)
+
+    def unsubscribe(self, sub: Subscriber):
+        self.subscribers.discard(sub)
+
+    def _reset(self) -> Message:
+        return Message(self.last_id, RESET, {"reason": "missed messages are no longer buffered"})
+
+    async def messages(self, sub: Subscriber, timeout: Optional[float] = None) -> AsyncIterator[Optional[Message]]:
+        """
+        Messages for `sub` in id order, without gaps, or a reset. Yields None after
+        `timeout` seconds without a message (for heartbeats).
+        """
+        while True:
+            if sub.lagged:
+                sub.lagged = False
+                while not sub.queue.empty():
+                    sub.queue.get_nowait()
+                missed = self.since(sub.last_id, sub.topics)
+                if missed is None:
+                    sub.last_id = self.last_id
+                    yield self._reset()
+                    continue
+                for msg in missed:
+                    sub.last_id = msg.id
+                    yield msg
+                continue
+            try:
+                msg = await asyncio.wait_for(sub.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if msg.id <= sub.last_id:
+                continue                    # already replayed
+            sub.last_id = msg.id
+            yield msg
+
+    def stats(self) -> dict:
+        return {"subscribers": len(self.subscribers), "last_id": self.last_id, "buffered": len(self.buffer),
+                "lagging": sum(1 for s in self.subscribers if s.lagged)}
+
+
+event_bus = EventBus(settings.LIVE_BUFFER_SIZE, settings.LIVE_SUBSCRIBER_QUEUE_SIZE)
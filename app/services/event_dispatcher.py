@@ -2,46 +2,85 @@
 """Routes events to correct use-case handlers — Phase 1 and Phase 2."""
 
 from app.services.event_parser import ParsedCameraEvent
-from app.services.occupancy_service import handle_occupancy_event
+from app.services.occupancy_service import handle_occupancy_event, OCCUPANCY_EVENTS
+from app.services.zone_actors import zone_actors
 from app.services.violation_service import handle_violation_event
 from app.services.intrusion_service import handle_intrusion_event
+from app.services.incident_service import correlate_event, incident_correlator
 from app.services.snapshot_service import fetch_snapshot
 from app.utils.logger import get_logger
+from app.utils.metrics import HANDLER_SECONDS
 from sqlalchemy.orm import Session
 
 logger = get_logger(__name__)
 
+_TIMERS = {name: HANDLER_SECONDS.labels(name)
+           for name in ("occupancy", "occupancy_enqueue", "violation", "intrusion", "snapshot", "anpr")}
 
-async def dispatch_event(event: ParsedCameraEvent, db: Session):
+
+def _pending(progress, handler: str) -> bool:
+    return progress is None or progress.pending(handler)
+
+
+def _done(progress, handler: str):
+    if progress is not None:
+        progress.mark(handler)
+
+
+async def dispatch_event(event: ParsedCameraEvent, db: Session, progress=None):
+    """
+    progress (event_queue.QueueProgress, queue workers only) skips handlers an
+    earlier attempt of the same queue item already ran, and records new ones.
+    """
     is_vehicle = event.detection_target in ("vehicle", None)
     is_human = event.detection_target in ("human", None)
 
     # ── PHASE 1 ───────────────────────────────────────────────────────────
-    # UC3: Occupancy — region entrance/exit (CAM-03 only)
-    if event.event_type in ("regionEntrance", "regionExiting"):
-        await handle_occupancy_event(event, db)
-
-    # UC5: Violation alerts
-    # fielddetection / regionEntrance / VMD → vehicles only
-    if event.event_type in ("fielddetection", "regionEntrance", "VMD") and is_vehicle:
-        await handle_violation_event(event, db)
-    # linedetection → vehicles OR humans (some cameras detect staff crossing lines)
-    if event.event_type == "linedetection" and (is_vehicle or is_human):
-        await handle_violation_event(event, db) 
-
-    # UC6: Intrusion detection
-    if event.event_type in ("fielddetection", "regionEntrance", "VMD") and is_vehicle:
-        await handle_intrusion_event(event, db)
-
-    # 📸 Snapshot — fetch image from camera on any detection event
+    # UC3: Occupancy — region entrance/exit (CAM-03 only), serialized per zone by its actor
+    if event.event_type in OCCUPANCY_EVENTS and _pending(progress, "occupancy"):
+        if zone_actors.enabled:
+            with _TIMERS["occupancy_enqueue"].time():      # the zone actor times the write itself
+                zone_actors.tell_event(event)
+        else:
+            with _TIMERS["occupancy"].time():
+                await handle_occupancy_event(event, db)
+        _done(progress, "occupancy")
+
+    # UC5 + UC6: alerts raised by one detection event are grouped into one incident
+    async with correlate_event(event) as scope:
+        # UC5: Violation alerts
+        # fielddetection / regionEntrance / VMD → vehicles only
+        # linedetection → vehicles OR humans (some cameras detect staff crossing lines)
+        violation = (event.event_type in ("fielddetection", "regionEntrance", "VMD") and is_vehicle) or \
+                    (event.event_type == "linedetection" and (is_vehicle or is_human))
+        if violation and _pending(progress, "violation"):
+            with _TIMERS["violation"].time():
+                await handle_violation_event(event, db)
+            _done(progress, "violation")
+
+        # UC6: Intrusion detection
+        if event.event_type in ("fielddetection", "regionEntrance", "VMD") and is_vehicle \
+                and _pending(progress, "intrusion"):
+            with _TIMERS["intrusion"].time():
+                await handle_intrusion_event(event, db)
+            _done(progress, "intrusion")
+
+    # 📸 Snapshot — fetch image from camera on any detection event, unless an
+    # incident on this zone already has (or is fetching) one
     if event.event_type in ("fielddetection", "linedetection", "regionEntrance", "VMD"):
-        await fetch_snapshot(event.camera_id, event.event_type)    
+        covered = scope.alerts or (event.region_id and incident_correlator.active(event.region_id))
+        if not covered and _pending(progress, "snapshot"):
+            with _TIMERS["snapshot"].time():
+                await fetch_snapshot(event.camera_id, event.event_type)
+            _done(progress, "snapshot")
 
     # ── PHASE 2 ───────────────────────────────────────────────────────────
     # UC1 + UC2 + UC4: ANPR gate events
-    if event.event_type == "AccessControllerEvent" and event.plate_number:
+    if event.event_type == "AccessControllerEvent" and event.plate_number and _pending(progress, "anpr"):
         try:
             from app.services.entry_exit_service import handle_anpr_event
-            await handle_anpr_event(event, db)
+            with _TIMERS["anpr"].time():
+                await handle_anpr_event(event, db)
+            _done(progress, "anpr")
         except ImportError:
             logger.warning("entry_exit_service not yet implemented (Phase 2 pending)")
@@ -0,0 +1,206 @@
+# app/services/event_queue.py
+"""
+Postgres work queue for camera events (no external broker).
+
+Producer: event_ingest.submit_raw_event — used by the webhook and the poller
+          when EVENT_INGEST_MODE=queue.
+Consumer: run_queue_worker — claims batches with
+
+    UPDATE event_queue SET attempts = attempts + 1, available_at = now + visibility
+    WHERE id IN (SELECT id FROM event_queue WHERE available_at <= now
+                 ORDER BY id LIMIT :batch FOR UPDATE SKIP LOCKED)
+    RETURNING ...
+
+so any number of workers (in-process tasks, or scripts/workers/event_queue_worker.py
+on other nodes) can pull concurrently without blocking each other.
+
+  - Success: row deleted (ack).
+  - Failure: row becomes visible again after an exponential retry delay.
+  - A worker that dies mid-batch: rows reappear after EVENT_QUEUE_VISIBILITY_SECONDS.
+    A worker still busy with a batch renews the timeout of its remaining rows
+    every half timeout, and skips rows it lost to another worker meanwhile.
+  - attempts >= EVENT_QUEUE_MAX_ATTEMPTS: row moved to event_dead_letter.
+
+Retries resume instead of starting over (QueueProgress): the camera_events row
+is written once per queue item, in the same commit that records its id on the
+queue row, and each dispatcher handler that finished is recorded and skipped on
+the next attempt. Only a crash between a handler's own commit and its record
+repeats that handler.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, delete, func, tuple_
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.event_queue import EventQueueItem, EventDeadLetter
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Retry delay after a failed attempt: base * 2^(attempts-1), capped
+_RETRY_BASE_SECONDS = 5
+_RETRY_MAX_SECONDS = 300
+
+
+def enqueue_raw_event(db: Session, raw_body: bytes, camera_ip: str, content_type: str):
+    """Insert one raw payload into the queue. Commits immediately."""
+    now = datetime.utcnow()
+    db.add(EventQueueItem(camera_ip=camera_ip, content_type=content_type, raw_body=raw_body,
+                          attempts=0, available_at=now, enqueued_at=now))
+    db.commit()
+
+
+def claim_batch(db: Session, batch_size: int, visibility_seconds: int) -> list:
+    """Claim up to batch_size visible rows; they stay hidden for visibility_seconds."""
+    now = datetime.utcnow()
+    claimable = (
+        select(EventQueueItem.id)
+        .where(EventQueueItem.available_at <= now)
+        .order_by(EventQueueItem.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        update(EventQueueItem)
+        .where(EventQueueItem.id.in_(claimable))
+        .values(attempts=EventQueueItem.attempts + 1,
+                available_at=now + timedelta(seconds=visibility_seconds))
+        .returning(EventQueueItem.id, EventQueueItem.camera_ip, EventQueueItem.content_type,
+                   EventQueueItem.raw_body, EventQueueItem.attempts, EventQueueItem.enqueued_at,
+                   EventQueueItem.camera_event_id, EventQueueItem.done_handlers)
+    ).all()
+    db.commit()
+    return sorted(rows, key=lambda r: r.id)
+
+
+def extend_visibility(db: Session, items: list, visibility_seconds: int) -> set[int]:
+    """
+    Hide claimed rows for another visibility_seconds. Returns the ids still held:
+    a row whose attempts changed since our claim was re-claimed by another worker.
+    """
+    if not items:
+        return set()
+    held = db.execute(
+        update(EventQueueItem)
+        .where(tuple_(EventQueueItem.id, EventQueueItem.attempts).in_([(i.id, i.attempts) for i in items]))
+        .values(available_at=datetime.utcnow() + timedelta(seconds=visibility_seconds))
+        .returning(EventQueueItem.id)
+    ).scalars().all()
+    db.commit()
+    return set(held)
+
+
+class QueueProgress:
+    """What earlier attempts of one queue item already did, persisted on its row."""
+
+    def __init__(self, db: Session, item):
+        self.db = db
+        self.item_id = item.id
+        self.camera_event_id = item.camera_event_id
+        self.done = set(filter(None, (item.done_handlers or "").split(",")))
+
+    @property
+    def persisted(self) -> bool:
+        return self.camera_event_id is not None
+
+    def record_persisted(self, row):
+        """Commit the pending camera_events row together with its id on the queue row."""
+        self.db.flush()
+        self.camera_event_id = row.id
+        self._update(camera_event_id=row.id)
+
+    def pending(self, handler: str) -> bool:
+        return handler not in self.done
+
+    def mark(self, handler: str):
+        self.done.add(handler)
+        self._update(done_handlers=",".join(sorted(self.done)))
+
+    def _update(self, **values):
+        self.db.execute(update(EventQueueItem).where(EventQueueItem.id == self.item_id).values(**values))
+        self.db.commit()
+
+
+def ack(db: Session, item_id: int):
+    db.execute(delete(EventQueueItem).where(EventQueueItem.id == item_id))
+    db.commit()
+
+
+def fail(db: Session, item, error: str):
+    """Schedule a retry, or dead-letter the row once it has used up its attempts."""
+    if item.attempts >= settings.EVENT_QUEUE_MAX_ATTEMPTS:
+        db.add(EventDeadLetter(queue_id=item.id, camera_ip=item.camera_ip, content_type=item.content_type,
+                               raw_body=item.raw_body, attempts=item.attempts, last_error=error,
+                               enqueued_at=item.enqueued_at, failed_at=datetime.utcnow()))
+        db.execute(delete(EventQueueItem).where(EventQueueItem.id == item.id))
+        logger.error(f"[QUEUE] Event {item.id} dead-lettered after {item.attempts} attempts: {error}")
+    else:
+        delay = min(_RETRY_BASE_SECONDS * 2 ** (item.attempts - 1), _RETRY_MAX_SECONDS)
+        db.execute(
+            update(EventQueueItem)
+            .where(EventQueueItem.id == item.id)
+            .values(available_at=datetime.utcnow() + timedelta(seconds=delay), last_error=error)
+        )
+        logger.warning(f"[QUEUE] Event {item.id} failed (attempt {item.attempts}), retry in {delay}s: {error}")
+    db.commit()
+
+
+async def process_batch(db: Session) -> int:
+    """Claim and process one batch. Returns the number of rows claimed."""
+    from app.services.event_ingest import ingest_raw_event
+
+    visibility = settings.EVENT_QUEUE_VISIBILITY_SECONDS
+    items = claim_batch(db, settings.EVENT_QUEUE_BATCH_SIZE, visibility)
+    held, renewed = {item.id for item in items}, time.monotonic()
+    for i, item in enumerate(items):
+        if time.monotonic() - renewed > visibility / 2:
+            held, renewed = extend_visibility(db, items[i:], visibility), time.monotonic()
+        if item.id not in held:
+            logger.warning(f"[QUEUE] Event {item.id} was re-claimed by another worker — skipped")
+            continue
+        try:
+            await ingest_raw_event(item.raw_body, item.camera_ip, item.content_type or "", db,
+                                   reorder=False, progress=QueueProgress(db, item))
+            ack(db, item.id)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[QUEUE] Processing error for event {item.id}: {e}", exc_info=True)
+            fail(db, item, str(e))
+    return len(items)
+
+
+async def run_queue_worker(name: str = "queue-worker"):
+    """Claim/process loop. Sleeps EVENT_QUEUE_POLL_SECONDS only when the queue is empty."""
+    logger.info(f"[QUEUE] {name} started")
+    while True:
+        db = SessionLocal()
+        try:
+            claimed = await process_batch(db)
+        except Exception as e:
+            logger.error(f"[QUEUE] {name} claim error: {e}", exc_info=True)
+            claimed = 0
+        finally:
+            db.close()
+        if not claimed:
+            await asyncio.sleep(settings.EVENT_QUEUE_POLL_SECONDS)
+
+
+def queue_stats(db: Session) -> dict:
+    now = datetime.utcnow()
+    depth, ready, oldest = db.query(
+        func.count(EventQueueItem.id),
+        func.count(EventQueueItem.id).filter(EventQueueItem.available_at <= now),
+        func.min(EventQueueItem.enqueued_at),
+    ).one()
+    dead = db.query(func.count(EventDeadLetter.id)).scalar()
+    return {
+        "depth": depth,
+        "ready": ready,
+        "in_flight_or_retrying": depth - ready,
+        "oldest_enqueued_at": oldest,
+        "dead_letter": dead,
+    }
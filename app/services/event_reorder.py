@@ -0,0 +1,194 @@
+# app/services/event_reorder.py
+"""
+Per-camera reorder stage between ingest and the event dispatcher.
+
+The webhook and the alertStream poller can deliver one camera's events out of
+order (reconnects, retries, queue replays). Occupancy in particular must apply
+regionEntrance / regionExiting in trigger_time order, otherwise the zero clamp
+swallows an exit that arrives before its entry.
+
+Each camera has a small min-heap keyed on trigger_time. An event is released
+to the dispatcher once
+  - a newer event has advanced the camera's watermark past it
+    (watermark = newest trigger_time seen − lateness), or
+  - it has waited `lateness` seconds since arrival,
+so the stage never adds more than one watermark of latency.
+Events older than something already released are "late": they are counted and
+dispatched immediately rather than dropped.
+
+Released events are dispatched by one consumer task per camera, in order,
+each with its own DB session. EVENT_REORDER_LATENESS_SECONDS = 0 (the default)
+disables the stage and dispatches inline as before.
+
+Only the inline ingest path (webhook / poller) goes through this stage. Its
+dispatch is fire-and-forget: errors are logged, not retried. Queue workers
+bypass it and dispatch inline, so a row is acked only after its handlers ran
+and failures reach the queue's retry / dead-letter path.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from datetime import timezone
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.services.event_parser import ParsedCameraEvent
+from app.services.event_dispatcher import dispatch_event
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def event_timestamp(event: ParsedCameraEvent) -> float:
+    """trigger_time as epoch seconds. Naive datetimes are UTC (parser fallback)."""
+    t = event.trigger_time
+    if t.tzinfo is None:
+        t = t.replace(tzinfo=timezone.utc)
+    return t.timestamp()
+
+
+@dataclass
+class _CameraBuffer:
+    heap: list = field(default_factory=list)          # (ts, seq, arrival, event)
+    max_seen: float = float("-inf")
+    last_released: float = float("-inf")
+    late: int = 0
+    released: int = 0
+    out: Optional[asyncio.Queue] = None
+    consumer: Optional[asyncio.Task] = None
+
+
+class ReorderBuffer:
+    def __init__(self, lateness: float):
+        self.lateness = lateness
+        self.cameras: dict[str, _CameraBuffer] = {}
+        self.late_events = 0
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.lateness > 0
+
+    # ── Intake ────────────────────────────────────────────────────────────
+    def submit(self, event: ParsedCameraEvent):
+        """Buffer one event; releases whatever became ready. Never blocks."""
+        cam = self._camera(event.camera_id)
+        ts = event_timestamp(event)
+
+        if ts < cam.last_released:
+            cam.late += 1
+            self.late_events += 1
+            logger.warning(
+                f"[REORDER] Late event from {event.camera_id}: {event.event_type} "
+                f"{cam.last_released - ts:.1f}s behind watermark — dispatching out of order"
+            )
+            cam.out.put_nowait(event)
+            return
+
+        heapq.heappush(cam.heap, (ts, next(self._seq), time.monotonic(), event))
+        cam.max_seen = max(cam.max_seen, ts)
+        self._release(cam, time.monotonic())
+        self._ensure_flusher()
+        self._wake.set()
+
+    def _camera(self, camera_id: str) -> _CameraBuffer:
+        cam = self.cameras.get(camera_id)
+        if cam is None:
+            cam = self.cameras[camera_id] = _CameraBuffer(out=asyncio.Queue())
+            cam.consumer = asyncio.create_task(self._consume(camera_id, cam.out),
+                                               name=f"reorder-{camera_id}")
+        return cam
+
+    # ── Release ───────────────────────────────────────────────────────────
+    def _release(self, cam: _CameraBuffer, now: float, force: bool = False):
+        cutoff = cam.max_seen - self.lateness
+        # Anything that has waited a full watermark forces out itself and everything before it
+        for ts, _, arrival, _ in cam.heap:
+            if force or now - arrival >= self.lateness:
+                cutoff = max(cutoff, ts)
+        while cam.heap and cam.heap[0][0] <= cutoff:
+            ts, _, _, event = heapq.heappop(cam.heap)
+            cam.last_released = max(cam.last_released, ts)
+            cam.released += 1
+            cam.out.put_nowait(event)
+
+    def _next_deadline(self) -> Optional[float]:
+        arrivals = [arrival for cam in self.cameras.values() for _, _, arrival, _ in cam.heap]
+        return min(arrivals) + self.lateness if arrivals else None
+
+    async def _flush_loop(self):
+        while True:
+            deadline = self._next_deadline()
+            self._wake.clear()
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            now = time.monotonic()
+            for cam in self.cameras.values():
+                if cam.heap:
+                    self._release(cam, now)
+
+    def _ensure_flusher(self):
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop(), name="reorder-flusher")
+
+    # ── Dispatch ──────────────────────────────────────────────────────────
+    async def _consume(self, camera_id: str, out: asyncio.Queue):
+        while True:
+            event = await out.get()
+            db = SessionLocal()
+            try:
+                await dispatch_event(event, db)
+            except Exception as e:
+                logger.error(f"[REORDER] Dispatch error for {camera_id}: {e}", exc_info=True)
+            finally:
+                db.close()
+                out.task_done()
+
+    async def flush(self):
+        """Release every buffered event and wait until all of them are dispatched."""
+        now = time.monotonic()
+        for cam in self.cameras.values():
+            self._release(cam, now, force=True)
+        await asyncio.gather(*(cam.out.join() for cam in self.cameras.values()))
+
+    async def stop(self):
+        await self.flush()
+        tasks = [cam.consumer for cam in self.cameras.values()] + ([self._flusher] if self._flusher else [])
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.cameras.clear()
+        self._flusher = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "lateness_seconds": self.lateness,
+            "late_events": self.late_events,
+            "buffered": sum(len(c.heap) for c in self.cameras.values()),
+            "cameras": {
+                cam_id: {"buffered": len(c.heap), "released": c.released, "late": c.late,
+                         "pending_dispatch": c.out.qsize()}
+                for cam_id, c in self.cameras.items()
+            },
+        }
+
+
+reorder_buffer = ReorderBuffer(lateness=settings.EVENT_REORDER_LATENESS_SECONDS)
+
+
+async def dispatch_in_order(event: ParsedCameraEvent, db: Session):
+    """Dispatch through the reorder stage when enabled, otherwise inline."""
+    if reorder_buffer.enabled:
+        reorder_buffer.submit(event)
+    else:
+        await dispatch_event(event, db)
@@ -0,0 +1,214 @@
+# app/services/export_service.py
+"""
+Bulk export of camera_events, alerts and entry_exit_log as CSV, NDJSON or Parquet.
+
+Rows are read through a server-side cursor (yield_per → a named psycopg2
+cursor) in EXPORT_CHUNK_ROWS partitions and each partition is encoded and
+handed on before the next is fetched, so memory stays flat however many rows
+match. Used by /export/{dataset} (StreamingResponse) and scripts/tools/export_data.py.
+
+  dataset      time column   type filter (event_type=)
+  events       created_at    event_type
+  alerts       triggered_at  alert_type
+  entry-exit   event_time    gate (entry | exit)
+
+Rows come out oldest first, ordered by (time, id) — the composite indexes.
+Parquet needs pyarrow, which is optional (pip install pyarrow); one row group
+is written per partition.
+"""
+
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, Optional
+from sqlalchemy import DateTime, Integer, Table, select
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.database import engine as default_engine
+from app.models.alert import Alert
+from app.models.camera_event import CameraEvent
+from app.models.entry_exit_log import EntryExitLog
+from app.services.event_bus import json_default
+from app.utils.logger import get_logger
+from app.utils.time_utils import to_naive_utc
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class Dataset:
+    table: Table
+    time_col: str
+    type_col: str
+    heavy_cols: tuple[str, ...] = ()       # left out unless include_raw
+
+
+DATASETS: dict[str, Dataset] = {
+    "events": Dataset(CameraEvent.__table__, "created_at", "event_type", ("raw_payload",)),
+    "alerts": Dataset(Alert.__table__, "triggered_at", "alert_type"),
+    "entry-exit": Dataset(EntryExitLog.__table__, "event_time", "gate"),
+}
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+@dataclass
+class ExportFilter:
+    start: Optional[datetime] = None       # inclusive
+    end: Optional[datetime] = None         # exclusive
+    camera_id: Optional[str] = None
+    event_type: Optional[str] = None
+    include_raw: bool = False
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def export_columns(dataset: Dataset, include_raw: bool = False) -> list:
+    return [c for c in dataset.table.columns if include_raw or c.name not in dataset.heavy_cols]
+
+
+def export_query(dataset: Dataset, f: ExportFilter):
+    t = dataset.table
+    ts = t.c[dataset.time_col]
+    stmt = select(*export_columns(dataset, f.include_raw))
+    if f.start:
+        stmt = stmt.where(ts >= to_naive_utc(f.start))
+    if f.end:
+        stmt = stmt.where(ts < to_naive_utc(f.end))
+    if f.camera_id:
+        stmt = stmt.where(t.c.camera_id == f.camera_id)
+    if f.event_type:
+        stmt = stmt.where(t.c[dataset.type_col] == f.event_type)
+    return stmt.order_by(ts, t.c.id)
+
+
+def iter_partitions(stmt, chunk_rows: int, engine: Engine) -> Iterator[list[tuple]]:
+    """Rows of `stmt` in lists of up to chunk_rows, from a server-side cursor."""
+    with engine.connect().execution_options(yield_per=chunk_rows) as conn:
+        result = conn.execute(stmt)
+        for part in result.partitions():
+            yield part
+
+
+# ── encoders: partitions in, bytes chunks out ──
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_csv(names: list[str], partitions: Iterator[list[tuple]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(names)
+    for part in partitions:
+        writer.writerows([_csv_value(v) for v in row] for row in part)
+        yield buf.getvalue().encode()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():                          # header only: nothing matched
+        yield buf.getvalue().encode()
+
+
+def encode_ndjson(names: list[str], partitions: Iterator[list[tuple]]) -> Iterator[bytes]:
+    for part in partitions:
+        lines = [json.dumps(dict(zip(names, row)), default=json_default) for row in part]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file for ParquetWriter; the bytes written so far are taken with drain()."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._pos
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _arrow_schema(columns: list):
+    import pyarrow as pa
+    fields = []
+    for c in columns:
+        if isinstance(c.type, DateTime):
+            arrow_type = pa.timestamp("us")
+        elif isinstance(c.type, Integer):
+            arrow_type = pa.int64()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(c.name, arrow_type))
+    return pa.schema(fields)
+
+
+def encode_parquet(columns: list, partitions: Iterator[list[tuple]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    schema = _arrow_schema(columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for part in partitions:
+            arrays = [pa.array([row[i] for row in part], type=field.type) for i, field in enumerate(schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()                      # footer
+
+
+def stream_export(dataset_name: str, fmt: str, f: ExportFilter, chunk_rows: Optional[int] = None,
+                  engine: Optional[Engine] = None) -> Iterator[bytes]:
+    """Encoded export of one dataset as a generator of byte chunks."""
+    dataset = DATASETS[dataset_name]
+    columns = export_columns(dataset, f.include_raw)
+    names = [c.name for c in columns]
+    stmt = export_query(dataset, f)
+    rows = 0
+
+    def counted(partitions):
+        nonlocal rows
+        for part in partitions:
+            rows += len(part)
+            yield part
+
+    partitions = counted(iter_partitions(stmt, chunk_rows or settings.EXPORT_CHUNK_ROWS,
+                                          engine or default_engine))
+    if fmt == "csv":
+        chunks = encode_csv(names, partitions)
+    elif fmt == "ndjson":
+        chunks = encode_ndjson(names, partitions)
+    elif fmt == "parquet":
+        chunks = encode_parquet(columns, partitions)
+    else:
+        raise ValueError(f"unknown export format: {fmt}")
+    yield from chunks
+    logger.info(f"[EXPORT] {dataset_name} as {fmt}: {rows} rows "
+                f"(start={f.start}, end={f.end}, camera={f.camera_id}, type={f.event_type})")
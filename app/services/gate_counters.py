@@ -0,0 +1,108 @@
+# app/services/gate_counters.py
+"""
+Phase 2: UC1 — today's entry/exit counters.
+Fed by entry_exit_service.handle_anpr_event; read by /entry-exit/count/today.
+
+Counts are kept in memory per local day (LOCAL_TIMEZONE) and reset when the
+local date changes. At startup they are warmed with one indexed range query
+on event_time (local midnight → now, in UTC). Other workers' gate events
+arrive via NOTIFY gate_events, so every process reports the same totals.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.entry_exit_log import EntryExitLog
+from app.services.pg_notify import notify, pg_listener
+from app.utils.logger import get_logger
+from app.utils.time_utils import local_date, local_midnight_utc
+
+logger = get_logger(__name__)
+
+GATE_CHANNEL = "gate_events"
+
+
+@dataclass
+class DailyCounts:
+    day: date
+    entries: int = 0
+    exits: int = 0
+
+
+class GateCounters:
+    def __init__(self, tz_name: str):
+        self.tz = ZoneInfo(tz_name)
+        self.counts = DailyCounts(self.today())
+        self.loaded = False
+
+    def today(self) -> date:
+        return local_date(datetime.utcnow(), self.tz)
+
+    def _rollover(self) -> DailyCounts:
+        today = self.today()
+        if self.counts.day != today:
+            logger.info(f"[UC1] Day rollover {self.counts.day} → {today} "
+                        f"(entries={self.counts.entries}, exits={self.counts.exits})")
+            self.counts = DailyCounts(today)
+        return self.counts
+
+    def load(self, db: Session):
+        counts = DailyCounts(self.today())
+        since = local_midnight_utc(counts.day, self.tz)
+        rows = (db.query(EntryExitLog.gate, func.count(EntryExitLog.id))
+                .filter(EntryExitLog.event_time >= since)
+                .group_by(EntryExitLog.gate).all())
+        for gate, n in rows:
+            if gate == "entry":
+                counts.entries = n
+            elif gate == "exit":
+                counts.exits = n
+        self.counts = counts
+        self.loaded = True
+        logger.info(f"[UC1] Gate counters loaded for {counts.day}: entries={counts.entries}, exits={counts.exits}")
+
+    def record(self, gate: str, event_time: datetime):
+        """Count one gate event (naive UTC). Events from another local day are ignored."""
+        counts = self._rollover()
+        if local_date(event_time, self.tz) != counts.day:
+            return
+        if gate == "entry":
+            counts.entries += 1
+        elif gate == "exit":
+            counts.exits += 1
+
+    def snapshot(self) -> DailyCounts:
+        counts = self._rollover()
+        return DailyCounts(counts.day, counts.entries, counts.exits)
+
+
+gate_counters = GateCounters(settings.LOCAL_TIMEZONE)
+
+
+def publish_gate_event(db: Session, gate: str, event_time: datetime):
+    """Call inside the transaction that logged the event, before commit."""
+    notify(db, GATE_CHANNEL, gate=gate, event_time=event_time.isoformat())
+
+
+def _on_gate_notify(payload: dict):
+    gate, event_time = payload.get("gate"), payload.get("event_time")
+    if gate and event_time:
+        gate_counters.record(gate, datetime.fromisoformat(event_time))
+
+
+def _on_gate_resync():
+    db = SessionLocal()
+    try:
+        gate_counters.load(db)
+    finally:
+        db.close()
+
+
+def start_gate_counters():
+    """Warm today's counters and subscribe to other workers' gate events. Called once at startup."""
+    _on_gate_resync()
+    pg_listener.subscribe(GATE_CHANNEL, _on_gate_notify, _on_gate_resync)
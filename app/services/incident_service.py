@@ -0,0 +1,223 @@
+# app/services/incident_service.py
+"""
+UC5 + UC6: Incident correlation.
+
+One fielddetection event in a zone like emergency-exit is both a violation and
+an intrusion. Instead of two independent alerts with their own cooldown
+queries, commits and snapshot, the dispatcher runs each detection event inside
+correlate_event(): handlers call raise_incident_alert(), which only collects
+the alert, and when the event is done the correlator writes them as children of
+one incident:
+
+  - a new incident (and one snapshot, fetched in the background) when the zone
+    has none open, otherwise the zone's incident if it got an alert within the
+    last INCIDENT_WINDOW_SECONDS
+  - alert types the incident already has are dropped — the incident is the
+    cooldown. Dropped alerts do not extend the window, so a condition that
+    persists alerts again (as a new incident) once per window
+  - a resolved incident is forgotten at once; the zone's next alert opens a new one
+  - incident row + child alerts in one commit (or the alert sink's batches)
+
+Cooldown checks within one event share a single alerts query per zone.
+Open incidents are tracked in memory, so, like the zone actors, this assumes one
+process owns a zone's events; another worker would open its own incident.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.alert import Alert
+from app.models.incident import Incident
+from app.services.alert_service import AlertRecord, alert_sink, announce, write_alerts
+from app.services.event_parser import ParsedCameraEvent
+from app.services.snapshot_service import fetch_snapshot
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CORRELATED_TYPES = ("violation", "intrusion")
+
+
+@dataclass
+class OpenIncident:
+    incident_id: int
+    zone_id: str
+    last_alert_at: datetime
+    alert_types: set[str] = field(default_factory=set)
+    alert_count: int = 0
+
+
+@dataclass
+class EventScope:
+    event: ParsedCameraEvent
+    alerts: list[AlertRecord] = field(default_factory=list)
+    recent_types: dict[str, set[str]] = field(default_factory=dict)    # zone → types alerted within cooldown
+
+
+_scope: ContextVar[Optional[EventScope]] = ContextVar("incident_scope", default=None)
+
+
+class IncidentCorrelator:
+    def __init__(self, window_seconds: float):
+        self.window = timedelta(seconds=window_seconds)
+        self.open: dict[str, OpenIncident] = {}
+        self.suppressed = 0
+
+    def active(self, zone_id: str, now: Optional[datetime] = None) -> Optional[OpenIncident]:
+        inc = self.open.get(zone_id)
+        now = now or datetime.utcnow()
+        if inc is None or now - inc.last_alert_at > self.window:
+            return None
+        return inc
+
+    def has_alert(self, zone_id: str, alert_type: str, since: datetime) -> bool:
+        inc = self.open.get(zone_id)
+        return inc is not None and alert_type in inc.alert_types and inc.last_alert_at >= since
+
+    def forget(self, incident_id: int):
+        """The incident was resolved: later alerts on its zone open a new incident."""
+        for zone_id in [z for z, inc in self.open.items() if inc.incident_id == incident_id]:
+            del self.open[zone_id]
+
+    def _prune(self, now: datetime):
+        for zone_id in [z for z, inc in self.open.items() if now - inc.last_alert_at > self.window]:
+            del self.open[zone_id]
+
+    async def record(self, alerts: list[AlertRecord], event_type: Optional[str] = None):
+        """Attach alerts (one event's worth, or a single timer-driven alert) to their zones' incidents."""
+        now = datetime.utcnow()
+        self._prune(now)
+        by_zone: dict[str, list[AlertRecord]] = {}
+        for a in alerts:
+            by_zone.setdefault(a.zone_id, []).append(a)
+
+        db = SessionLocal()
+        try:
+            for zone_id, group in by_zone.items():
+                await self._record_zone(db, zone_id, group, event_type, now)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[INCIDENT] Failed to record {len(alerts)} alerts: {e}", exc_info=True)
+        finally:
+            db.close()
+
+    async def _record_zone(self, db: Session, zone_id: str, group: list[AlertRecord],
+                           event_type: Optional[str], now: datetime):
+        inc = self.active(zone_id, now)
+        fresh, seen = [], set(inc.alert_types) if inc else set()
+        for a in group:
+            if a.alert_type in seen:
+                continue
+            seen.add(a.alert_type)
+            fresh.append(a)
+        self.suppressed += len(group) - len(fresh)
+        if not fresh:
+            return
+
+        types = ",".join(sorted(seen))
+        new_incident = inc is None
+        if new_incident:
+            row = Incident(camera_id=fresh[0].camera_id, zone_id=zone_id, event_type=event_type or fresh[0].event_type,
+                           alert_types=types, alert_count=len(fresh), opened_at=now, last_alert_at=now, is_resolved=0)
+            db.add(row)
+            db.flush()
+            incident_id = row.id
+        else:
+            incident_id = inc.incident_id
+            db.execute(update(Incident).where(Incident.id == incident_id)
+                       .values(alert_types=types, alert_count=Incident.alert_count + len(fresh), last_alert_at=now))
+        for a in fresh:
+            a.incident_id = incident_id
+            alert_sink.note(a)
+        if not alert_sink.running:
+            write_alerts(db, fresh)
+        db.commit()
+
+        if new_incident:
+            inc = self.open[zone_id] = OpenIncident(incident_id, zone_id, now)
+        inc.alert_types = seen
+        inc.alert_count += len(fresh)
+        inc.last_alert_at = now
+        for a in fresh:
+            if alert_sink.running:
+                if alert_sink.put(a):
+                    continue                        # written and announced by the sink
+                write_alerts(db, [a])               # sink full
+                db.commit()
+            announce(a)
+
+        logger.warning(f"[INCIDENT] #{inc.incident_id} {zone_id}: {types} ({inc.alert_count} alerts)")
+        if new_incident:
+            asyncio.create_task(self._attach_snapshot(incident_id, fresh[0].camera_id,
+                                                      event_type or fresh[0].event_type))
+
+    async def _attach_snapshot(self, incident_id: int, camera_id: str, event_type: str):
+        path = await fetch_snapshot(camera_id, event_type)
+        if path is None:
+            return
+        db = SessionLocal()
+        try:
+            db.execute(update(Incident).where(Incident.id == incident_id).values(snapshot_path=path))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[INCIDENT] Snapshot update failed for #{incident_id}: {e}")
+        finally:
+            db.close()
+
+
+incident_correlator = IncidentCorrelator(settings.INCIDENT_WINDOW_SECONDS)
+
+
+@asynccontextmanager
+async def correlate_event(event: ParsedCameraEvent):
+    """Collect the alerts raised while handling `event`; record them as one incident per zone afterwards."""
+    scope = EventScope(event)
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+        if scope.alerts:
+            await incident_correlator.record(scope.alerts, event.event_type)
+
+
+async def raise_incident_alert(db: Session, alert_type, camera_id, zone_id, event_type, description):
+    """create_alert() for correlated alert types: collected by the current event, else recorded at once."""
+    alert = AlertRecord(alert_type, camera_id, zone_id, event_type, description)
+    logger.warning(f"[ALERT][{alert_type.upper()}] {description}")
+    scope = _scope.get()
+    if scope is not None:
+        scope.alerts.append(alert)
+        if zone_id in scope.recent_types:
+            scope.recent_types[zone_id].add(alert_type)
+        return
+    await incident_correlator.record([alert], event_type)
+
+
+def recently_alerted(db: Session, alert_type: str, zone_id: str) -> bool:
+    """Cooldown check for UC5/UC6 (INTRUSION_COOLDOWN_SECONDS)."""
+    since = datetime.utcnow() - timedelta(seconds=settings.INTRUSION_COOLDOWN_SECONDS)
+    if incident_correlator.has_alert(zone_id, alert_type, since) or alert_sink.raised_since(alert_type, zone_id, since):
+        return True
+    scope = _scope.get()
+    if scope is None:
+        return db.query(Alert).filter(
+            Alert.zone_id == zone_id, Alert.alert_type == alert_type,
+            Alert.triggered_at >= since
+        ).first() is not None
+    types = scope.recent_types.get(zone_id)
+    if types is None:
+        rows = db.query(Alert.alert_type).filter(
+            Alert.zone_id == zone_id, Alert.alert_type.in_(CORRELATED_TYPES),
+            Alert.triggered_at >= since
+        ).distinct().all()
+        types = scope.recent_types[zone_id] = {r[0] for r in rows}
+    return alert_type in types
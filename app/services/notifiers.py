@@ -0,0 +1,207 @@
+# app/services/notifiers.py
+"""
+Outbound alert notifications — webhook, syslog, SMTP.
+
+Each configured notifier runs behind its own bounded queue and worker task:
+publish() never blocks and never raises, so a slow or dead endpoint can only
+fill its own queue. Failed sends are retried with exponential backoff; alerts
+that exhaust their attempts, or arrive while the queue is full, are appended
+to logs/alerts_dead_letter.jsonl together with the reason.
+"""
+
+import asyncio
+import json
+import os
+import smtplib
+import socket
+from dataclasses import asdict
+from datetime import datetime
+from email.message import EmailMessage
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+from app.utils.logger import get_logger, LOG_DIR
+
+logger = get_logger(__name__)
+
+DEAD_LETTER_PATH = os.path.join(LOG_DIR, "alerts_dead_letter.jsonl")
+_MAX_BACKOFF_SECONDS = 60.0
+
+
+def _alert_dict(alert) -> dict:
+    return {k: (v.isoformat() if isinstance(v, datetime) else v) for k, v in asdict(alert).items()}
+
+
+def dead_letter(notifier: str, alert, reason: str):
+    line = json.dumps({"notifier": notifier, "reason": reason, "failed_at": datetime.utcnow().isoformat(),
+                       "alert": _alert_dict(alert)})
+    try:
+        with open(DEAD_LETTER_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        logger.error(f"[NOTIFY] Dead-letter write failed: {e} — {line}")
+
+
+class Notifier:
+    name = "notifier"
+
+    async def send(self, alert):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class WebhookNotifier(Notifier):
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.client = httpx.AsyncClient(timeout=timeout)
+
+    async def send(self, alert):
+        resp = await self.client.post(self.url, json=_alert_dict(alert))
+        resp.raise_for_status()
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class SyslogNotifier(Notifier):
+    """RFC 5424 over UDP. Severity warning (4), facility local0 (16)."""
+    name = "syslog"
+
+    def __init__(self, host: str, port: int = 514):
+        self.addr = (host, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+
+    async def send(self, alert):
+        pri = 16 * 8 + 4
+        ts = alert.triggered_at.isoformat() + "Z"
+        msg = (f"<{pri}>1 {ts} {socket.gethostname()} damanat-pms - {alert.alert_type} - "
+               f"[{alert.camera_id}/{alert.zone_id}] {alert.description}")
+        self.sock.sendto(msg.encode("utf-8"), self.addr)
+
+    async def close(self):
+        self.sock.close()
+
+
+class SmtpNotifier(Notifier):
+    name = "smtp"
+
+    def __init__(self, host: str, port: int, sender: str, recipients: list[str], timeout: float = 10.0):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.sender, self.recipients = sender, recipients
+
+    def _send_sync(self, alert):
+        msg = EmailMessage()
+        msg["Subject"] = f"[Damanat] {alert.alert_type}: {alert.zone_id or alert.camera_id}"
+        msg["From"] = self.sender
+        msg["To"] = ", ".join(self.recipients)
+        msg.set_content(json.dumps(_alert_dict(alert), indent=2))
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            smtp.send_message(msg)
+
+    async def send(self, alert):
+        await asyncio.to_thread(self._send_sync, alert)
+
+
+class NotifierWorker:
+    def __init__(self, notifier: Notifier, queue_size: int, max_attempts: int, backoff_seconds: float):
+        self.notifier = notifier
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.sent = 0
+        self.failed = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def publish(self, alert):
+        try:
+            self.queue.put_nowait(alert)
+        except asyncio.QueueFull:
+            self.failed += 1
+            dead_letter(self.notifier.name, alert, "queue full")
+
+    async def _deliver(self, alert):
+        delay = self.backoff_seconds
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await self.notifier.send(alert)
+                self.sent += 1
+                return
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    self.failed += 1
+                    logger.error(f"[NOTIFY] {self.notifier.name} gave up after {attempt} attempts: {e}")
+                    dead_letter(self.notifier.name, alert, str(e))
+                    return
+                logger.warning(f"[NOTIFY] {self.notifier.name} attempt {attempt} failed: {e} — retry in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _MAX_BACKOFF_SECONDS)
+
+    async def _run(self):
+        while True:
+            alert = await self.queue.get()
+            try:
+                await self._deliver(alert)
+            finally:
+                self.queue.task_done()
+
+    def start(self):
+        self._task = asyncio.create_task(self._run(), name=f"notifier-{self.notifier.name}")
+
+    async def stop(self, drain_timeout: float = 5.0):
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self.queue.join(), drain_timeout)
+        except asyncio.TimeoutError:
+            while not self.queue.empty():
+                dead_letter(self.notifier.name, self.queue.get_nowait(), "shutdown")
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self.notifier.close()
+
+    def stats(self) -> dict:
+        return {"queued": self.queue.qsize(), "sent": self.sent, "failed": self.failed}
+
+
+class NotificationFanout:
+    def __init__(self):
+        self.workers: list[NotifierWorker] = []
+
+    def add(self, notifier: Notifier):
+        self.workers.append(NotifierWorker(notifier, settings.NOTIFIER_QUEUE_SIZE,
+                                           settings.NOTIFIER_MAX_ATTEMPTS, settings.NOTIFIER_BACKOFF_SECONDS))
+
+    def publish(self, alert):
+        for w in self.workers:
+            w.publish(alert)
+
+    def start(self):
+        if settings.ALERT_WEBHOOK_URL:
+            self.add(WebhookNotifier(settings.ALERT_WEBHOOK_URL))
+        if settings.ALERT_SYSLOG_HOST:
+            self.add(SyslogNotifier(settings.ALERT_SYSLOG_HOST, settings.ALERT_SYSLOG_PORT))
+        if settings.ALERT_SMTP_HOST and settings.ALERT_SMTP_TO:
+            self.add(SmtpNotifier(settings.ALERT_SMTP_HOST, settings.ALERT_SMTP_PORT, settings.ALERT_SMTP_FROM,
+                                  [r.strip() for r in settings.ALERT_SMTP_TO.split(",") if r.strip()]))
+        for w in self.workers:
+            w.start()
+        if self.workers:
+            logger.info(f"[NOTIFY] Alert notifiers: {[w.notifier.name for w in self.workers]}")
+
+    async def stop(self):
+        await asyncio.gather(*(w.stop() for w in self.workers))
+        self.workers.clear()
+
+    def stats(self) -> dict:
+        return {w.notifier.name: w.stats() for w in self.workers}
+
+
+notification_fanout = NotificationFanout()
@@ -4,36 +4,128 @@ UC3: Parking Occupancy Monitoring
 Camera: CAM-03 (DS-2CD3783G2 AcuSense) only
 Events: regionEntrance (+1), regionExiting (-1)
 Camera config: Draw parking row zones on CAM-03 web UI with regionID labels
+
+The dispatcher normally routes these events to the zone's actor (zone_actors.py),
+which keeps the count in memory and batches writes. handle_occupancy_event is the
+direct per-event path used when ZONE_ACTORS_ENABLED is off.
+
+Alerting is a two-state machine per zone with hysteresis: an occupancy_full
+alert is raised when the zone reaches OCCUPANCY_ALERT_THRESHOLD and resolved
+when it drops below OCCUPANCY_CLEAR_THRESHOLD. Nothing is written in between,
+however many cars shuffle in and out of a full zone. A raise still queued in
+the alert sink counts as open, and is written before a clear resolves it.
 """
 
 from datetime import datetime
+from typing import Optional
 from sqlalchemy.orm import Session
+from app.models.alert import Alert
 from app.models.zone_occupancy import ZoneOccupancy
 from app.services.event_parser import ParsedCameraEvent
-from app.services.alert_service import create_alert
+from app.services.alert_service import alert_sink, announce_resolved, create_alert
+from app.services.event_bus import event_bus
 from app.config import settings
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+OCCUPANCY_EVENTS = {"regionEntrance", "regionExiting"}
+DEFAULT_MAX_CAPACITY = 10
+OCCUPANCY_ALERT = "occupancy_full"
+
+# Alert state transitions
+RAISE = "raise"
+CLEAR = "clear"
+
+
+def occupancy_zone_id(event: ParsedCameraEvent) -> str:
+    return event.region_id or f"{event.camera_id}-default"
+
+
+def apply_occupancy_event(current_count: int, event_type: str) -> int:
+    """New zone count after one entrance/exit event. Never below zero."""
+    if event_type == "regionEntrance":
+        return max(0, current_count + 1)
+    if event_type == "regionExiting":
+        return max(0, current_count - 1)
+    return current_count
+
+
+def is_over_threshold(current_count: int, max_capacity: int) -> bool:
+    return bool(max_capacity) and (current_count / max_capacity) >= settings.OCCUPANCY_ALERT_THRESHOLD
+
+
+def is_below_clear(current_count: int, max_capacity: int) -> bool:
+    return not max_capacity or (current_count / max_capacity) < settings.OCCUPANCY_CLEAR_THRESHOLD
+
+
+def alert_transition(alert_active: bool, current_count: int, max_capacity: int) -> Optional[str]:
+    """RAISE, CLEAR or None for a zone whose alert is (not) currently open."""
+    if not alert_active and is_over_threshold(current_count, max_capacity):
+        return RAISE
+    if alert_active and is_below_clear(current_count, max_capacity):
+        return CLEAR
+    return None
+
+
+def occupancy_alert_text(zone_id: str, current_count: int, max_capacity: int) -> str:
+    return f"Zone {zone_id} at {int(current_count / max_capacity * 100)}% capacity"
+
+
+def publish_occupancy(zone_id: str, current_count: int, max_capacity: int, last_updated: Optional[datetime]):
+    """Push a committed zone count to the live feed."""
+    event_bus.publish("occupancy", zone_id=zone_id, current_count=current_count, max_capacity=max_capacity,
+                      occupancy_percent=round(current_count / max_capacity * 100, 1) if max_capacity else 0,
+                      is_full=current_count >= max_capacity, last_updated=last_updated)
+
+
+def has_open_occupancy_alert(db: Session, zone_id: str) -> bool:
+    """Open in the alerts table, or raised and still queued in the alert sink."""
+    if alert_sink.pending(OCCUPANCY_ALERT, zone_id):
+        return True
+    return db.query(Alert).filter(
+        Alert.alert_type == OCCUPANCY_ALERT, Alert.zone_id == zone_id, Alert.is_resolved == 0,
+    ).first() is not None
+
+
+async def wait_occupancy_alert_written(zone_id: str):
+    """Call before resolve_occupancy_alert: a raise still in the alert sink would be missed."""
+    if alert_sink.pending(OCCUPANCY_ALERT, zone_id):
+        await alert_sink.wait_written(OCCUPANCY_ALERT, zone_id)
+
+
+def resolve_occupancy_alert(db: Session, zone_id: str) -> int:
+    """Mark the zone's open occupancy alert resolved. Caller commits."""
+    return db.query(Alert).filter(
+        Alert.alert_type == OCCUPANCY_ALERT, Alert.zone_id == zone_id, Alert.is_resolved == 0,
+    ).update({Alert.is_resolved: 1, Alert.resolved_at: datetime.utcnow()}, synchronize_session=False)
+
 
 async def handle_occupancy_event(event: ParsedCameraEvent, db: Session):
-    zone_id = event.region_id or f"{event.camera_id}-default"
+    zone_id = occupancy_zone_id(event)
     zone = db.query(ZoneOccupancy).filter(ZoneOccupancy.zone_id == zone_id).first()
     if not zone:
         zone = ZoneOccupancy(zone_id=zone_id, camera_id=event.camera_id,
-                             current_count=0, max_capacity=10, last_updated=datetime.utcnow())
+                             current_count=0, max_capacity=DEFAULT_MAX_CAPACITY, last_updated=datetime.utcnow())
         db.add(zone)
 
-    if event.event_type == "regionEntrance":
-        zone.current_count = max(0, zone.current_count + 1)
-    elif event.event_type == "regionExiting":
-        zone.current_count = max(0, zone.current_count - 1)
-
+    zone.current_count = apply_occupancy_event(zone.current_count, event.event_type)
     zone.last_updated = datetime.utcnow()
+
+    # Inside the hysteresis band no transition is possible — skip the alert lookup
+    transition = None
+    if is_over_threshold(zone.current_count, zone.max_capacity) or is_below_clear(zone.current_count, zone.max_capacity):
+        transition = alert_transition(has_open_occupancy_alert(db, zone_id), zone.current_count, zone.max_capacity)
+    resolved = 0
+    if transition == CLEAR:
+        await wait_occupancy_alert_written(zone_id)
+        resolved = resolve_occupancy_alert(db, zone_id)
+        logger.info(f"[UC3] {zone_id}: back to {zone.current_count}/{zone.max_capacity} — occupancy alert resolved")
     db.commit()
     logger.info(f"[UC3] {zone_id}: {zone.current_count}/{zone.max_capacity}")
+    publish_occupancy(zone_id, zone.current_count, zone.max_capacity, zone.last_updated)
+    announce_resolved(OCCUPANCY_ALERT, resolved, zone_id)
 
-    if zone.max_capacity and (zone.current_count / zone.max_capacity) >= settings.OCCUPANCY_ALERT_THRESHOLD:
-        await create_alert(db, "occupancy_full", event.camera_id, zone_id, event.event_type,
-                           f"Zone {zone_id} at {int(zone.current_count/zone.max_capacity*100)}% capacity")
+    if transition == RAISE:
+        await create_alert(db, OCCUPANCY_ALERT, event.camera_id, zone_id, event.event_type,
+                           occupancy_alert_text(zone_id, zone.current_count, zone.max_capacity))
@@ -0,0 +1,116 @@
+# app/services/overstay_service.py
+"""
+Phase 2: UC2 — overstay alerts.
+Source: open parking sessions (parking_session_service.open_sessions)
+
+Every open session whose vehicle type has an allowance in
+OVERSTAY_ALLOWANCE_HOURS gets a deadline (entry_time + allowance) in a
+hierarchical timer wheel: armed when the session opens, cancelled when it
+closes, rebuilt whenever the open-session index reloads. A background task
+advances the wheel every OVERSTAY_TICK_SECONDS — nothing is polled from the DB.
+
+Every worker mirrors the open sessions and so arms the same timers; the
+worker whose UPDATE sets parking_sessions.overstay_alerted_at first raises
+the alert, the others find it already set.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import update
+from app.config import settings
+from app.database import SessionLocal
+from app.models.parking_session import ParkingSession
+from app.services.alert_service import create_alert
+from app.services.parking_session_service import OpenSession, open_sessions
+from app.utils.logger import get_logger
+from app.utils.timer_wheel import TimerWheel
+
+logger = get_logger(__name__)
+
+
+def _epoch(utc_naive: datetime) -> float:
+    return utc_naive.replace(tzinfo=timezone.utc).timestamp()
+
+
+class OverstayMonitor:
+    def __init__(self, allowances: dict, tick_seconds: float):
+        self.allowances = allowances
+        self.wheel = TimerWheel(tick_seconds, start=time.time())
+        self._task: Optional[asyncio.Task] = None
+
+    def allowance(self, vehicle_type: Optional[str]) -> Optional[timedelta]:
+        hours = self.allowances.get(vehicle_type or "unknown")
+        return timedelta(hours=hours) if hours else None
+
+    # ── open_sessions listener ──
+    def on_open(self, session: OpenSession):
+        allowance = self.allowance(session.vehicle_type)
+        if allowance:
+            self.wheel.schedule(session.plate_number, _epoch(session.entry_time + allowance), session)
+
+    def on_close(self, plate: str):
+        self.wheel.cancel(plate)
+
+    def on_reload(self, sessions: list[OpenSession]):
+        self.wheel.clear()
+        for s in sessions:
+            self.on_open(s)
+        logger.info(f"[UC2] Overstay timers armed: {len(self.wheel)}")
+
+    # ── firing ──
+    async def _fire(self, session: OpenSession):
+        db = SessionLocal()
+        try:
+            claimed = db.execute(
+                update(ParkingSession)
+                .where(ParkingSession.id == session.session_id, ParkingSession.status == "open",
+                       ParkingSession.overstay_alerted_at.is_(None))
+                .values(overstay_alerted_at=datetime.utcnow())
+                .returning(ParkingSession.id)
+            ).first()
+            if claimed is None:
+                db.rollback()       # closed meanwhile, or another worker already alerted
+                return
+            db.commit()             # the claim stands even if the alert is only queued
+            parked = datetime.utcnow() - session.entry_time
+            allowance = self.allowance(session.vehicle_type)
+            await create_alert(
+                db=db,
+                alert_type="overstay",
+                camera_id=session.camera_id or "CAM-ENTRY",
+                zone_id="parking",
+                event_type="AccessControllerEvent",
+                description=(f"Vehicle {session.plate_number} ({session.vehicle_type or 'unknown'}) parked "
+                             f"{parked.total_seconds() / 3600:.1f}h — allowance {allowance.total_seconds() / 3600:g}h"),
+            )
+        except Exception as e:
+            db.rollback()
+            logger.error(f"[UC2] Overstay alert failed for {session.plate_number}: {e}", exc_info=True)
+        finally:
+            db.close()
+
+    async def tick(self, now: Optional[float] = None):
+        for _, session in self.wheel.advance(now if now is not None else time.time()):
+            await self._fire(session)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.wheel.tick_seconds)
+            await self.tick()
+
+    def start(self):
+        """Arm timers for the already-loaded open sessions and follow changes. Called once at startup."""
+        open_sessions.add_listener(self)
+        self.on_reload(list(open_sessions.by_plate.values()))
+        self._task = asyncio.create_task(self._run(), name="overstay-monitor")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+overstay_monitor = OverstayMonitor(settings.OVERSTAY_ALLOWANCE_HOURS, settings.OVERSTAY_TICK_SECONDS)
@@ -0,0 +1,159 @@
+# app/services/parking_rollups.py
+"""
+Phase 2: UC1 + UC2 — incremental parking statistics.
+
+Every logged gate event bumps its (local date, hour, gate) row in
+parking_rollups with one INSERT ... ON CONFLICT DO UPDATE, inside the same
+transaction as the entry_exit_log row, so the rollups never drift from the
+log. backfill_rollups() rebuilds a date range from history with a single
+INSERT ... SELECT. The two are serialized by a transaction-scoped advisory
+lock — shared for gate events, exclusive for a backfill — so a backfill
+never counts an event twice or overwrites a concurrent increment.
+
+Stats for a date range sum at most 24 × 2 rows per day instead of scanning
+entry_exit_log: the read grows with the number of days, not with traffic.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional
+from zoneinfo import ZoneInfo
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.parking_rollup import ParkingRollup
+from app.utils.logger import get_logger
+from app.utils.time_utils import to_local, local_midnight_utc
+
+logger = get_logger(__name__)
+
+_TZ = ZoneInfo(settings.LOCAL_TIMEZONE)
+
+# Advisory lock (two-key form) serializing backfills against gate-event increments
+ROLLUP_LOCK_NS = 0x44504D03
+
+
+def record_rollup(db: Session, gate: str, event_time: datetime, duration: Optional[int] = None):
+    """Add one gate event (naive UTC) to its hourly bucket. Call before the event's commit."""
+    local = to_local(event_time, _TZ)
+    has_duration = duration is not None
+    db.execute(text("SELECT pg_advisory_xact_lock_shared(:ns, 0)"), {"ns": ROLLUP_LOCK_NS})
+    stmt = insert(ParkingRollup).values(
+        bucket_date=local.date(), bucket_hour=local.hour, gate=gate,
+        event_count=1, duration_sum=duration or 0, duration_count=int(has_duration),
+        updated_at=datetime.utcnow(),
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[ParkingRollup.bucket_date, ParkingRollup.bucket_hour, ParkingRollup.gate],
+        set_={
+            "event_count": ParkingRollup.event_count + 1,
+            "duration_sum": ParkingRollup.duration_sum + stmt.excluded.duration_sum,
+            "duration_count": ParkingRollup.duration_count + stmt.excluded.duration_count,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    ))
+
+
+_BACKFILL_SQL = text("""
+    INSERT INTO parking_rollups (bucket_date, bucket_hour, gate, event_count, duration_sum, duration_count, updated_at)
+    SELECT (local_time)::date, EXTRACT(HOUR FROM local_time)::int, gate,
+           COUNT(*), COALESCE(SUM(parking_duration), 0), COUNT(parking_duration), now() AT TIME ZONE 'UTC'
+    FROM (
+        SELECT timezone(:tz, timezone('UTC', event_time)) AS local_time, gate, parking_duration
+        FROM entry_exit_log
+        WHERE event_time >= :since AND event_time < :until
+    ) e
+    GROUP BY 1, 2, 3
+    ON CONFLICT (bucket_date, bucket_hour, gate) DO UPDATE SET
+        event_count = EXCLUDED.event_count, duration_sum = EXCLUDED.duration_sum,
+        duration_count = EXCLUDED.duration_count, updated_at = EXCLUDED.updated_at
+""")
+
+
+def backfill_rollups(db: Session, start: date, end: date) -> int:
+    """Rebuild rollups for local dates start..end (inclusive) from entry_exit_log. Returns rows written."""
+    # Waits for gate transactions in flight (their log rows are then visible to the
+    # INSERT ... SELECT); new gate events wait until this backfill commits
+    db.execute(text("SELECT pg_advisory_xact_lock(:ns, 0)"), {"ns": ROLLUP_LOCK_NS})
+    db.query(ParkingRollup).filter(
+        ParkingRollup.bucket_date >= start, ParkingRollup.bucket_date <= end,
+    ).delete(synchronize_session=False)
+    until = local_midnight_utc(date.fromordinal(end.toordinal() + 1), _TZ)
+    result = db.execute(_BACKFILL_SQL, {"tz": settings.LOCAL_TIMEZONE,
+                                        "since": local_midnight_utc(start, _TZ), "until": until})
+    db.commit()
+    logger.info(f"[UC2] Rollups backfilled {start} → {end}: {result.rowcount} buckets")
+    return result.rowcount
+
+
+@dataclass
+class RollupTotals:
+    entries: int = 0
+    exits: int = 0
+    duration_sum: int = 0
+    duration_count: int = 0
+
+    @property
+    def avg_duration_seconds(self) -> float:
+        return self.duration_sum / self.duration_count if self.duration_count else 0.0
+
+    def add(self, other: "RollupTotals"):
+        self.entries += other.entries
+        self.exits += other.exits
+        self.duration_sum += other.duration_sum
+        self.duration_count += other.duration_count
+
+
+def _accumulate(totals: RollupTotals, gate: str, count: int, dur_sum: int, dur_count: int):
+    if gate == "entry":
+        totals.entries += count
+    elif gate == "exit":
+        totals.exits += count
+        totals.duration_sum += dur_sum
+        totals.duration_count += dur_count
+
+
+def daily_totals(db: Session, start: date, end: date) -> dict[date, RollupTotals]:
+    """Per-day totals for start..end (inclusive); days with no traffic are omitted."""
+    rows = (db.query(ParkingRollup.bucket_date, ParkingRollup.gate,
+                     func.sum(ParkingRollup.event_count), func.sum(ParkingRollup.duration_sum),
+                     func.sum(ParkingRollup.duration_count))
+            .filter(ParkingRollup.bucket_date >= start, ParkingRollup.bucket_date <= end)
+            .group_by(ParkingRollup.bucket_date, ParkingRollup.gate).all())
+    days: dict[date, RollupTotals] = {}
+    for day, gate, count, dur_sum, dur_count in rows:
+        _accumulate(days.setdefault(day, RollupTotals()), gate, int(count or 0), int(dur_sum or 0), int(dur_count or 0))
+    return dict(sorted(days.items()))
+
+
+def hourly_totals(db: Session, day: date) -> dict[int, RollupTotals]:
+    rows = (db.query(ParkingRollup.bucket_hour, ParkingRollup.gate, ParkingRollup.event_count,
+                     ParkingRollup.duration_sum, ParkingRollup.duration_count)
+            .filter(ParkingRollup.bucket_date == day).all())
+    hours: dict[int, RollupTotals] = {}
+    for hour, gate, count, dur_sum, dur_count in rows:
+        _accumulate(hours.setdefault(hour, RollupTotals()), gate, count, dur_sum, dur_count)
+    return dict(sorted(hours.items()))
+
+
+def range_totals(db: Session, start: date, end: date) -> RollupTotals:
+    totals = RollupTotals()
+    for day in daily_totals(db, start, end).values():
+        totals.add(day)
+    return totals
+
+
+def all_time_totals(db: Session) -> RollupTotals:
+    """Totals over every stored day: one sum per gate over the rollup rows."""
+    rows = (db.query(ParkingRollup.gate, func.sum(ParkingRollup.event_count), func.sum(ParkingRollup.duration_sum),
+                     func.sum(ParkingRollup.duration_count))
+            .group_by(ParkingRollup.gate).all())
+    totals = RollupTotals()
+    for gate, count, dur_sum, dur_count in rows:
+        _accumulate(totals, gate, int(count or 0), int(dur_sum or 0), int(dur_count or 0))
+    return totals
+
+
+def local_today() -> date:
+    return to_local(datetime.utcnow(), _TZ).date()
@@ -0,0 +1,246 @@
+# app/services/parking_session_service.py
+"""
+Phase 2: UC1 + UC2 — open parking sessions.
+Camera: CAM-ENTRY / CAM-EXIT (via entry_exit_service.handle_anpr_event)
+Event: AccessControllerEvent
+
+  - ENTRY opens a session (parking_sessions row + in-memory entry)
+  - EXIT closes the plate's open session with one UPDATE ... RETURNING on the
+    partial unique index — no scan of entry_exit_log
+  - The sweeper expires sessions whose exit never arrived
+
+The table is the source of truth, so any worker can close a session opened by
+another. The in-memory index (plate → OpenSession) mirrors the open rows for
+this process and is kept in sync across workers with NOTIFY parking_sessions.
+open_session / close_session only write inside the caller's transaction; the
+caller applies the change to the local index after its commit
+(apply_session_opened / apply_session_closed), so a failed commit leaves
+memory and the table in agreement.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.entry_exit_log import EntryExitLog
+from app.models.parking_session import ParkingSession
+from app.services.pg_notify import notify, pg_listener
+from app.utils.plate_matching import PlateIndex
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SESSIONS_CHANNEL = "parking_sessions"
+
+
+@dataclass
+class OpenSession:
+    session_id: int
+    plate_number: str
+    entry_log_id: int
+    entry_time: datetime
+    vehicle_id: Optional[int] = None
+    vehicle_type: Optional[str] = None
+    camera_id: Optional[str] = None
+
+    def to_payload(self) -> dict:
+        return {**self.__dict__, "entry_time": self.entry_time.isoformat()}
+
+    @classmethod
+    def from_payload(cls, data: dict) -> "OpenSession":
+        fields = {k: data.get(k) for k in cls.__dataclass_fields__}
+        fields["entry_time"] = datetime.fromisoformat(data["entry_time"])
+        return cls(**fields)
+
+
+class OpenSessionIndex:
+    """
+    plate → OpenSession for every open session, plus a fuzzy index over their plates.
+    Listeners (e.g. overstay_service) get on_open(session), on_close(plate) and
+    on_reload(sessions) for every change, local or from another worker.
+    """
+
+    def __init__(self):
+        self.by_plate: dict[str, OpenSession] = {}
+        self.fuzzy = PlateIndex(max_distance=settings.PLATE_FUZZY_MAX_DISTANCE)
+        self.loaded = False
+        self._listeners: list = []
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def load(self, db: Session):
+        rows = db.query(ParkingSession).filter(ParkingSession.status == "open").all()
+        self.by_plate = {
+            r.plate_number: OpenSession(r.id, r.plate_number, r.entry_log_id, r.entry_time,
+                                        r.vehicle_id, r.vehicle_type, r.camera_id)
+            for r in rows
+        }
+        self.fuzzy.rebuild(self.by_plate)
+        self.loaded = True
+        logger.info(f"[UC2] Open parking sessions loaded: {len(self.by_plate)}")
+        for listener in self._listeners:
+            listener.on_reload(list(self.by_plate.values()))
+
+    def add(self, session: OpenSession):
+        self.by_plate[session.plate_number] = session
+        self.fuzzy.add(session.plate_number)
+        for listener in self._listeners:
+            listener.on_open(session)
+
+    def remove(self, plate: str) -> Optional[OpenSession]:
+        self.fuzzy.remove(plate)
+        session = self.by_plate.pop(plate, None)
+        if session is not None:
+            for listener in self._listeners:
+                listener.on_close(plate)
+        return session
+
+    def fuzzy_match(self, plate: str) -> Optional[str]:
+        """Plate of the unique open session closest to an OCR read, if any."""
+        if not self.loaded or settings.PLATE_FUZZY_MAX_DISTANCE <= 0:
+            return None
+        return self.fuzzy.best_match(plate, settings.PLATE_FUZZY_MAX_DISTANCE)
+
+    def get(self, plate: str) -> Optional[OpenSession]:
+        return self.by_plate.get(plate)
+
+    def __len__(self):
+        return len(self.by_plate)
+
+
+open_sessions = OpenSessionIndex()
+
+
+def _insert_open_session(db: Session, entry: EntryExitLog) -> int:
+    db.execute(
+        update(ParkingSession)
+        .where(ParkingSession.plate_number == entry.plate_number, ParkingSession.status == "open")
+        .values(status="expired", closed_at=datetime.utcnow())
+    )
+    return db.execute(
+        insert(ParkingSession)
+        .values(plate_number=entry.plate_number, vehicle_id=entry.vehicle_id, vehicle_type=entry.vehicle_type,
+                camera_id=entry.camera_id, entry_log_id=entry.id, entry_time=entry.event_time, status="open")
+        .returning(ParkingSession.id)
+    ).scalar_one()
+
+
+def open_session(db: Session, entry: EntryExitLog) -> OpenSession:
+    """
+    Open a session for a flushed ENTRY log row. A still-open session for the plate is expired.
+    Call apply_session_opened() with the result after the commit.
+    """
+    try:
+        with db.begin_nested():
+            session_id = _insert_open_session(db, entry)
+    except IntegrityError:
+        # A concurrent ENTRY for the same plate committed its open session first —
+        # it is visible to a new statement now, so expire it as well and retry once
+        logger.warning(f"[UC2] Concurrent entry for {entry.plate_number} — expiring its session and retrying")
+        session_id = _insert_open_session(db, entry)
+
+    session = OpenSession(session_id, entry.plate_number, entry.id, entry.event_time,
+                          entry.vehicle_id, entry.vehicle_type, entry.camera_id)
+    notify(db, SESSIONS_CHANNEL, op="open", session=session.to_payload())
+    return session
+
+
+def apply_session_opened(session: OpenSession):
+    """After the commit of open_session(): update this process's index."""
+    open_sessions.add(session)
+
+
+def apply_session_closed(plate: str):
+    """After the commit of close_session() / an expiry: update this process's index."""
+    open_sessions.remove(plate)
+
+
+def close_session(db: Session, exit_log: EntryExitLog, plate: Optional[str] = None) -> Optional[OpenSession]:
+    """
+    Close the open session for `plate` (default: the exit's plate) against a flushed
+    EXIT log row. Sets the cross-references on both log rows. Returns None if no session was open.
+    Call apply_session_closed() with the plate after the commit.
+    """
+    plate = plate or exit_log.plate_number
+    now = datetime.utcnow()
+    row = db.execute(
+        update(ParkingSession)
+        .where(ParkingSession.plate_number == plate, ParkingSession.status == "open")
+        .values(status="closed", exit_log_id=exit_log.id, closed_at=now)
+        .returning(ParkingSession.id, ParkingSession.entry_log_id, ParkingSession.entry_time,
+                   ParkingSession.vehicle_id, ParkingSession.vehicle_type, ParkingSession.camera_id)
+    ).first()
+    if row is None:
+        return None
+
+    session = OpenSession(row.id, plate, row.entry_log_id, row.entry_time,
+                          row.vehicle_id, row.vehicle_type, row.camera_id)
+    duration = int((exit_log.event_time - session.entry_time).total_seconds())
+    exit_log.matched_entry_id = session.entry_log_id
+    exit_log.parking_duration = duration
+    db.execute(update(ParkingSession).where(ParkingSession.id == session.session_id)
+               .values(parking_duration=duration))
+    db.execute(update(EntryExitLog).where(EntryExitLog.id == session.entry_log_id)
+               .values(matched_entry_id=exit_log.id))
+    notify(db, SESSIONS_CHANNEL, op="close", plate=plate)
+    return session
+
+
+def expire_stale_sessions(db: Session, max_age: timedelta) -> int:
+    """Expire open sessions older than max_age (exit never seen). Returns how many."""
+    now = datetime.utcnow()
+    plates = db.execute(
+        update(ParkingSession)
+        .where(ParkingSession.status == "open", ParkingSession.entry_time < now - max_age)
+        .values(status="expired", closed_at=now)
+        .returning(ParkingSession.plate_number)
+    ).scalars().all()
+    for plate in plates:
+        notify(db, SESSIONS_CHANNEL, op="close", plate=plate)
+    db.commit()
+    for plate in plates:
+        apply_session_closed(plate)
+    if plates:
+        logger.warning(f"[UC2] Expired {len(plates)} stale parking sessions (no exit within {max_age})")
+    return len(plates)
+
+
+async def run_session_sweeper():
+    """Periodically expire stale sessions. Started once at backend startup."""
+    max_age = timedelta(hours=settings.PARKING_SESSION_MAX_HOURS)
+    while True:
+        await asyncio.sleep(settings.PARKING_SESSION_SWEEP_SECONDS)
+        db = SessionLocal()
+        try:
+            expire_stale_sessions(db, max_age)
+        except Exception as e:
+            logger.error(f"[UC2] Session sweep failed: {e}", exc_info=True)
+        finally:
+            db.close()
+
+
+def _on_sessions_notify(payload: dict):
+    if payload.get("op") == "open":
+        open_sessions.add(OpenSession.from_payload(payload["session"]))
+    elif payload.get("op") == "close":
+        open_sessions.remove(payload.get("plate"))
+
+
+def _on_sessions_resync():
+    db = SessionLocal()
+    try:
+        open_sessions.load(db)
+    finally:
+        db.close()
+
+
+def start_open_sessions():
+    """Load open sessions and subscribe to changes from other workers. Called once at startup."""
+    _on_sessions_resync()
+    pg_listener.subscribe(SESSIONS_CHANNEL, _on_sessions_notify, _on_sessions_resync)
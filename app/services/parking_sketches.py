@@ -0,0 +1,169 @@
+# app/services/parking_sketches.py
+"""
+Phase 2: UC1 + UC2 — parking duration percentiles and unique plates.
+
+handle_anpr_event records each gate event into this process's in-memory delta
+sketches for the event's local day (t-digest of durations, HyperLogLog of
+plates). A background task flushes the deltas every SKETCH_FLUSH_SECONDS: the
+day's stored sketch is locked, merged with the delta and written back, so any
+number of workers can flush into the same rows.
+
+Queries merge the stored per-day sketches (plus unflushed local deltas) for
+any date range — no scan of entry_exit_log.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.entry_exit_log import EntryExitLog
+from app.models.parking_sketch import ParkingSketch
+from app.utils.logger import get_logger
+from app.utils.sketches import TDigest, HyperLogLog
+from app.utils.time_utils import local_date, local_midnight_utc
+
+logger = get_logger(__name__)
+
+_TZ = ZoneInfo(settings.LOCAL_TIMEZONE)
+
+DURATION = "duration"
+PLATES = "plates"
+
+
+def _new_digest() -> TDigest:
+    return TDigest(settings.TDIGEST_COMPRESSION)
+
+
+def _new_hll() -> HyperLogLog:
+    return HyperLogLog(settings.HLL_PRECISION)
+
+
+@dataclass
+class DaySketches:
+    durations: TDigest = field(default_factory=_new_digest)
+    plates: HyperLogLog = field(default_factory=_new_hll)
+
+    def merge(self, other: "DaySketches"):
+        self.durations.merge(other.durations)
+        self.plates.merge(other.plates)
+
+
+def _deserialize(kind: str, data: bytes):
+    return TDigest.from_bytes(data) if kind == DURATION else HyperLogLog.from_bytes(data)
+
+
+class SketchStore:
+    def __init__(self):
+        self.deltas: dict[date, DaySketches] = {}
+
+    def record(self, event_time: datetime, plate: str, duration: Optional[int] = None):
+        """Add one gate event (naive UTC) to its local day's delta."""
+        day = self.deltas.setdefault(local_date(event_time, _TZ), DaySketches())
+        day.plates.add(plate)
+        if duration is not None:
+            day.durations.add(duration)
+
+    def flush(self, db: Session) -> int:
+        """Merge all deltas into parking_sketches. Returns the number of days written."""
+        deltas, self.deltas = self.deltas, {}
+        try:
+            for day, delta in deltas.items():
+                for kind, sketch in ((DURATION, delta.durations), (PLATES, delta.plates)):
+                    _merge_into_row(db, day, kind, sketch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            for day, delta in deltas.items():          # keep the deltas for the next flush
+                self.deltas.setdefault(day, DaySketches()).merge(delta)
+            raise
+        return len(deltas)
+
+    def pending(self, day: date) -> Optional[DaySketches]:
+        return self.deltas.get(day)
+
+
+sketch_store = SketchStore()
+
+
+def _merge_into_row(db: Session, day: date, kind: str, sketch):
+    empty = (_new_digest() if kind == DURATION else _new_hll()).to_bytes()
+    db.execute(insert(ParkingSketch)
+               .values(bucket_date=day, kind=kind, data=empty, updated_at=datetime.utcnow())
+               .on_conflict_do_nothing())
+    row = (db.query(ParkingSketch)
+           .filter(ParkingSketch.bucket_date == day, ParkingSketch.kind == kind)
+           .with_for_update().one())
+    stored = _deserialize(kind, row.data)
+    stored.merge(sketch)
+    row.data = stored.to_bytes()
+    row.updated_at = datetime.utcnow()
+
+
+def load_day_sketches(db: Session, start: date, end: date) -> dict[date, DaySketches]:
+    """Stored sketches for start..end (inclusive) merged with this process's unflushed deltas."""
+    days: dict[date, DaySketches] = {}
+    rows = (db.query(ParkingSketch)
+            .filter(ParkingSketch.bucket_date >= start, ParkingSketch.bucket_date <= end).all())
+    for row in rows:
+        day = days.setdefault(row.bucket_date, DaySketches())
+        if row.kind == DURATION:
+            day.durations = TDigest.from_bytes(row.data)
+        elif row.kind == PLATES:
+            day.plates = HyperLogLog.from_bytes(row.data)
+    for d, delta in sketch_store.deltas.items():
+        if start <= d <= end:
+            days.setdefault(d, DaySketches()).merge(delta)
+    return dict(sorted(days.items()))
+
+
+def merge_days(days) -> DaySketches:
+    merged = DaySketches()
+    for day in days:
+        merged.merge(day)
+    return merged
+
+
+def backfill_sketches(db: Session, start: date, end: date) -> int:
+    """
+    Rebuild stored sketches for local dates start..end from entry_exit_log. Returns days written.
+    Offline only: a running backend still holds unflushed deltas for events this
+    reads from the log, and its next flush would count them a second time.
+    """
+    db.query(ParkingSketch).filter(
+        ParkingSketch.bucket_date >= start, ParkingSketch.bucket_date <= end,
+    ).delete(synchronize_session=False)
+    until = local_midnight_utc(start + timedelta(days=(end - start).days + 1), _TZ)
+    rows = (db.query(EntryExitLog.event_time, EntryExitLog.plate_number, EntryExitLog.gate,
+                     EntryExitLog.parking_duration)
+            .filter(EntryExitLog.event_time >= local_midnight_utc(start, _TZ), EntryExitLog.event_time < until)
+            .yield_per(5000))
+    store = SketchStore()
+    for event_time, plate, gate, duration in rows:
+        store.record(event_time, plate, duration if gate == "exit" else None)
+    written = store.flush(db)
+    logger.info(f"[UC2] Sketches backfilled {start} → {end}: {written} days")
+    return written
+
+
+async def run_sketch_flusher():
+    """Periodically flush sketch deltas. Started once at backend startup."""
+    while True:
+        await asyncio.sleep(settings.SKETCH_FLUSH_SECONDS)
+        await flush_now()
+
+
+async def flush_now():
+    if not sketch_store.deltas:
+        return
+    db = SessionLocal()
+    try:
+        sketch_store.flush(db)
+    except Exception as e:
+        logger.error(f"[UC2] Sketch flush failed: {e}", exc_info=True)
+    finally:
+        db.close()
@@ -0,0 +1,138 @@
+# app/services/pg_notify.py
+"""
+PostgreSQL LISTEN/NOTIFY bridge for keeping process-local caches in sync
+across uvicorn workers and nodes.
+
+Publish: notify(db, channel, payload) inside the writing transaction —
+         Postgres delivers it to every listener when that transaction commits.
+Listen:  pg_listener.subscribe(channel, on_notify, on_resync) before start().
+         One dedicated psycopg2 connection per process, read from the event
+         loop with add_reader (no thread, no polling).
+
+After a reconnect, notifications sent while we were disconnected are lost, so
+every channel's on_resync callback is called to reload its cache from scratch.
+Payloads carry a per-process origin id so a process can skip its own notifications.
+"""
+
+import asyncio
+import json
+import uuid
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import URL
+from sqlalchemy.orm import Session
+from app.database import engine
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_RECONNECT_SECONDS = 5
+
+# Unique per process (pids can collide across nodes)
+ORIGIN_ID = uuid.uuid4().hex
+
+
+def notify(db: Session, channel: str, **payload):
+    """Queue a notification on `channel`; sent when `db`'s transaction commits."""
+    payload["origin"] = ORIGIN_ID
+    db.execute(text("SELECT pg_notify(:channel, :payload)"),
+               {"channel": channel, "payload": json.dumps(payload, default=str)})
+
+
+def libpq_dsn(url: URL) -> str:
+    """A psycopg2.connect() DSN for a SQLAlchemy URL — drops a driver suffix such as +psycopg2."""
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class PgNotifyListener:
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self._handlers: dict[str, list[tuple[Callable, Optional[Callable]]]] = {}
+        self._conn = None
+        self._started = False
+        self._resync_pending = False    # set whenever notifications may have been missed
+
+    def subscribe(self, channel: str, on_notify: Callable[[dict], None],
+                  on_resync: Optional[Callable[[], None]] = None):
+        """on_notify(payload) for other processes' notifications; on_resync() after a reconnect."""
+        self._handlers.setdefault(channel, []).append((on_notify, on_resync))
+
+    def start(self):
+        self._started = True
+        self._connect()
+
+    def stop(self):
+        self._started = False
+        self._close()
+
+    def _connect(self):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        try:
+            conn = psycopg2.connect(self.dsn)
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cur:
+                for channel in self._handlers:
+                    cur.execute(f'LISTEN "{channel}"')
+        except Exception as e:
+            logger.error(f"[NOTIFY] Listener connect failed: {e} — retry in {_RECONNECT_SECONDS}s")
+            self._resync_pending = True
+            self._schedule_reconnect()
+            return
+
+        self._conn = conn
+        asyncio.get_running_loop().add_reader(conn.fileno(), self._on_readable)
+        logger.info(f"[NOTIFY] Listening on {sorted(self._handlers)}")
+
+        if self._resync_pending:
+            self._resync_pending = False
+            for handlers in self._handlers.values():
+                for _, on_resync in handlers:
+                    if on_resync:
+                        on_resync()
+
+    def _close(self):
+        if self._conn is not None:
+            try:
+                asyncio.get_running_loop().remove_reader(self._conn.fileno())
+            except Exception:
+                pass
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def _schedule_reconnect(self):
+        if self._started:
+            asyncio.get_running_loop().call_later(_RECONNECT_SECONDS, self._connect)
+
+    def _on_readable(self):
+        try:
+            self._conn.poll()
+        except Exception as e:
+            logger.error(f"[NOTIFY] Listener connection lost: {e}")
+            self._resync_pending = True
+            self._close()
+            self._schedule_reconnect()
+            return
+
+        while self._conn.notifies:
+            n = self._conn.notifies.pop(0)
+            try:
+                payload = json.loads(n.payload)
+            except ValueError:
+                logger.warning(f"[NOTIFY] Bad payload on {n.channel}: {n.payload!r}")
+                continue
+            if payload.get("origin") == ORIGIN_ID:
+                continue
+            for on_notify, _ in self._handlers.get(n.channel, []):
+                try:
+                    on_notify(payload)
+                except Exception as e:
+                    logger.error(f"[NOTIFY] Handler error on {n.channel}: {e}", exc_info=True)
+
+
+pg_listener = PgNotifyListener(libpq_dsn(engine.url))
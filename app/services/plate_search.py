@@ -0,0 +1,101 @@
+# app/services/plate_search.py
+"""
+🔜 Phase 2: Partial plate search across the vehicle registry and the gate log.
+
+Staff often have only part of a plate ("…1234"). Queries and plates are both
+normalized (uppercase, separators dropped — normalize_plate / plate_search_key)
+and matched as substrings:
+
+    WHERE regexp_replace(upper(plate_number), ...) LIKE '%1234%'
+
+Both tables carry a pg_trgm GIN index on exactly that expression, so the
+database reads only rows sharing the query's trigrams instead of scanning the
+log. Queries need at least MIN_QUERY_LENGTH characters (one trigram).
+
+Ranking: exact, then prefix, then suffix, then anywhere; ties by trigram
+similarity, then (gate history) most recently seen. Without pg_trgm (see
+database.create_extensions) the same LIKE filter scans the table, there is no
+similarity score, and ties go to the plate (registry) or the last sighting.
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import case, func, null
+from sqlalchemy.orm import Session
+from app.database import installed_extensions
+from app.models.entry_exit_log import EntryExitLog
+from app.models.vehicle import Vehicle
+from app.services.vehicle_service import lookup_vehicles_by_plates
+from app.utils.plate_matching import normalize_plate, plate_search_key
+
+MIN_QUERY_LENGTH = 3
+MATCH_TYPES = ("exact", "prefix", "suffix", "contains")
+
+
+def _match(column, q: str):
+    """
+    (key, filter, rank, score, order) expressions for matching `column` against
+    normalized `q`. score is NULL and order is just the rank without pg_trgm.
+    """
+    key = plate_search_key(column)
+    rank = case((key == q, 0), (key.like(f"{q}%"), 1), (key.like(f"%{q}"), 2), else_=3)
+    if "pg_trgm" not in installed_extensions:
+        return key, key.like(f"%{q}%"), rank, null(), [rank]
+    score = func.similarity(key, q)
+    return key, key.like(f"%{q}%"), rank, score, [rank, score.desc()]
+
+
+def _round(score: Optional[float]) -> Optional[float]:
+    return None if score is None else round(score, 3)
+
+
+def search_registry(db: Session, q: str, limit: int) -> list[dict]:
+    _, matches, rank, score, order = _match(Vehicle.plate_number, q)
+    rows = (db.query(Vehicle, rank.label("rank"), score.label("score"))
+            .filter(matches)
+            .order_by(*order, Vehicle.plate_number)
+            .limit(limit).all())
+    return [{"plate": v.plate_number, "owner": v.owner_name, "type": v.vehicle_type,
+             "employee_id": v.employee_id, "match": MATCH_TYPES[r], "score": _round(s)}
+            for v, r, s in rows]
+
+
+def search_gate_log(db: Session, q: str, limit: int, since: Optional[datetime] = None) -> list[dict]:
+    """Distinct matching plates from entry_exit_log with their sighting counts."""
+    _, matches, rank, score, order = _match(EntryExitLog.plate_number, q)
+    last_seen = func.max(EntryExitLog.event_time)
+    query = (db.query(EntryExitLog.plate_number,
+                      func.count().label("sightings"),
+                      func.count().filter(EntryExitLog.gate == "entry").label("entries"),
+                      func.count().filter(EntryExitLog.gate == "exit").label("exits"),
+                      func.min(EntryExitLog.event_time).label("first_seen"),
+                      last_seen.label("last_seen"),
+                      rank.label("rank"), score.label("score"))
+             .filter(matches))
+    if since:
+        query = query.filter(EntryExitLog.event_time >= since)
+    rows = (query.group_by(EntryExitLog.plate_number)
+            .order_by(*order, last_seen.desc())
+            .limit(limit).all())
+    return [{"plate": r.plate_number, "sightings": r.sightings, "entries": r.entries, "exits": r.exits,
+             "first_seen": r.first_seen, "last_seen": r.last_seen,
+             "match": MATCH_TYPES[r.rank], "score": _round(r.score)}
+            for r in rows]
+
+
+def search_plates(db: Session, query: str, limit: int = 20, days: Optional[int] = None) -> dict:
+    """
+    Ranked partial-plate matches from the registry and the gate log.
+    days limits the gate history to recent sightings. Raises ValueError for a
+    query shorter than MIN_QUERY_LENGTH after normalization.
+    """
+    q = normalize_plate(query)
+    if len(q) < MIN_QUERY_LENGTH:
+        raise ValueError(f"Plate search needs at least {MIN_QUERY_LENGTH} letters or digits")
+    since = datetime.utcnow() - timedelta(days=days) if days else None
+    vehicles = search_registry(db, q, limit)
+    history = search_gate_log(db, q, limit, since)
+    registered = lookup_vehicles_by_plates(db, [h["plate"] for h in history]) if history else {}
+    for h in history:
+        h["registered"] = registered.get(h["plate"]) is not None
+    return {"query": query, "normalized": q, "vehicles": vehicles, "gate_history": history}
@@ -0,0 +1,187 @@
+# app/services/poller_ownership.py
+"""
+Poller ownership — spreads camera alertStream pollers across worker processes
+(uvicorn --workers N, or several nodes) without ever polling a camera twice.
+
+Mechanism: PostgreSQL session-level advisory locks on one dedicated connection
+per worker.
+  - Each worker holds a lock (WORKER_NS, <random key>) while it is alive, so
+    live workers can be counted from pg_locks.
+  - A camera is polled only by the worker holding lock (CAMERA_NS, crc32(cam_id)).
+  - Every POLLER_REBALANCE_SECONDS each worker aims for ceil(cameras / workers)
+    cameras: it releases its surplus and try-locks free cameras, preferring the
+    ones that rank highest for it (rendezvous hashing keeps workers from
+    fighting over the same cameras).
+
+Failover: when a worker dies its DB session ends and Postgres releases all of
+its locks; the remaining workers pick the cameras up on their next round.
+If our own lock connection breaks we stop every poller before reconnecting,
+because the locks are already gone.
+
+Note: runtime camera changes via /pollers only reach the worker that served the
+request — keep the camera list in config/.env identical on all workers.
+"""
+
+import asyncio
+import math
+import random
+import zlib
+from typing import Optional
+
+from sqlalchemy import text
+from app.config import settings
+from app.database import engine
+from app.services.camera_poller import PollerSupervisor, poller_supervisor
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Advisory lock namespaces (first int4 of the two-key form)
+WORKER_NS = 0x44504D01   # worker liveness
+CAMERA_NS = 0x44504D02   # camera ownership
+
+
+def camera_lock_key(cam_id: str) -> int:
+    return zlib.crc32(cam_id.encode()) & 0x7FFFFFFF
+
+
+def _rank(worker_key: int, cam_id: str) -> int:
+    """Rendezvous hash — each worker gets its own stable preference order of cameras."""
+    return zlib.crc32(f"{worker_key}:{cam_id}".encode())
+
+
+class PollerOwnership:
+    """Owns this worker's share of camera pollers via advisory locks."""
+
+    def __init__(self, supervisor: PollerSupervisor, interval: float):
+        self.supervisor = supervisor
+        self.interval = interval
+        self.worker_key: Optional[int] = None
+        self.owned: set[str] = set()
+        self.live_workers = 0
+        self._conn = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+    # ── Blocking lock operations (run in a worker thread) ────────────────
+    def _connect(self):
+        # AUTOCOMMIT: advisory locks are session-scoped; never sit idle in a transaction
+        conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        while True:
+            key = random.randint(1, 0x7FFFFFFF)
+            if conn.execute(text("SELECT pg_try_advisory_lock(:ns, :key)"),
+                            {"ns": WORKER_NS, "key": key}).scalar():
+                break
+        self._conn, self.worker_key = conn, key
+        logger.info(f"[SHARD] Registered as poller worker {key}")
+
+    def _disconnect(self):
+        if self._conn is not None:
+            try:
+                # close() would only return the connection to the pool with its session —
+                # and its locks — still alive; invalidate() closes the DBAPI connection,
+                # so Postgres ends the session and releases every lock we hold
+                self._conn.invalidate()
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+        self.owned = set()
+
+    def _count_live_workers(self) -> int:
+        return self._conn.execute(text(
+            "SELECT count(*) FROM pg_locks "
+            "WHERE locktype = 'advisory' AND objsubid = 2 AND granted AND classid::bigint = :ns"
+        ), {"ns": WORKER_NS}).scalar() or 1
+
+    def _try_lock(self, cam_id: str) -> bool:
+        return bool(self._conn.execute(text("SELECT pg_try_advisory_lock(:ns, :key)"),
+                                       {"ns": CAMERA_NS, "key": camera_lock_key(cam_id)}).scalar())
+
+    def _unlock(self, cam_id: str):
+        self._conn.execute(text("SELECT pg_advisory_unlock(:ns, :key)"),
+                           {"ns": CAMERA_NS, "key": camera_lock_key(cam_id)})
+
+    def _rebalance_locks(self, cameras: dict) -> set[str]:
+        """Acquire/release camera locks so this worker owns its fair share. Returns owned set."""
+        if self._conn is None:
+            self._connect()
+
+        self.live_workers = self._count_live_workers()
+        target = math.ceil(len(cameras) / max(self.live_workers, 1))
+        rank = lambda cam_id: _rank(self.worker_key, cam_id)  # noqa: E731
+
+        owned = set()
+        for cam_id in self.owned:
+            if cam_id in cameras:
+                owned.add(cam_id)
+            else:
+                self._unlock(cam_id)            # camera removed from config
+
+        # Release surplus — the cameras we prefer least go first
+        for cam_id in sorted(owned, key=rank)[:max(len(owned) - target, 0)]:
+            self._unlock(cam_id)
+            owned.discard(cam_id)
+
+        for cam_id in sorted(cameras, key=rank, reverse=True):
+            if len(owned) >= target:
+                break
+            if cam_id not in owned and self._try_lock(cam_id):
+                owned.add(cam_id)
+
+        self.owned = owned
+        return owned
+
+    # ── Async driver ─────────────────────────────────────────────────────
+    async def rebalance(self):
+        cameras = dict(settings.CAMERAS)
+        try:
+            owned = await asyncio.to_thread(self._rebalance_locks, cameras)
+        except Exception as e:
+            logger.error(f"[SHARD] Lock connection failed — dropping all pollers: {e}")
+            await asyncio.to_thread(self._disconnect)
+            owned = set()
+
+        for cam_id in set(self.supervisor.streams) - owned:
+            await self.supervisor.remove_camera(cam_id)
+        for cam_id in owned:
+            self.supervisor.add_camera(cam_id, cameras[cam_id])
+
+    def request_rebalance(self):
+        """Run a rebalance round now (e.g. after a camera was added at runtime)."""
+        self._wake.set()
+
+    async def _loop(self):
+        while True:
+            await self.rebalance()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval * random.uniform(0.8, 1.2))
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="poller-ownership")
+            logger.info(f"[SHARD] Poller sharding started — rebalance every {self.interval}s")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.supervisor.stop()
+        await asyncio.to_thread(self._disconnect)
+
+    def status(self) -> dict:
+        return {
+            "worker_key": self.worker_key,
+            "live_workers": self.live_workers,
+            "owned": sorted(self.owned),
+        }
+
+
+poller_ownership = PollerOwnership(poller_supervisor, interval=settings.POLLER_REBALANCE_SECONDS)
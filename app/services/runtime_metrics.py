@@ -0,0 +1,51 @@
+# app/services/runtime_metrics.py
+"""
+Scrape-time gauges for /metrics: in-process queue depths and DB pool usage.
+Read from the existing singletons when Prometheus scrapes — nothing is
+recorded between scrapes. The Postgres event_queue depth needs a query and
+stays at /events/queue.
+"""
+
+from app.database import engine
+from app.utils.metrics import registry
+
+
+def _queue_depths() -> dict[tuple, float]:
+    from app.services.alert_service import alert_sink
+    from app.services.event_reorder import reorder_buffer
+    from app.services.notifiers import notification_fanout
+    from app.services.zone_actors import zone_actors
+
+    depths = {
+        ("alert_sink",): alert_sink.stats()["queued"],
+        ("zone_actor_mailboxes",): sum(zone_actors.mailbox_depths().values()),
+        ("reorder_buffered",): sum(len(c.heap) for c in reorder_buffer.cameras.values()),
+        ("reorder_pending_dispatch",): sum(c.out.qsize() for c in reorder_buffer.cameras.values()),
+    }
+    for name, stats in notification_fanout.stats().items():
+        depths[(f"notifier_{name}",)] = stats["queued"]
+    return depths
+
+
+def _live_subscribers() -> float:
+    from app.services.event_bus import event_bus
+    return len(event_bus.subscribers)
+
+
+def _overstay_timers() -> float:
+    from app.services.overstay_service import overstay_monitor
+    return len(overstay_monitor.wheel)
+
+
+def _db_pool() -> dict[tuple, float]:
+    pool = engine.pool
+    return {("size",): pool.size(), ("checked_out",): pool.checkedout(),
+            ("idle",): pool.checkedin(), ("overflow",): max(pool.overflow(), 0)}
+
+
+def register_runtime_gauges():
+    """Called once at startup."""
+    registry.gauge("damanat_queue_depth", "Items waiting in in-process queues", ("queue",), _queue_depths)
+    registry.gauge("damanat_live_subscribers", "Connected SSE / WebSocket clients", (), _live_subscribers)
+    registry.gauge("damanat_overstay_timers", "Armed overstay deadlines", (), _overstay_timers)
+    registry.gauge("damanat_db_pool_connections", "SQLAlchemy connection pool usage", ("state",), _db_pool)
@@ -0,0 +1,225 @@
+# app/services/vehicle_import.py
+"""
+🔜 Phase 2: Bulk vehicle registry import (UC4).
+
+The request body (CSV with a header row, or NDJSON) is parsed as it streams
+in. Valid rows are upserted VEHICLE_IMPORT_BATCH_SIZE at a time with one
+
+    INSERT ... ON CONFLICT (plate_number) DO UPDATE | DO NOTHING ... RETURNING
+
+per batch, committed per batch. A batch that fails in the database is retried
+row by row so only the bad rows are rejected. Every rejected row is reported
+with its line number.
+
+The RETURNING rows update this process's registry cache directly; other
+workers get a single `reload` notification at the end.
+
+Parsing runs on the event loop as the body arrives; every database round trip
+(batch upserts, row-by-row retries, the final notification) runs in a worker
+thread, so a large import never stalls the webhook, pollers or live feeds.
+"""
+
+import asyncio
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import AsyncIterator, Optional, Union
+from pydantic import ValidationError
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.vehicle import Vehicle
+from app.schemas.vehicle import VehicleCreate
+from app.services.vehicle_service import VehicleRecord, registry_bulk_changed, registry_cache
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+REQUIRED_FIELDS = ("plate_number", "owner_name", "vehicle_type")
+UPDATE_FIELDS = ("owner_name", "vehicle_type", "employee_id", "notes")
+
+
+@dataclass
+class ImportReport:
+    received: int = 0
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0                    # existing plates left alone (update=false)
+    failed: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def fail(self, line: int, plate: Optional[str], error: str):
+        self.failed += 1
+        if len(self.errors) < settings.VEHICLE_IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line, "plate": plate, "error": error})
+
+    def as_dict(self) -> dict:
+        return {"received": self.received, "created": self.created, "updated": self.updated,
+                "skipped": self.skipped, "failed": self.failed, "errors": self.errors}
+
+
+# ── parsing ──
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decoded lines (without the newline) from a stream of byte chunks."""
+    buf = b""
+    first = True
+    async for chunk in chunks:
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            text = line.decode("utf-8", errors="replace").rstrip("\r")
+            if first:
+                text, first = text.lstrip("\ufeff"), False
+            yield text
+    if buf:
+        yield buf.decode("utf-8", errors="replace").rstrip("\r").lstrip("\ufeff" if first else "")
+
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[tuple[int, Union[dict, str]]]:
+    """
+    (line number, record dict) per data row, or (line number, error message)
+    for a row that cannot be parsed. Raises ValueError for a CSV header
+    without the required columns.
+    """
+    n = 0
+    if fmt == "ndjson":
+        async for line in iter_lines(chunks):
+            n += 1
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError as e:
+                yield n, f"invalid JSON: {e}"
+                continue
+            yield n, obj if isinstance(obj, dict) else "expected a JSON object"
+        return
+
+    header: Optional[list[str]] = None
+    pending, start = "", 0
+    async for line in iter_lines(chunks):
+        n += 1
+        if not pending:
+            start = n
+        pending += line + "\n"
+        if pending.count('"') % 2:          # inside a quoted field that spans lines
+            continue
+        text, pending = pending, ""
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [h.strip() for h in values]
+            missing = [c for c in REQUIRED_FIELDS if c not in header]
+            if missing:
+                raise ValueError(f"CSV header is missing columns: {', '.join(missing)}")
+            continue
+        if len(values) != len(header):
+            yield start, f"expected {len(header)} columns, got {len(values)}"
+            continue
+        yield start, dict(zip(header, values))
+    if pending:
+        yield start, "unterminated quoted field"
+
+
+def _validate(record: dict) -> VehicleCreate:
+    cleaned = {}
+    for k in VehicleCreate.model_fields:
+        v = record.get(k)
+        cleaned[k] = (v.strip() or None) if isinstance(v, str) else v
+    return VehicleCreate.model_validate(cleaned)
+
+
+def _describe(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+
+
+# ── writing ──
+
+def _upsert(db: Session, rows: list[dict], update: bool) -> list:
+    stmt = insert(Vehicle).values(rows)
+    if update:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Vehicle.plate_number],
+            set_={**{c: stmt.excluded[c] for c in UPDATE_FIELDS}, "is_registered": 1},
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[Vehicle.plate_number])
+    # xmax = 0 only for rows this statement inserted (vs. updated in place)
+    stmt = stmt.returning(*Vehicle.__table__.c, literal_column("xmax = 0").label("inserted"))
+    return db.execute(stmt).all()
+
+
+def _write_batch(db: Session, batch: dict[str, tuple[int, dict]], update: bool, report: ImportReport) -> list:
+    """Blocking: upsert and commit one batch. Returns the RETURNING rows."""
+    try:
+        returned = _upsert(db, [row for _, row in batch.values()], update)
+        db.commit()
+        written = len(batch)
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.warning(f"[UC4] Import batch of {len(batch)} failed ({type(e).__name__}) — retrying row by row")
+        returned, written = [], 0
+        for line, row in batch.values():
+            try:
+                returned += _upsert(db, [row], update)
+                db.commit()
+                written += 1
+            except SQLAlchemyError as row_error:
+                db.rollback()
+                report.fail(line, row["plate_number"], str(getattr(row_error, "orig", None) or row_error).splitlines()[0])
+
+    inserted = sum(1 for r in returned if r.inserted)
+    report.created += inserted
+    report.updated += len(returned) - inserted
+    report.skipped += written - len(returned)
+    return returned
+
+
+async def _flush_batch(db: Session, batch: dict[str, tuple[int, dict]], update: bool, report: ImportReport):
+    returned = await asyncio.to_thread(_write_batch, db, batch, update, report)
+    if registry_cache.loaded:                   # the cache is only touched from the event loop
+        for r in returned:
+            registry_cache.put(VehicleRecord.from_row(r))
+
+
+async def import_vehicles(db: Session, records: AsyncIterator[tuple[int, Union[dict, str]]],
+                          update: bool = True, batch_size: Optional[int] = None) -> ImportReport:
+    """
+    Upsert parsed records in batches. update=False leaves existing plates
+    untouched (counted as skipped). A plate repeated within one batch keeps its
+    last row; the earlier ones are reported as superseded.
+    """
+    batch_size = batch_size or settings.VEHICLE_IMPORT_BATCH_SIZE
+    report = ImportReport()
+    batch: dict[str, tuple[int, dict]] = {}
+    now = datetime.utcnow()
+
+    async for line, record in records:
+        report.received += 1
+        if isinstance(record, str):
+            report.fail(line, None, record)
+            continue
+        try:
+            body = _validate(record)
+        except ValidationError as e:
+            report.fail(line, record.get("plate_number"), _describe(e))
+            continue
+        if body.plate_number in batch:
+            report.fail(batch[body.plate_number][0], body.plate_number, f"superseded by line {line}")
+        batch[body.plate_number] = (line, {**body.model_dump(), "is_registered": 1, "registered_at": now})
+        if len(batch) >= batch_size:
+            await _flush_batch(db, batch, update, report)
+            batch = {}
+    if batch:
+        await _flush_batch(db, batch, update, report)
+
+    if report.created or report.updated:
+        await asyncio.to_thread(registry_bulk_changed, db)
+    logger.info(f"[UC4] Vehicle import: {report.received} rows — {report.created} created, "
+                f"{report.updated} updated, {report.skipped} skipped, {report.failed} failed")
+    return report
@@ -2,20 +2,153 @@
 """
 🔜 Phase 2: Vehicle lookup and management helpers.
 Used by entry_exit_service and vehicles router.
+
+The registry is cached in-process (plate → VehicleRecord), loaded at startup.
+Gate events resolve plates from the cache with no DB read. The vehicles router
+calls registry_changed() inside its write transaction: the local cache is
+updated after commit and other workers are told via NOTIFY vehicle_registry.
+Bulk imports (vehicle_import.py) send one `reload` notification instead of one per plate.
 """
 
+from dataclasses import dataclass
+from typing import Optional
 from sqlalchemy.orm import Session
+from app.database import SessionLocal
 from app.models.vehicle import Vehicle
+from app.services.pg_notify import notify, pg_listener
+from app.config import settings
+from app.utils.plate_matching import PlateIndex
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+REGISTRY_CHANNEL = "vehicle_registry"
+
+
+@dataclass(frozen=True)
+class VehicleRecord:
+    """Detached, immutable copy of a vehicles row — safe to share across sessions."""
+    id: int
+    plate_number: str
+    owner_name: str
+    vehicle_type: str
+    employee_id: Optional[str]
+    is_registered: int
+
+    @classmethod
+    def from_row(cls, v: Vehicle) -> "VehicleRecord":
+        return cls(v.id, v.plate_number, v.owner_name, v.vehicle_type, v.employee_id, v.is_registered)
+
+
+class VehicleRegistryCache:
+    def __init__(self):
+        self.by_plate: dict[str, VehicleRecord] = {}
+        self.fuzzy = PlateIndex(max_distance=0)     # identity: confusable folding only
+        self.loaded = False
+
+    def load(self, db: Session):
+        self.by_plate = {v.plate_number: VehicleRecord.from_row(v) for v in db.query(Vehicle).all()}
+        self.fuzzy.rebuild(self.by_plate)
+        self.loaded = True
+        logger.info(f"[UC4] Vehicle registry cache loaded: {len(self.by_plate)} plates")
+
+    def put(self, record: VehicleRecord):
+        self.by_plate[record.plate_number] = record
+        self.fuzzy.add(record.plate_number)
+
+    def refresh_plate(self, db: Session, plate: str):
+        row = db.query(Vehicle).filter(Vehicle.plate_number == plate).first()
+        if row:
+            self.put(VehicleRecord.from_row(row))
+        else:
+            self.by_plate.pop(plate, None)
+            self.fuzzy.remove(plate)
+
+    def get(self, plate: str) -> Optional[VehicleRecord]:
+        return self.by_plate.get(plate)
+
+
+registry_cache = VehicleRegistryCache()
+
 
 def lookup_vehicle_by_plate(db: Session, plate_number: str):
     """Find a registered vehicle by plate number. Returns None if not found."""
+    if registry_cache.loaded:
+        return registry_cache.get(plate_number)
     return db.query(Vehicle).filter(Vehicle.plate_number == plate_number).first()
 
 
+def lookup_vehicles_by_plates(db: Session, plates: list[str]) -> dict:
+    """Batch lookup: plate → vehicle or None, in request order. One query when the cache is not loaded."""
+    plates = list(dict.fromkeys(plates))
+    if registry_cache.loaded:
+        return {p: registry_cache.get(p) for p in plates}
+    found = {v.plate_number: v for v in db.query(Vehicle).filter(Vehicle.plate_number.in_(plates))}
+    return {p: found.get(p) for p in plates}
+
+
+def fuzzy_lookup_vehicle(plate_number: str) -> Optional[VehicleRecord]:
+    """
+    OCR-tolerant fallback for a plate with no exact registry match: the unique
+    registered plate it reads as after confusable folding ("A8C1234" → "ABC-1234"),
+    else None. No edit distance here — a plate one real character off belongs to
+    someone else, and adopting its identity would hide an unknown vehicle.
+    Only available once the registry cache is loaded.
+    """
+    if not registry_cache.loaded or settings.PLATE_FUZZY_MAX_DISTANCE <= 0:
+        return None
+    match = registry_cache.fuzzy.best_match(plate_number, max_distance=0)
+    return registry_cache.get(match) if match else None
+
+
 def is_registered(db: Session, plate_number: str) -> bool:
     """Check if a plate number is registered in the system."""
     return lookup_vehicle_by_plate(db, plate_number) is not None
+
+
+def registry_changed(db: Session, plate: str):
+    """
+    Call inside the transaction that changed `plate`, before commit.
+    Other processes refresh the plate when it commits; call
+    apply_registry_change() after the commit for this process.
+    """
+    notify(db, REGISTRY_CHANNEL, plate=plate)
+
+
+def apply_registry_change(db: Session, plate: str):
+    if registry_cache.loaded:
+        registry_cache.refresh_plate(db, plate)
+
+
+def registry_bulk_changed(db: Session):
+    """After a committed bulk write: other processes reload the whole registry (one query each)."""
+    notify(db, REGISTRY_CHANNEL, reload=True)
+    db.commit()
+
+
+def _on_registry_notify(payload: dict):
+    if payload.get("reload") and registry_cache.loaded:
+        _on_registry_resync()
+        return
+    plate = payload.get("plate")
+    if not plate or not registry_cache.loaded:
+        return
+    db = SessionLocal()
+    try:
+        registry_cache.refresh_plate(db, plate)
+    finally:
+        db.close()
+
+
+def _on_registry_resync():
+    db = SessionLocal()
+    try:
+        registry_cache.load(db)
+    finally:
+        db.close()
+
+
+def start_registry_cache():
+    """Load the cache and subscribe to registry changes. Called once at startup."""
+    _on_registry_resync()
+    pg_listener.subscribe(REGISTRY_CHANNEL, _on_registry_notify, _on_registry_resync)
@@ -2,37 +2,63 @@
 """
 UC5: Proactive Violation Alerts
 Events: fielddetection (restricted zone), linedetection (forbidden line), regionEntrance
-Config: Add zone IDs matching camera-configured zone names to RESTRICTED_ZONES
+Config: "violation" rules in the zone_rules table (zone_rule_engine)
+
+Rules with dwell_seconds only alert once a vehicle has stayed that long
+(active → inactive pairing in dwell_tracker), so passing through a
+no-parking zone is not a violation. Other matching rules alert on entry.
+Alerts are grouped into incidents by incident_service.
 """
 
-from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from app.models.alert import Alert
+from app.database import SessionLocal
 from app.services.event_parser import ParsedCameraEvent
-from app.services.alert_service import create_alert
+from app.services.incident_service import raise_incident_alert, recently_alerted
+from app.services.dwell_tracker import DwellTracker, DwellState
+from app.services.zone_rule_engine import rule_engine
 from app.config import settings
 from app.utils.logger import get_logger
+from app.utils.time_utils import to_naive_utc
 
 logger = get_logger(__name__)
 
-RESTRICTED_ZONES = {"restricted-vip", "no-parking-zone", "emergency-exit", "loading-bay"}
-ALWAYS_VIOLATION_EVENTS = {"linedetection"}
+
+async def _raise_dwell_violation(state: DwellState):
+    db = SessionLocal()
+    try:
+        if recently_alerted(db, "violation", state.zone_id):
+            return
+        desc = (f"Vehicle parked in restricted zone {state.zone_id} "
+                f"for over {state.threshold_seconds:.0f}s")
+        logger.warning(f"[UC5] VIOLATION: {desc}")
+        await raise_incident_alert(db, "violation", state.camera_id, state.zone_id, state.event_type, desc)
+    finally:
+        db.close()
+
+
+dwell_tracker = DwellTracker(_raise_dwell_violation,
+                             idle_timeout=settings.DWELL_IDLE_TIMEOUT_SECONDS,
+                             tick_seconds=settings.DWELL_TICK_SECONDS)
 
 
 async def handle_violation_event(event: ParsedCameraEvent, db: Session):
     zone_id = event.region_id or "unknown-zone"
-    if zone_id not in RESTRICTED_ZONES and event.event_type not in ALWAYS_VIOLATION_EVENTS:
+    rule = rule_engine.decide(event, "violation")
+    if rule is None:
         return
 
-    cooldown = timedelta(seconds=settings.INTRUSION_COOLDOWN_SECONDS)
-    recent = db.query(Alert).filter(
-        Alert.zone_id == zone_id, Alert.alert_type == "violation",
-        Alert.triggered_at >= datetime.utcnow() - cooldown
-    ).first()
-    if recent:
+    if rule.dwell_seconds:
+        dwell_tracker.observe(event.camera_id, zone_id, event.event_state,
+                              to_naive_utc(event.trigger_time), rule.dwell_seconds, event.event_type)
+        return
+
+    if event.event_state == "inactive":
+        return              # end of a detection already alerted on its active edge
+
+    if recently_alerted(db, "violation", zone_id):
         return
 
     desc = (f"Line crossing in zone {zone_id}" if event.event_type == "linedetection"
             else f"Vehicle in restricted zone: {zone_id}")
     logger.warning(f"[UC5] VIOLATION: {desc}")
-    await create_alert(db, "violation", event.camera_id, zone_id, event.event_type, desc)
+    await raise_incident_alert(db, "violation", event.camera_id, zone_id, event.event_type, desc)
@@ -0,0 +1,257 @@
+# app/services/zone_actors.py
+"""
+UC3: Single-writer zone actors.
+Events: regionEntrance (+1), regionExiting (-1) — routed here by event_dispatcher;
+        capacity updates and resets from routers/occupancy.py.
+
+Each zone is owned by one asyncio task with its own mailbox. The actor is the
+only writer of its zone: it applies messages strictly in mailbox order, keeps
+the zone state in memory (loaded from zone_occupancy on first use) and writes
+once per drained batch with a single commit. Different zones run in parallel;
+nothing on the hot path takes a lock. The occupancy alert state (open or not)
+is part of the zone state, so alerts are only written on a raise/clear
+transition at the end of a batch.
+
+A batch that fails is re-applied to freshly loaded state up to
+ZONE_ACTOR_MAX_ATTEMPTS times, then written to logs/zone_actor_dead_letter.jsonl.
+An actor with no zone row and an empty mailbox retires.
+
+Assumes one process owns a zone's events (single worker, or poller sharding);
+two processes running actors for the same zone would overwrite each other.
+"""
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.zone_occupancy import ZoneOccupancy
+from app.services.event_parser import ParsedCameraEvent
+from app.services.alert_service import announce_resolved, create_alert
+from app.services.occupancy_service import (
+    DEFAULT_MAX_CAPACITY, OCCUPANCY_ALERT, RAISE, CLEAR, apply_occupancy_event, alert_transition,
+    has_open_occupancy_alert, occupancy_alert_text, occupancy_zone_id, publish_occupancy, resolve_occupancy_alert,
+    wait_occupancy_alert_written,
+)
+from app.utils.logger import get_logger, LOG_DIR
+from app.utils.metrics import HANDLER_SECONDS
+
+logger = get_logger(__name__)
+
+# Same handler label as the direct path: one observation per drained batch
+_OCCUPANCY_TIMER = HANDLER_SECONDS.labels("occupancy")
+
+DEAD_LETTER_PATH = os.path.join(LOG_DIR, "zone_actor_dead_letter.jsonl")
+_RETRY_BASE_SECONDS = 0.5
+
+# Mailbox message kinds
+EVENT = "event"
+SET_CAPACITY = "set_capacity"
+RESET = "reset"
+
+
+@dataclass
+class ZoneState:
+    zone_id: str
+    camera_id: str
+    current_count: int
+    max_capacity: int
+    last_updated: Optional[datetime] = None
+    persisted: bool = False     # row exists in zone_occupancy
+    alert_active: bool = False  # an occupancy_full alert is open for this zone
+
+
+def _dead_letter(zone_id: str, batch: list, reason: str):
+    """Record the messages of a batch that could not be written, for manual replay."""
+    failed_at = datetime.utcnow().isoformat()
+    try:
+        with open(DEAD_LETTER_PATH, "a", encoding="utf-8") as f:
+            for kind, payload, _ in batch:
+                if isinstance(payload, ParsedCameraEvent):
+                    payload = {"camera_id": payload.camera_id, "event_type": payload.event_type,
+                               "trigger_time": payload.trigger_time.isoformat()}
+                f.write(json.dumps({"zone_id": zone_id, "kind": kind, "payload": payload,
+                                    "reason": reason, "failed_at": failed_at}) + "\n")
+    except OSError as e:
+        logger.error(f"[UC3] Dead-letter write failed for zone {zone_id}: {e}")
+
+
+class ZoneActor:
+    def __init__(self, zone_id: str, on_idle: Callable[["ZoneActor"], None]):
+        self.zone_id = zone_id
+        self.mailbox: asyncio.Queue = asyncio.Queue()
+        self.state: Optional[ZoneState] = None
+        self._on_idle = on_idle
+        self.task = asyncio.create_task(self._run(), name=f"zone-{zone_id}")
+
+    def _load(self, db: Session):
+        row = db.query(ZoneOccupancy).filter(ZoneOccupancy.zone_id == self.zone_id).first()
+        if row:
+            self.state = ZoneState(self.zone_id, row.camera_id, row.current_count,
+                                   row.max_capacity, row.last_updated, persisted=True,
+                                   alert_active=has_open_occupancy_alert(db, self.zone_id))
+
+    def _apply(self, kind: str, payload):
+        now = datetime.utcnow()
+        if kind == EVENT:
+            event: ParsedCameraEvent = payload
+            if self.state is None:
+                self.state = ZoneState(self.zone_id, event.camera_id, 0, DEFAULT_MAX_CAPACITY)
+            s = self.state
+            s.current_count = apply_occupancy_event(s.current_count, event.event_type)
+            s.last_updated = now
+            logger.info(f"[UC3] {self.zone_id}: {s.current_count}/{s.max_capacity}")
+        elif kind == SET_CAPACITY:
+            if self.state is None:
+                self.state = ZoneState(self.zone_id, "manual", 0, payload)
+            self.state.max_capacity = payload
+            self.state.last_updated = now
+        elif kind == RESET:
+            if self.state is not None:
+                self.state.current_count = 0
+                self.state.last_updated = now
+
+    def _write(self, db: Session):
+        s = self.state
+        if s is None:
+            return
+        if s.persisted:
+            db.query(ZoneOccupancy).filter(ZoneOccupancy.zone_id == s.zone_id).update({
+                ZoneOccupancy.current_count: s.current_count,
+                ZoneOccupancy.max_capacity: s.max_capacity,
+                ZoneOccupancy.last_updated: s.last_updated,
+            })
+        else:
+            db.add(ZoneOccupancy(zone_id=s.zone_id, camera_id=s.camera_id, current_count=s.current_count,
+                                 max_capacity=s.max_capacity, last_updated=s.last_updated))
+        db.commit()
+        s.persisted = True
+
+    def _apply_batch(self, db: Session, batch: list) -> tuple[Optional[str], int]:
+        """Load, apply and write the batch in one commit. Returns (alert transition, alerts resolved)."""
+        if self.state is None:
+            self._load(db)
+        for kind, payload, _ in batch:
+            self._apply(kind, payload)
+        transition, resolved = None, 0
+        s = self.state
+        if s is not None:
+            transition = alert_transition(s.alert_active, s.current_count, s.max_capacity)
+            if transition == CLEAR:
+                resolved = resolve_occupancy_alert(db, self.zone_id)     # committed with the zone row
+                logger.info(f"[UC3] {self.zone_id}: occupancy alert resolved")
+        self._write(db)
+        return transition, resolved
+
+    async def _process(self, batch: list):
+        if self.state is not None and self.state.alert_active:
+            await wait_occupancy_alert_written(self.zone_id)     # a CLEAR in this batch must find the row
+        for attempt in range(1, settings.ZONE_ACTOR_MAX_ATTEMPTS + 1):
+            db = SessionLocal()
+            try:
+                transition, resolved = self._apply_batch(db, batch)
+                break
+            except Exception as e:
+                db.rollback()
+                self.state = None          # may hold part of the batch — reload and re-apply it
+                if attempt == settings.ZONE_ACTOR_MAX_ATTEMPTS:
+                    logger.error(f"[UC3] Zone actor {self.zone_id} dropped a batch of {len(batch)} "
+                                 f"after {attempt} attempts: {e}", exc_info=True)
+                    _dead_letter(self.zone_id, batch, str(e))
+                    for _, _, reply in batch:
+                        if reply is not None and not reply.done():
+                            reply.set_exception(e)
+                    return
+                logger.warning(f"[UC3] Zone actor {self.zone_id} batch failed (attempt {attempt}), retrying: {e}")
+            finally:
+                db.close()
+            await asyncio.sleep(_RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+
+        # Committed: the batch is in the zone row and is never re-applied from here on
+        s = self.state
+        if s is not None:
+            publish_occupancy(s.zone_id, s.current_count, s.max_capacity, s.last_updated)
+        announce_resolved(OCCUPANCY_ALERT, resolved, self.zone_id)
+        if transition == CLEAR:
+            s.alert_active = False
+        elif transition == RAISE:
+            db = SessionLocal()
+            try:
+                last_event = next((p for k, p, _ in reversed(batch) if k == EVENT), None)
+                await create_alert(db, OCCUPANCY_ALERT, s.camera_id, self.zone_id,
+                                   last_event.event_type if last_event else None,
+                                   occupancy_alert_text(self.zone_id, s.current_count, s.max_capacity))
+                s.alert_active = True
+            except Exception as e:
+                # alert_active stays False, so the next batch above the threshold raises again
+                logger.error(f"[UC3] {self.zone_id}: occupancy alert not raised: {e}", exc_info=True)
+            finally:
+                db.close()
+        for _, _, reply in batch:
+            if reply is not None and not reply.done():
+                reply.set_result(s)
+
+    async def _run(self):
+        while True:
+            batch = [await self.mailbox.get()]
+            while len(batch) < settings.ZONE_ACTOR_BATCH_SIZE and not self.mailbox.empty():
+                batch.append(self.mailbox.get_nowait())
+
+            started = time.perf_counter()
+            try:
+                await self._process(batch)
+            finally:
+                _OCCUPANCY_TIMER.observe(time.perf_counter() - started)
+                for _ in batch:
+                    self.mailbox.task_done()
+
+            # No zone row and nothing queued (e.g. a reset of an unknown zone): retire
+            # instead of idling forever. The next message for the zone starts a new actor.
+            if self.state is None and self.mailbox.empty():
+                self._on_idle(self)
+                return
+
+
+class ZoneActorRegistry:
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.actors: dict[str, ZoneActor] = {}
+
+    def _actor(self, zone_id: str) -> ZoneActor:
+        actor = self.actors.get(zone_id)
+        if actor is None:
+            actor = self.actors[zone_id] = ZoneActor(zone_id, on_idle=self._retire)
+        return actor
+
+    def _retire(self, actor: ZoneActor):
+        if self.actors.get(actor.zone_id) is actor:
+            del self.actors[actor.zone_id]
+
+    def tell_event(self, event: ParsedCameraEvent):
+        """Fire-and-forget: queue an occupancy event for its zone's actor."""
+        self._actor(occupancy_zone_id(event)).mailbox.put_nowait((EVENT, event, None))
+
+    async def ask(self, zone_id: str, kind: str, payload=None) -> Optional[ZoneState]:
+        """Send a message and wait until the actor has applied and written it."""
+        reply = asyncio.get_running_loop().create_future()
+        self._actor(zone_id).mailbox.put_nowait((kind, payload, reply))
+        return await reply
+
+    def mailbox_depths(self) -> dict[str, int]:
+        return {zone_id: a.mailbox.qsize() for zone_id, a in self.actors.items()}
+
+    async def stop(self):
+        """Drain every mailbox, then stop the actors."""
+        await asyncio.gather(*(a.mailbox.join() for a in self.actors.values()))
+        for a in self.actors.values():
+            a.task.cancel()
+        await asyncio.gather(*(a.task for a in self.actors.values()), return_exceptions=True)
+        self.actors.clear()
+
+
+zone_actors = ZoneActorRegistry(enabled=settings.ZONE_ACTORS_ENABLED)
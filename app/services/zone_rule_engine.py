@@ -0,0 +1,197 @@
+# app/services/zone_rule_engine.py
+"""
+UC5 + UC6: Compiled zone rule engine.
+Source: zone_rules table (CRUD via routers/zone_rules.py)
+
+Rules are compiled into a dict keyed by (zone, camera, event_type, target)
+where each field is either a concrete value or "*". An event is matched by
+probing only the wildcard patterns that some rule actually uses (at most 16
+dict lookups, whatever the number of rules), then checking the schedule of
+the few candidates found. The highest-priority active rule per action wins.
+
+The table is seeded with DEFAULT_RULES (the former hardcoded zone sets) when
+empty. Changes are applied by recompiling and swapping the index; other
+workers are told via NOTIFY zone_rules.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, time
+from itertools import product
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.zone_rule import ZoneRule
+from app.services.event_parser import ParsedCameraEvent
+from app.services.pg_notify import notify, pg_listener
+from app.utils.logger import get_logger
+from app.utils.time_utils import to_local, to_naive_utc
+
+logger = get_logger(__name__)
+
+RULES_CHANNEL = "zone_rules"
+ANY = "*"
+NO_REGION = "-"          # zone_id for events that carry no region
+ACTIONS = ("violation", "intrusion")
+
+_TZ = ZoneInfo(settings.LOCAL_TIMEZONE)
+
+# Seeded into zone_rules when the table is empty — mirrors the old module constants
+DEFAULT_RULES = [
+    *({"zone_id": z, "action": "violation", "dwell_seconds": settings.VIOLATION_DWELL_SECONDS.get(z),
+       "description": "Restricted zone"}
+      for z in ("restricted-vip", "no-parking-zone", "emergency-exit", "loading-bay")),
+    {"event_type": "linedetection", "action": "violation", "priority": 10, "description": "Forbidden line crossing"},
+    {"zone_id": "emergency-exit", "action": "intrusion", "description": "Monitored intrusion zone"},
+    {"zone_id": "staff-only-area", "action": "intrusion", "description": "Monitored intrusion zone"},
+    {"zone_id": "after-hours-zone", "action": "intrusion", "start_time": time(18, 0), "end_time": time(6, 0),
+     "description": "After hours only"},
+    {"zone_id": NO_REGION, "action": "intrusion", "description": "Field detection without a region"},
+]
+
+
+def local_now(utc_naive: Optional[datetime] = None) -> datetime:
+    return to_local(utc_naive or datetime.utcnow(), _TZ)
+
+
+def parse_days(days: Optional[str]) -> Optional[frozenset]:
+    if not days:
+        return None
+    return frozenset(int(d) for d in days.split(",") if d.strip())
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    id: Optional[int]
+    action: str
+    zone_id: Optional[str] = None
+    camera_id: Optional[str] = None
+    event_type: Optional[str] = None
+    detection_target: Optional[str] = None
+    days: Optional[frozenset] = None
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+    dwell_seconds: Optional[int] = None
+    priority: int = 0
+    description: Optional[str] = None
+    rank: tuple = field(init=False, repr=False, compare=False)    # (priority, -id): higher wins
+
+    def __post_init__(self):
+        object.__setattr__(self, "rank", (self.priority, -(self.id or 0)))
+
+    @classmethod
+    def from_row(cls, r: ZoneRule) -> "CompiledRule":
+        return cls(r.id, r.action, r.zone_id, r.camera_id, r.event_type, r.detection_target,
+                   parse_days(r.days), r.start_time, r.end_time, r.dwell_seconds, r.priority or 0, r.description)
+
+    @property
+    def always_active(self) -> bool:
+        return self.days is None and (self.start_time is None or self.end_time is None)
+
+    @property
+    def key(self) -> tuple:
+        return (self.zone_id or ANY, self.camera_id or ANY, self.event_type or ANY, self.detection_target or ANY)
+
+    def active_at(self, local: datetime) -> bool:
+        if self.days is not None and local.weekday() not in self.days:
+            return False
+        if self.start_time is None or self.end_time is None:
+            return True
+        t = local.time()
+        if self.start_time < self.end_time:
+            return self.start_time <= t < self.end_time
+        return t >= self.start_time or t < self.end_time      # window wraps past midnight
+
+
+class RuleEngine:
+    def __init__(self, rules: Iterable[CompiledRule] = ()):
+        self.loaded = False
+        self.compile(rules)
+
+    def compile(self, rules: Iterable[CompiledRule]):
+        by_key: dict[tuple, list[CompiledRule]] = {}
+        for rule in rules:
+            by_key.setdefault(rule.key, []).append(rule)
+        # Per key and action, keep rules best-first and cut the list after the first
+        # always-active rule: nothing ranked below it can ever win for that key.
+        index: dict[tuple, list[list[CompiledRule]]] = {}
+        for key, candidates in by_key.items():
+            candidates.sort(key=lambda r: r.rank, reverse=True)
+            chains = []
+            for action in ACTIONS:
+                chain = []
+                for rule in candidates:
+                    if rule.action == action:
+                        chain.append(rule)
+                        if rule.always_active:
+                            break
+                if chain:
+                    chains.append(chain)
+            index[key] = chains
+        masks = sorted({tuple(v == ANY for v in key) for key in by_key})
+        count = sum(len(c) for c in by_key.values())
+        # Swap in one assignment so concurrent evaluate() calls see old or new, never half-built
+        self._compiled = (index, masks, count)
+
+    def __len__(self):
+        return self._compiled[2]
+
+    def evaluate(self, zone_id: str, camera_id: str, event_type: str, target: Optional[str],
+                 at_local: datetime) -> dict[str, CompiledRule]:
+        """The winning rule per action for one detection."""
+        index, masks, _ = self._compiled
+        target = target or ANY
+        winners: dict[str, CompiledRule] = {}
+        for any_zone, any_camera, any_event, any_target in masks:
+            chains = index.get((ANY if any_zone else zone_id, ANY if any_camera else camera_id,
+                                ANY if any_event else event_type, ANY if any_target else target))
+            if not chains:
+                continue
+            for chain in chains:
+                best = winners.get(chain[0].action)
+                for rule in chain:
+                    if best is not None and best.rank >= rule.rank:
+                        break
+                    if rule.active_at(at_local):
+                        winners[rule.action] = rule
+                        break
+        return winners
+
+    def decide(self, event: ParsedCameraEvent, action: str) -> Optional[CompiledRule]:
+        local = to_local(to_naive_utc(event.trigger_time), _TZ)
+        return self.evaluate(event.region_id or NO_REGION, event.camera_id, event.event_type,
+                             event.detection_target, local).get(action)
+
+    def load(self, db: Session):
+        if db.query(ZoneRule).count() == 0:
+            now = datetime.utcnow()
+            db.add_all(ZoneRule(**r, updated_at=now) for r in DEFAULT_RULES)
+            db.commit()
+            logger.info(f"[RULES] Seeded {len(DEFAULT_RULES)} default zone rules")
+        rows = db.query(ZoneRule).filter(ZoneRule.enabled.is_(True)).all()
+        self.compile(CompiledRule.from_row(r) for r in rows)
+        self.loaded = True
+        logger.info(f"[RULES] Compiled {len(self)} zone rules")
+
+
+rule_engine = RuleEngine(CompiledRule(id=None, **r) for r in DEFAULT_RULES)
+
+
+def rules_changed(db: Session, rule_id: int):
+    """Call inside the transaction that changed a rule, before commit."""
+    notify(db, RULES_CHANNEL, rule_id=rule_id)
+
+
+def _on_rules_notify(payload: dict):
+    db = SessionLocal()
+    try:
+        rule_engine.load(db)
+    finally:
+        db.close()
+
+
+def start_zone_rules():
+    """Load (seeding if empty) and compile the rules, then follow changes. Called once at startup."""
+    _on_rules_notify({})
+    pg_listener.subscribe(RULES_CHANNEL, _on_rules_notify, lambda: _on_rules_notify({}))
@@ -0,0 +1,228 @@
+# app/utils/metrics.py
+"""
+In-process metrics in the Prometheus text format, served at /metrics.
+
+Recording is lock-free: a labelled child is looked up once (or cached by the
+caller) and an observation is a bisect over a short bucket list plus two
+in-place additions. Everything runs on the event loop; sync endpoints run in
+threads, where a rare lost increment under contention is accepted rather than
+paying for a lock on every event. Each scrape renders a consistent-enough
+snapshot; cumulative bucket counts are computed at render time.
+
+Gauges (queue depths, DB pool) are read by callbacks at scrape time, so they
+cost nothing between scrapes.
+
+Values are per process: with several uvicorn workers each scrape sees the
+worker that answered it (the `pid` label tells them apart).
+"""
+
+import os
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable, Union
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Latency buckets in seconds: 100µs … 10s
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_PID_LABEL = f'pid="{os.getpid()}"'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_str(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Timer:
+    __slots__ = ("child", "start")
+
+    def __init__(self, child):
+        self.child = child
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)      # last slot: above the largest bound
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def time(self) -> _Timer:
+        """`with child.time():` observes the elapsed seconds of the block."""
+        return _Timer(self)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._children: dict[tuple, object] = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """The child for these label values, created on first use. Cache it for hot paths."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in list(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: tuple, child) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def _render_child(self, values, child):
+        return [f"{self.name}{_label_str(self.labelnames, values, _PID_LABEL)} {_fmt(child.value)}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def time(self) -> _Timer:
+        return self.labels().time()
+
+    def _render_child(self, values, child):
+        counts = list(child.counts)
+        lines, cumulative = [], 0
+        for bound, n in zip(self.buckets + (float("inf"),), counts):
+            cumulative += n
+            le = f'le="{_fmt(bound)}",{_PID_LABEL}'
+            lines.append(f"{self.name}_bucket{_label_str(self.labelnames, values, le)} {cumulative}")
+        labels = _label_str(self.labelnames, values, _PID_LABEL)
+        lines.append(f"{self.name}_sum{labels} {_fmt(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Read at scrape time: `collect()` returns a value, or {label values tuple: value}."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...],
+                 collect: Callable[[], Union[float, dict[tuple, float]]]):
+        super().__init__(name, help, labelnames)
+        self.collect = collect
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        values = self.collect()
+        if not isinstance(values, dict):
+            values = {(): values}
+        for label_values, value in values.items():
+            lines.append(f"{self.name}{_label_str(self.labelnames, label_values, _PID_LABEL)} {_fmt(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: dict[str, _Metric] = {}
+
+    def _add(self, metric: _Metric) -> _Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: tuple[str, ...] = (),
+                  buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, labelnames: tuple[str, ...],
+              collect: Callable[[], Union[float, dict[tuple, float]]]) -> Gauge:
+        return self._add(Gauge(name, help, labelnames, collect))
+
+    def render(self) -> str:
+        """Prometheus text exposition (version 0.0.4). A failing gauge callback is skipped."""
+        lines: list[str] = []
+        for metric in list(self.metrics.values()):
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                logger.warning(f"[METRICS] {metric.name} not rendered: {e}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# ── Application metrics ──
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "damanat_http_request_duration_seconds", "HTTP request handling time", ("method", "route"))
+HTTP_REQUESTS = registry.counter(
+    "damanat_http_requests_total", "HTTP requests by status code", ("method", "route", "status"))
+PIPELINE_STAGE_SECONDS = registry.histogram(
+    "damanat_pipeline_stage_seconds", "Event ingest stage time (parse, persist, dispatch)", ("stage",))
+HANDLER_SECONDS = registry.histogram(
+    "damanat_dispatch_handler_seconds", "Time spent in each dispatcher handler", ("handler",))
+CAMERA_EVENTS = registry.counter(
+    "damanat_camera_events_total", "Parsed camera events", ("camera_id", "event_type"))
@@ -0,0 +1,76 @@
+# app/utils/pagination.py
+"""
+Keyset (cursor) pagination for the list endpoints.
+
+Pages are ordered newest first by (timestamp, id) — or by id alone — and the
+next page starts strictly after the last row of this one:
+
+    WHERE (created_at, id) < (:ts, :id) ORDER BY created_at DESC, id DESC LIMIT :n
+
+With a matching composite index every page is one index range scan, however
+deep, unlike OFFSET which reads and discards all the skipped rows.
+The cursor is opaque to clients: the last row's key, base64-encoded, returned
+in the X-Next-Cursor header (absent on the last page).
+"""
+
+import base64
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(ts: Optional[datetime], row_id: int) -> str:
+    raw = f"{ts.isoformat() if ts else ''}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Optional[datetime], int]:
+    """Inverse of encode_cursor. Raises ValueError on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, row_id = raw.rsplit("|", 1)
+        return (datetime.fromisoformat(ts) if ts else None), int(row_id)
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {cursor!r}") from e
+
+
+def keyset_page(q: Query, id_col, cursor: Optional[str], limit: int, ts_col=None, descending: bool = True) -> Query:
+    """
+    Order `q` by (ts_col, id_col) — or id_col alone — and start after `cursor`.
+    Fetches limit + 1 rows so next_cursor() can tell whether another page exists.
+    Rows with a NULL ts_col are not reachable and should be filtered out by the caller.
+    """
+    cols = (ts_col, id_col) if ts_col is not None else (id_col,)
+    if cursor:
+        ts, row_id = decode_cursor(cursor)
+        key = (ts, row_id) if ts_col is not None else (row_id,)
+        row_key, cursor_key = (tuple_(*cols), tuple_(*key)) if len(cols) > 1 else (cols[0], key[0])
+        q = q.filter(row_key < cursor_key if descending else row_key > cursor_key)
+    order = [c.desc() if descending else c.asc() for c in cols]
+    return q.order_by(*order).limit(limit + 1)
+
+
+def next_cursor(rows: list, limit: int, ts_attr: Optional[str] = None, id_attr: str = "id") -> tuple[list, Optional[str]]:
+    """Trim the extra row fetched by keyset_page; return (page, cursor for the next page or None)."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, ts_attr) if ts_attr else None, getattr(last, id_attr))
+
+
+def paginate(q: Query, response, id_col, cursor: Optional[str], limit: int,
+             ts_col=None, ts_attr: Optional[str] = None, descending: bool = True) -> list:
+    """keyset_page + next_cursor for a router: sets X-Next-Cursor on `response`, 400 on a bad cursor."""
+    from fastapi import HTTPException
+    try:
+        q = keyset_page(q, id_col, cursor, limit, ts_col, descending)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rows, nxt = next_cursor(q.all(), limit, ts_attr)
+    if nxt:
+        response.headers[NEXT_CURSOR_HEADER] = nxt
+    return rows
@@ -0,0 +1,157 @@
+# app/utils/plate_matching.py
+"""
+OCR-tolerant plate matching.
+
+ANPR reads of the same plate differ between cameras ("ABC-1234" vs "A8C1234").
+Matching works in two layers:
+
+1. canonical_plate() — uppercase, drop separators, and fold characters OCR
+   confuses into one class (O/Q/D→0, I/L→1, Z→2, S→5, G→6, B→8). Reads that
+   differ only by confusables get the same key: an O(1) dict hit.
+2. PlateIndex.nearest() — remaining differences (a missed or extra character,
+   a genuinely wrong glyph) are found with a symmetric-delete index: every key
+   is stored under all its variants with up to `max_distance` characters
+   deleted, so a query only generates its own deletion variants and probes the
+   dict. Candidates are verified with a bounded Levenshtein distance.
+
+Scores: Levenshtein distance between canonical keys, plus CONFUSABLE_PENALTY
+when the normalized reads differ (so an exact read always ranks first).
+"""
+
+import re
+from itertools import combinations
+from typing import Iterable, Optional
+
+CONFUSABLES = str.maketrans({
+    "O": "0", "Q": "0", "D": "0",
+    "I": "1", "L": "1",
+    "Z": "2",
+    "S": "5",
+    "G": "6",
+    "B": "8",
+})
+CONFUSABLE_PENALTY = 0.25
+
+_SEPARATORS = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_plate(plate: str) -> str:
+    """Uppercase and strip spaces, dashes and other separators."""
+    return _SEPARATORS.sub("", plate or "").upper()
+
+
+def plate_search_key(column):
+    """SQL counterpart of normalize_plate() — the expression the trigram plate indexes are built on."""
+    from sqlalchemy import func
+    return func.regexp_replace(func.upper(column), "[^[:alnum:]]+", "", "g")
+
+
+def canonical_plate(plate: str) -> str:
+    """normalize_plate() with OCR-confusable characters folded together."""
+    return normalize_plate(plate).translate(CONFUSABLES)
+
+
+def bounded_levenshtein(a: str, b: str, limit: int) -> Optional[int]:
+    """Levenshtein distance if <= limit, else None. Stops early outside the band."""
+    if abs(len(a) - len(b)) > limit:
+        return None
+    if a == b:
+        return 0
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            row_min = min(row_min, cur[j])
+        if row_min > limit:
+            return None
+        prev = cur
+    return prev[-1] if prev[-1] <= limit else None
+
+
+def _deletions(key: str, max_distance: int) -> set[str]:
+    variants = {key}
+    for n in range(1, min(max_distance, len(key)) + 1):
+        for idx in combinations(range(len(key)), n):
+            skip = set(idx)
+            variants.add("".join(c for i, c in enumerate(key) if i not in skip))
+    return variants
+
+
+class PlateIndex:
+    """Approximate plate lookup over a changing set of plates."""
+
+    def __init__(self, max_distance: int = 1):
+        self.max_distance = max_distance
+        self._plates: dict[str, set[str]] = {}      # canonical key → original plates
+        self._deletes: dict[str, set[str]] = {}     # deletion variant → canonical keys
+
+    def __len__(self):
+        return sum(len(p) for p in self._plates.values())
+
+    def __contains__(self, plate: str):
+        return plate in self._plates.get(canonical_plate(plate), ())
+
+    def add(self, plate: str):
+        key = canonical_plate(plate)
+        if not key:
+            return
+        if key not in self._plates:
+            self._plates[key] = set()
+            for v in _deletions(key, self.max_distance):
+                self._deletes.setdefault(v, set()).add(key)
+        self._plates[key].add(plate)
+
+    def remove(self, plate: str):
+        key = canonical_plate(plate)
+        plates = self._plates.get(key)
+        if not plates or plate not in plates:
+            return
+        plates.discard(plate)
+        if not plates:
+            del self._plates[key]
+            for v in _deletions(key, self.max_distance):
+                keys = self._deletes.get(v)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._deletes[v]
+
+    def rebuild(self, plates: Iterable[str]):
+        self._plates.clear()
+        self._deletes.clear()
+        for p in plates:
+            self.add(p)
+
+    def nearest(self, plate: str, max_distance: int = 1, limit: int = 5) -> list[tuple[str, float]]:
+        """Closest plates as (plate, score), best first. max_distance is capped at the index's."""
+        max_distance = min(max_distance, self.max_distance)
+        key = canonical_plate(plate)
+        if not key:
+            return []
+        norm = normalize_plate(plate)
+
+        candidates: set[str] = set()
+        for v in _deletions(key, max_distance):
+            candidates |= self._deletes.get(v, set())
+
+        results = []
+        for cand in candidates:
+            dist = bounded_levenshtein(key, cand, max_distance)
+            if dist is None:
+                continue
+            for original in self._plates[cand]:
+                score = dist + (0 if normalize_plate(original) == norm else CONFUSABLE_PENALTY)
+                results.append((original, score))
+        results.sort(key=lambda r: (r[1], r[0]))
+        return results[:limit]
+
+    def best_match(self, plate: str, max_distance: int = 1) -> Optional[str]:
+        """The single closest plate, or None if nothing is close enough or the best is ambiguous."""
+        matches = self.nearest(plate, max_distance, limit=2)
+        if not matches:
+            return None
+        if len(matches) == 2 and matches[0][1] == matches[1][1]:
+            return None
+        return matches[0][0]
@@ -0,0 +1,145 @@
+# app/utils/sketches.py
+"""
+Mergeable streaming sketches for parking analytics.
+
+TDigest      — quantiles (p50/p90/p99 parking duration) in a few KB, accurate
+               at the tails. Merging two digests equals digesting both streams.
+HyperLogLog  — distinct counts (unique plates) in 2^p bytes, ~1.04/sqrt(2^p)
+               relative error (1.6% at p=12). Merge is a register-wise max.
+
+Both serialize to bytes so per-day sketches can be stored in the DB and
+merged at query time for any date range.
+"""
+
+import hashlib
+import json
+import math
+from typing import Optional
+
+
+class TDigest:
+    """Merging t-digest (Dunning) with the k1 scale-function size bound."""
+
+    def __init__(self, compression: float = 100):
+        self.compression = compression
+        self._means: list[float] = []
+        self._weights: list[float] = []
+        self._buffer: list[tuple[float, float]] = []
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float, w: float = 1.0):
+        self._buffer.append((float(x), w))
+        self.count += w
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def merge(self, other: "TDigest"):
+        other._compress()
+        self._buffer.extend(zip(other._means, other._weights))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        items = sorted(list(zip(self._means, self._weights)) + self._buffer)
+        self._buffer = []
+        total = self.count
+        means, weights = [], []
+        cur_mean, cur_w = items[0]
+        w_so_far = 0.0
+        for mean, w in items[1:]:
+            proposed = cur_w + w
+            q = (w_so_far + proposed / 2) / total
+            if proposed <= max(1.0, 4 * total * q * (1 - q) / self.compression):
+                cur_mean += (mean - cur_mean) * w / proposed
+                cur_w = proposed
+            else:
+                means.append(cur_mean)
+                weights.append(cur_w)
+                w_so_far += cur_w
+                cur_mean, cur_w = mean, w
+        means.append(cur_mean)
+        weights.append(cur_w)
+        self._means, self._weights = means, weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile q (0..1), or None if empty."""
+        self._compress()
+        if not self._means:
+            return None
+        if len(self._means) == 1:
+            return self._means[0]
+        target = q * self.count
+        # Centroid i is centred at cumulative weight cum_i + w_i/2
+        cum = 0.0
+        prev_center, prev_mean = 0.0, self.min
+        for mean, w in zip(self._means, self._weights):
+            center = cum + w / 2
+            if target < center:
+                frac = (target - prev_center) / (center - prev_center) if center > prev_center else 0
+                return prev_mean + frac * (mean - prev_mean)
+            prev_center, prev_mean = center, mean
+            cum += w
+        frac = (target - prev_center) / (self.count - prev_center) if self.count > prev_center else 0
+        return prev_mean + frac * (self.max - prev_mean)
+
+    def to_bytes(self) -> bytes:
+        self._compress()
+        return json.dumps({
+            "compression": self.compression, "means": self._means, "weights": self._weights,
+            "count": self.count, "min": self.min if self.count else None, "max": self.max if self.count else None,
+        }).encode()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TDigest":
+        d = json.loads(data)
+        td = cls(d["compression"])
+        td._means, td._weights, td.count = d["means"], d["weights"], d["count"]
+        if td.count:
+            td.min, td.max = d["min"], d["max"]
+        return td
+
+
+class HyperLogLog:
+    def __init__(self, precision: int = 12):
+        self.p = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    def add(self, value: str):
+        # Stable across processes (unlike hash()), so sketches from different workers merge
+        h = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+        idx = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        if other.p != self.p:
+            raise ValueError(f"Cannot merge HyperLogLog p={other.p} into p={self.p}")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            estimate = self.m * math.log(self.m / zeros)     # linear counting for small sets
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        return bytes([self.p]) + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        hll = cls(data[0])
+        hll.registers = bytearray(data[1:])
+        return hll
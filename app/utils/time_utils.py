@@ -0,0 +1,30 @@
+# app/utils/time_utils.py
+"""
+Datetime helpers.
+DB columns are naive UTC (datetime.utcnow() everywhere); camera trigger times
+may arrive timezone-aware ("...Z" or "+03:00") and must be normalized first.
+"""
+
+from datetime import date, datetime, time, timezone
+from zoneinfo import ZoneInfo
+
+
+def to_naive_utc(dt: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC. Naive input is assumed to be UTC already."""
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_local(utc_naive: datetime, tz: ZoneInfo) -> datetime:
+    """Naive UTC (as stored) → aware local time."""
+    return utc_naive.replace(tzinfo=timezone.utc).astimezone(tz)
+
+
+def local_date(utc_naive: datetime, tz: ZoneInfo) -> date:
+    return to_local(utc_naive, tz).date()
+
+
+def local_midnight_utc(day: date, tz: ZoneInfo) -> datetime:
+    """Start of a local day as naive UTC, for range filters on event_time."""
+    return datetime.combine(day, time.min, tzinfo=tz).astimezone(timezone.utc).replace(tzinfo=None)
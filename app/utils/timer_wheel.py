@@ -0,0 +1,104 @@
+# app/utils/timer_wheel.py
+"""
+Hierarchical timer wheel (Varghese & Lauck) for large numbers of long-lived
+deadlines — e.g. one per open parking session.
+
+Time is discretized into ticks of `tick_seconds`. Level 0 has SLOTS slots of
+one tick each; level i has SLOTS slots of SLOTS^i ticks each. A timer sits in
+the lowest level whose span covers its remaining delay. When a lower level
+wraps, the matching slot of the level above is cascaded down. Schedule and
+cancel are O(1); advancing one tick touches one slot per level. Timers are
+keyed, so re-scheduling a key replaces its previous deadline.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional
+
+SLOTS = 64
+
+
+@dataclass
+class _Timer:
+    key: Hashable
+    tick: int
+    payload: Any
+    level: int = 0
+    slot: int = 0
+
+
+class TimerWheel:
+    def __init__(self, tick_seconds: float = 1.0, levels: int = 4, start: float = 0.0):
+        self.tick_seconds = tick_seconds
+        self.levels = levels
+        self._wheels: list[list[dict]] = [[{} for _ in range(SLOTS)] for _ in range(levels)]
+        self._timers: dict[Hashable, _Timer] = {}
+        self._now = self._to_tick(start)
+
+    def _to_tick(self, t: float) -> int:
+        return int(t // self.tick_seconds)
+
+    def __len__(self):
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable):
+        return key in self._timers
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        t = self._timers.get(key)
+        return t.tick * self.tick_seconds if t else None
+
+    def _place(self, timer: _Timer):
+        delay = timer.tick - self._now
+        for level in range(self.levels):
+            if delay < SLOTS ** (level + 1):
+                timer.level, timer.slot = level, (timer.tick // SLOTS ** level) % SLOTS
+                break
+        else:
+            # Beyond the top level's span: park in the top slot passed last; re-placed when it comes round again
+            timer.level = self.levels - 1
+            timer.slot = (self._now // SLOTS ** timer.level) % SLOTS
+        self._wheels[timer.level][timer.slot][timer.key] = timer
+
+    def schedule(self, key: Hashable, deadline: float, payload: Any = None):
+        """Arm (or re-arm) `key` to fire at `deadline` (same clock as advance())."""
+        self.cancel(key)
+        timer = _Timer(key, max(self._to_tick(deadline), self._now + 1), payload)
+        self._timers[key] = timer
+        self._place(timer)
+
+    def cancel(self, key: Hashable) -> bool:
+        timer = self._timers.pop(key, None)
+        if timer is None:
+            return False
+        self._wheels[timer.level][timer.slot].pop(key, None)
+        return True
+
+    def clear(self):
+        for wheel in self._wheels:
+            for slot in wheel:
+                slot.clear()
+        self._timers.clear()
+
+    def advance(self, now: float) -> list[tuple[Hashable, Any]]:
+        """Move time forward to `now`; return (key, payload) for every timer that expired, in deadline order."""
+        target = self._to_tick(now)
+        fired: list[tuple[Hashable, Any]] = []
+        while self._now < target:
+            if not self._timers:
+                self._now = target          # nothing armed: jump straight there
+                break
+            self._now += 1
+            for level in range(self.levels - 1, 0, -1):
+                if self._now % SLOTS ** level == 0:
+                    slot = self._wheels[level][(self._now // SLOTS ** level) % SLOTS]
+                    timers = list(slot.values())
+                    slot.clear()
+                    for t in timers:
+                        self._place(t)
+            slot = self._wheels[0][self._now % SLOTS]
+            due = [t for t in slot.values() if t.tick <= self._now]
+            for t in due:
+                del slot[t.key]
+                del self._timers[t.key]
+                fired.append((t.key, t.payload))
+        return fired
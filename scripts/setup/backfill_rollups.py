@@ -0,0 +1,60 @@
+# scripts/setup/backfill_rollups.py
+"""
+Rebuild parking_rollups and parking_sketches from entry_exit_log history.
+Run once after upgrading, or to repair a date range. Safe to re-run.
+Rollups can be rebuilt while the backend is live (gate events wait while a
+chunk is being rebuilt); sketches cannot — each worker's unflushed deltas would
+be counted twice — so stop the backend first, or pass --no-sketches.
+Usage: python scripts/setup/backfill_rollups.py [--start 2026-01-01] [--end 2026-03-01] [--no-sketches]
+"""
+
+import argparse
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from datetime import date, timedelta
+from sqlalchemy import func
+from app.database import SessionLocal, create_tables
+from app.models.entry_exit_log import EntryExitLog
+from app.services.parking_rollups import backfill_rollups, local_today
+from app.services.parking_sketches import backfill_sketches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill parking_rollups and parking_sketches from entry_exit_log")
+    parser.add_argument("--start", type=date.fromisoformat, help="First local date (default: oldest event)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Last local date (default: today)")
+    parser.add_argument("--chunk-days", type=int, default=31, help="Days per transaction")
+    parser.add_argument("--no-sketches", action="store_true",
+                        help="Rebuild rollups only (safe while the backend is running)")
+    args = parser.parse_args()
+
+    create_tables()
+    db = SessionLocal()
+    try:
+        start = args.start
+        if start is None:
+            oldest = db.query(func.min(EntryExitLog.event_time)).scalar()
+            if oldest is None:
+                print("ℹ️  entry_exit_log is empty — nothing to backfill")
+                return
+            start = oldest.date() - timedelta(days=1)   # covers the UTC → local date shift
+        end = args.end or local_today()
+
+        total = 0
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(end, chunk_start + timedelta(days=args.chunk_days - 1))
+            total += backfill_rollups(db, chunk_start, chunk_end)
+            if not args.no_sketches:
+                backfill_sketches(db, chunk_start, chunk_end)
+            print(f"✅ {chunk_start} → {chunk_end}")
+            chunk_start = chunk_end + timedelta(days=1)
+        print(f"🎉 Backfill done: {total} hourly buckets")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
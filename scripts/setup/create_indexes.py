@@ -0,0 +1,31 @@
+# scripts/setup/create_indexes.py
+"""
+Build model indexes missing from an existing database with CREATE INDEX
+CONCURRENTLY, then drop the single-column indexes they replace. Writes keep
+flowing while it runs, so it is safe against the live backend. The backend
+itself only builds missing indexes on small tables at startup.
+Run after upgrading; safe to re-run (an interrupted build is redone).
+Usage: python scripts/setup/create_indexes.py
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from app.database import build_indexes_concurrently, create_tables, installed_extensions, SCHEMA_EXTENSIONS
+
+
+def main():
+    create_tables()
+    for name in SCHEMA_EXTENSIONS:
+        if name not in installed_extensions:
+            print(f"⚠️  Extension {name} unavailable — indexes that need it are skipped")
+    print("📋 Building missing indexes (CONCURRENTLY, may take a while on large tables)...")
+    built = build_indexes_concurrently()
+    for name in built:
+        print(f"✅ {name}")
+    print(f"🎉 Indexes up to date: {len(built)} built")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# scripts/test/bench_pagination.py
+"""
+Benchmark OFFSET vs keyset pagination of the camera event log on a large table.
+
+Builds a scratch copy of camera_events (default 2M rows) with the same
+composite indexes, then fetches one 50-row page at increasing depths both ways.
+Needs the configured PostgreSQL (DATABASE_URL). The scratch table is dropped
+at the end unless --keep is given.
+
+Usage: python scripts/test/bench_pagination.py --rows 2000000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from sqlalchemy import text
+from app.database import engine
+
+TABLE = "bench_camera_events"
+PAGE = 50
+
+
+def build(conn, rows: int):
+    print(f"Building {TABLE} with {rows:,} rows...")
+    conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    conn.execute(text(f"""
+        CREATE TABLE {TABLE} AS
+        SELECT g AS id,
+               'CAM-' || lpad((g % 40)::text, 2, '0') AS camera_id,
+               (ARRAY['fielddetection','linedetection','regionEntrance','regionExiting','VMD'])[1 + g % 5] AS event_type,
+               'active' AS event_state,
+               repeat('x', 1500) AS raw_payload,
+               timestamp '2025-01-01' + g * interval '2 seconds' AS created_at
+        FROM generate_series(1, :rows) AS g
+    """), {"rows": rows})
+    conn.execute(text(f"CREATE INDEX ON {TABLE} (created_at, id)"))
+    conn.execute(text(f"CREATE INDEX ON {TABLE} (camera_id, created_at, id)"))
+    conn.execute(text(f"ANALYZE {TABLE}"))
+
+
+def timed(conn, sql: str, params: dict, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        conn.execute(text(sql), params).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch table")
+    args = parser.parse_args()
+
+    cols = "id, camera_id, event_type, event_state, created_at"     # lean: no raw_payload
+    with engine.connect() as conn:
+        build(conn, args.rows)
+        conn.commit()
+
+        depths = [d for d in (0, 10_000, 100_000, 1_000_000, args.rows - PAGE) if d <= args.rows - PAGE]
+        print(f"\n{'depth':>10} | {'OFFSET ms':>10} | {'keyset ms':>10} | {'cam OFFSET':>10} | {'cam keyset':>10}")
+        for depth in depths:
+            offset_ms = timed(conn, f"SELECT {cols} FROM {TABLE} ORDER BY created_at DESC, id DESC "
+                                    f"LIMIT {PAGE} OFFSET :off", {"off": depth}, args.runs)
+            # The cursor a client would hold at this depth: the last row of the previous page
+            cur = conn.execute(text(f"SELECT created_at, id FROM {TABLE} ORDER BY created_at DESC, id DESC "
+                                    f"LIMIT 1 OFFSET :off"), {"off": max(depth - 1, 0)}).one()
+            keyset_ms = timed(conn, f"SELECT {cols} FROM {TABLE} WHERE (created_at, id) < (:ts, :id) "
+                                    f"ORDER BY created_at DESC, id DESC LIMIT {PAGE}",
+                              {"ts": cur.created_at, "id": cur.id}, args.runs)
+
+            cam_depth = depth // 40
+            cam_offset_ms = timed(conn, f"SELECT {cols} FROM {TABLE} WHERE camera_id = 'CAM-07' "
+                                        f"ORDER BY created_at DESC, id DESC LIMIT {PAGE} OFFSET :off",
+                                  {"off": cam_depth}, args.runs)
+            cam_cur = conn.execute(text(f"SELECT created_at, id FROM {TABLE} WHERE camera_id = 'CAM-07' "
+                                        f"ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET :off"),
+                                   {"off": max(cam_depth - 1, 0)}).one()
+            cam_keyset_ms = timed(conn, f"SELECT {cols} FROM {TABLE} WHERE camera_id = 'CAM-07' "
+                                        f"AND (created_at, id) < (:ts, :id) "
+                                        f"ORDER BY created_at DESC, id DESC LIMIT {PAGE}",
+                                  {"ts": cam_cur.created_at, "id": cam_cur.id}, args.runs)
+            print(f"{depth:>10,} | {offset_ms:>10.2f} | {keyset_ms:>10.2f} | {cam_offset_ms:>10.2f} | {cam_keyset_ms:>10.2f}")
+
+        if not args.keep:
+            conn.execute(text(f"DROP TABLE {TABLE}"))
+            conn.commit()
+
+
+if __name__ == "__main__":
+    main()
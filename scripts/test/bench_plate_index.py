@@ -0,0 +1,71 @@
+# scripts/test/bench_plate_index.py
+"""Benchmark PlateIndex nearest-plate queries over a synthetic plate set."""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from app.utils.plate_matching import PlateIndex
+
+
+def random_plate(rng: random.Random) -> str:
+    letters = "".join(rng.choices(string.ascii_uppercase, k=3))
+    digits = "".join(rng.choices(string.digits, k=4))
+    return f"{letters}-{digits}"
+
+
+def misread(plate: str, rng: random.Random) -> str:
+    """One OCR-style error: substitution, drop, or stray character."""
+    chars = list(plate.replace("-", ""))
+    i = rng.randrange(len(chars))
+    op = rng.choice(("sub", "drop", "insert"))
+    if op == "sub":
+        chars[i] = rng.choice(string.ascii_uppercase + string.digits)
+    elif op == "drop":
+        del chars[i]
+    else:
+        chars.insert(i, rng.choice(string.ascii_uppercase + string.digits))
+    return "".join(chars)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fuzzy plate lookups")
+    parser.add_argument("--plates", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--max-distance", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    plates = list({random_plate(rng) for _ in range(args.plates)})
+
+    idx = PlateIndex(max_distance=args.max_distance)
+    t0 = time.perf_counter()
+    idx.rebuild(plates)
+    build_s = time.perf_counter() - t0
+
+    queries = [misread(rng.choice(plates), rng) for _ in range(args.queries)]
+    timings = []
+    hits = 0
+    for q in queries:
+        t0 = time.perf_counter()
+        if idx.nearest(q, args.max_distance):
+            hits += 1
+        timings.append(time.perf_counter() - t0)
+    timings.sort()
+
+    def pct(p):
+        return timings[min(len(timings) - 1, int(p / 100 * len(timings)))] * 1000
+
+    print(f"Plates: {len(plates)}  build: {build_s:.2f}s  max_distance: {args.max_distance}")
+    print(f"Queries: {len(queries)}  hit rate: {hits / len(queries):.1%}")
+    print(f"Latency ms  p50={pct(50):.3f}  p99={pct(99):.3f}  max={timings[-1] * 1000:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# scripts/test/bench_plate_search.py
+"""
+Benchmark partial plate search on a large gate log, with and without the trigram index.
+
+Builds a scratch copy of entry_exit_log (default 3M rows over 200k distinct
+plates), then runs the plate_search substring query for a few partial plates
+as a sequential scan and through the pg_trgm GIN index.
+Needs the configured PostgreSQL (DATABASE_URL) with pg_trgm available. The
+scratch table is dropped at the end unless --keep is given.
+
+Usage: python scripts/test/bench_plate_search.py --rows 3000000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from sqlalchemy import text
+from app.database import create_extensions, engine
+
+TABLE = "bench_entry_exit_log"
+KEY = "regexp_replace(upper(plate_number), '[^[:alnum:]]+', '', 'g')"
+QUERY = f"""
+    SELECT plate_number, count(*), max(event_time) AS last_seen, similarity({KEY}, :q) AS score
+    FROM {TABLE} WHERE {KEY} LIKE :pattern
+    GROUP BY plate_number ORDER BY score DESC, last_seen DESC LIMIT 20
+"""
+
+
+def build(conn, rows: int, plates: int):
+    print(f"Building {TABLE} with {rows:,} rows over {plates:,} plates...")
+    conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    conn.execute(text(f"""
+        CREATE TABLE {TABLE} AS
+        SELECT g AS id,
+               chr(65 + (p % 26)) || chr(65 + (p / 26 % 26)) || chr(65 + (p / 676 % 26))
+                   || '-' || lpad((p % 10000)::text, 4, '0') AS plate_number,
+               CASE WHEN g % 2 = 0 THEN 'entry' ELSE 'exit' END AS gate,
+               timestamp '2025-01-01' + g * interval '10 seconds' AS event_time
+        FROM generate_series(1, :rows) AS g, LATERAL (SELECT ((g::bigint * 7919) % :plates)::int AS p) s
+    """), {"rows": rows, "plates": plates})
+    conn.execute(text(f"ANALYZE {TABLE}"))
+
+
+def timed(conn, q: str, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        conn.execute(text(QUERY), {"q": q, "pattern": f"%{q}%"}).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--plates", type=int, default=200_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch table")
+    args = parser.parse_args()
+
+    create_extensions()
+    queries = ["1234", "ABC1", "C-12", "XYZ0042"]
+    with engine.connect() as conn:
+        build(conn, args.rows, args.plates)
+        conn.commit()
+        scan = {q: timed(conn, q.replace("-", ""), args.runs) for q in queries}
+
+        print("Creating trigram index...")
+        start = time.perf_counter()
+        conn.execute(text(f"CREATE INDEX ON {TABLE} USING gin (({KEY}) gin_trgm_ops)"))
+        conn.execute(text(f"ANALYZE {TABLE}"))
+        conn.commit()
+        print(f"  built in {time.perf_counter() - start:.1f}s")
+        indexed = {q: timed(conn, q.replace("-", ""), args.runs) for q in queries}
+
+        print(f"\n{'query':>10} | {'seq scan ms':>12} | {'trigram ms':>12}")
+        for q in queries:
+            print(f"{q:>10} | {scan[q]:>12.2f} | {indexed[q]:>12.2f}")
+
+        if not args.keep:
+            conn.execute(text(f"DROP TABLE {TABLE}"))
+            conn.commit()
+
+
+if __name__ == "__main__":
+    main()
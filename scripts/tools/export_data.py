@@ -0,0 +1,46 @@
+# scripts/tools/export_data.py
+"""
+Export camera_events, alerts or entry_exit_log to a CSV, NDJSON or Parquet file.
+Streams from a server-side cursor, so memory stays flat for any date range.
+Usage: python scripts/tools/export_data.py events --format ndjson --start 2026-01-01 --end 2026-04-01 -o events.ndjson
+"""
+
+import argparse
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from datetime import datetime
+from app.services.export_service import DATASETS, FORMATS, ExportFilter, parquet_available, stream_export
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a table for audits")
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("--start", type=datetime.fromisoformat, help="Inclusive, UTC unless an offset is given")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="Exclusive")
+    parser.add_argument("--camera", help="camera_id")
+    parser.add_argument("--type", help="event_type (events), alert_type (alerts) or gate (entry-exit)")
+    parser.add_argument("--include-raw", action="store_true", help="Include raw_payload (events)")
+    parser.add_argument("--chunk-rows", type=int, help="Rows per cursor fetch (default EXPORT_CHUNK_ROWS)")
+    parser.add_argument("-o", "--output", default="-", help="Output file (default stdout)")
+    args = parser.parse_args()
+
+    if args.format == "parquet" and not parquet_available():
+        sys.exit("❌ Parquet export needs pyarrow (pip install pyarrow)")
+
+    f = ExportFilter(start=args.start, end=args.end, camera_id=args.camera, event_type=args.type,
+                     include_raw=args.include_raw)
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        for chunk in stream_export(args.dataset, args.format, f, args.chunk_rows):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+            print(f"✅ Wrote {args.output} ({os.path.getsize(args.output):,} bytes)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
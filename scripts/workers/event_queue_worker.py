@@ -0,0 +1,37 @@
+# scripts/workers/event_queue_worker.py
+"""
+Standalone event queue worker — processes events enqueued by ingest nodes
+running with EVENT_INGEST_MODE=queue. Run as many copies as needed, on any host
+that can reach PostgreSQL; workers never block each other (SKIP LOCKED).
+
+Usage: python scripts/workers/event_queue_worker.py --concurrency 4
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import argparse
+import asyncio
+
+from app.database import create_tables
+from app.services.event_queue import run_queue_worker
+from app.utils.logger import get_logger
+
+logger = get_logger("event_queue_worker")
+
+
+async def main(concurrency: int):
+    create_tables()
+    logger.info(f"📬 Event queue worker starting with {concurrency} tasks")
+    await asyncio.gather(*(run_queue_worker(f"queue-worker-{i}") for i in range(concurrency)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Damanat event queue worker")
+    parser.add_argument("--concurrency", type=int, default=1, help="Worker tasks in this process")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.concurrency))
+    except KeyboardInterrupt:
+        logger.info("🛑 Event queue worker stopped")
@@ -0,0 +1,177 @@
+# tests/test_alert_sink.py
+"""Unit tests for the batched alert sink and notifier fan-out."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import asyncio
+import json
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+from app.services import alert_service, notifiers
+from app.services.alert_service import AlertSink, AlertRecord, create_alert
+from app.services.notifiers import Notifier, NotifierWorker
+
+
+def make_alert(zone_id="Z1", alert_type="violation"):
+    return AlertRecord(alert_type, "CAM-1", zone_id, "fielddetection", f"alert in {zone_id}")
+
+
+class FlakyNotifier(Notifier):
+    name = "flaky"
+
+    def __init__(self, failures=0, delay=0.0):
+        self.failures = failures
+        self.delay = delay
+        self.sent = []
+
+    async def send(self, alert):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("endpoint down")
+        self.sent.append(alert)
+
+
+class TestAlertSink:
+    @pytest.mark.asyncio
+    async def test_batches_alerts_into_one_commit(self):
+        sink = AlertSink(batch_size=50, flush_seconds=0.05, queue_size=100)
+        writes = []
+        sink._write = lambda batch: writes.append(list(batch))
+        sink.start()
+        for i in range(10):
+            assert sink.put(make_alert(f"Z{i}"))
+        await sink.stop()
+        assert len(writes) == 1 and len(writes[0]) == 10
+        assert sink.written == 10
+
+    @pytest.mark.asyncio
+    async def test_batch_size_caps_each_write(self):
+        sink = AlertSink(batch_size=4, flush_seconds=0.05, queue_size=100)
+        writes = []
+        sink._write = lambda batch: writes.append(len(batch))
+        sink.start()
+        for i in range(10):
+            sink.put(make_alert(f"Z{i}"))
+        await sink.stop()
+        assert writes == [4, 4, 2]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_falls_back_to_row_by_row(self):
+        sink = AlertSink(batch_size=10, flush_seconds=0.01, queue_size=100)
+        written = []
+
+        def write(batch):
+            if len(batch) > 1 or batch[0].zone_id == "BAD":
+                raise ValueError("constraint")
+            written.append(batch[0].zone_id)
+        sink._write = write
+        sink.start()
+        for zone in ("A", "BAD", "C"):
+            sink.put(make_alert(zone))
+        await sink.stop()
+        assert written == ["A", "C"]
+
+    @pytest.mark.asyncio
+    async def test_dropped_alert_is_not_announced(self):
+        sink = AlertSink(batch_size=10, flush_seconds=0.01, queue_size=100)
+
+        def write(batch):
+            for alert in batch:
+                alert.id = 1                 # ids are filled in before the commit fails
+            if len(batch) > 1 or batch[0].zone_id == "BAD":
+                raise ValueError("constraint")
+        sink._write = write
+        sink.start()
+        for zone in ("A", "BAD"):
+            sink.put(make_alert(zone))
+        with patch.object(alert_service, "announce") as announce:
+            await sink.stop()
+        assert [c.args[0].zone_id for c in announce.call_args_list] == ["A"]
+        assert sink.written == 1 and not sink.pending("violation", "BAD")
+
+    @pytest.mark.asyncio
+    async def test_create_alert_enqueues_without_touching_db(self):
+        sink = AlertSink(batch_size=10, flush_seconds=0.01, queue_size=100)
+        sink._write = MagicMock()
+        db = MagicMock()
+        with patch.object(alert_service, "alert_sink", sink):
+            sink.start()
+            await create_alert(db, "intrusion", "CAM-1", "Z1", "fielddetection", "desc")
+            assert sink.raised_since("intrusion", "Z1", datetime.utcnow() - timedelta(seconds=5))
+            await sink.stop()
+        db.add_all.assert_not_called()
+        db.commit.assert_not_called()
+        sink._write.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_create_alert_writes_inline_when_queue_full(self):
+        sink = AlertSink(batch_size=10, flush_seconds=0.01, queue_size=1)
+        sink._write = MagicMock()
+        db = MagicMock()
+        with patch.object(alert_service, "alert_sink", sink):
+            sink.start()
+            sink.queue.put_nowait(make_alert())       # fill the queue before the writer runs
+            await create_alert(db, "intrusion", "CAM-1", "Z2", "fielddetection", "desc")
+            await sink.stop()
+        db.add_all.assert_called_once()
+        db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_pending_until_written(self):
+        sink = AlertSink(batch_size=10, flush_seconds=0.01, queue_size=100)
+        sink._write = MagicMock()
+        sink.start()
+        sink.put(make_alert("Z1", "occupancy_full"))
+        assert sink.pending("occupancy_full", "Z1") and not sink.pending("occupancy_full", "Z2")
+        await asyncio.wait_for(sink.wait_written("occupancy_full", "Z1"), timeout=1)
+        assert not sink.pending("occupancy_full", "Z1")
+        sink._write.assert_called_once()
+        await sink.stop()
+
+    def test_raised_since_is_off_without_sink(self):
+        sink = AlertSink(batch_size=10, flush_seconds=0.01, queue_size=10)
+        sink.note(make_alert())
+        assert not sink.raised_since("violation", "Z1", datetime.utcnow() - timedelta(hours=1))
+
+
+class TestNotifierWorker:
+    @pytest.mark.asyncio
+    async def test_retries_with_backoff_then_delivers(self):
+        notifier = FlakyNotifier(failures=2)
+        worker = NotifierWorker(notifier, queue_size=10, max_attempts=5, backoff_seconds=0.001)
+        worker.start()
+        worker.publish(make_alert())
+        await worker.stop()
+        assert len(notifier.sent) == 1
+        assert worker.stats()["sent"] == 1
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_go_to_dead_letter(self, tmp_path):
+        path = tmp_path / "dead.jsonl"
+        worker = NotifierWorker(FlakyNotifier(failures=99), queue_size=10, max_attempts=3, backoff_seconds=0.001)
+        with patch.object(notifiers, "DEAD_LETTER_PATH", str(path)):
+            worker.start()
+            worker.publish(make_alert("Z9"))
+            await worker.stop()
+        entry = json.loads(path.read_text().strip())
+        assert entry["notifier"] == "flaky"
+        assert entry["alert"]["zone_id"] == "Z9"
+        assert "endpoint down" in entry["reason"]
+        assert worker.failed == 1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_never_blocks_publisher(self, tmp_path):
+        path = tmp_path / "dead.jsonl"
+        worker = NotifierWorker(FlakyNotifier(delay=10), queue_size=2, max_attempts=1, backoff_seconds=0.001)
+        with patch.object(notifiers, "DEAD_LETTER_PATH", str(path)):
+            for i in range(5):
+                worker.publish(make_alert(f"Z{i}"))       # no worker task: queue fills
+        assert worker.queue.qsize() == 2
+        lines = path.read_text().strip().splitlines()
+        assert len(lines) == 3
+        assert all(json.loads(l)["reason"] == "queue full" for l in lines)
@@ -0,0 +1,57 @@
+# tests/test_camera_health.py
+"""Unit tests for the background camera health monitor."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+import pytest
+from unittest.mock import patch
+from app.services.camera_health import CameraHealthMonitor
+
+CAMERAS = {
+    "CAM-A": {"ip": "10.0.0.1", "user": "u", "password": "p"},
+    "CAM-B": {"ip": "10.0.0.2", "user": "u", "password": "p"},
+}
+
+
+def transport(request: httpx.Request):
+    if request.url.host == "10.0.0.2":
+        raise httpx.ConnectError("refused", request=request)
+    return httpx.Response(200, text="<DeviceInfo/>")
+
+
+class TestCameraHealthMonitor:
+    @pytest.mark.asyncio
+    async def test_probe_records_status_and_latency(self):
+        monitor = CameraHealthMonitor(interval=30, timeout=1)
+        async with httpx.AsyncClient(transport=httpx.MockTransport(transport)) as client:
+            for cam_id, cam in CAMERAS.items():
+                await monitor._probe_camera(client, cam_id, cam)
+
+        assert monitor.cameras["CAM-A"].status == "ok"
+        assert monitor.cameras["CAM-A"].latency_ms is not None
+        assert monitor.cameras["CAM-B"].status == "unreachable"
+        assert monitor.cameras["CAM-B"].reachable is False
+
+    @pytest.mark.asyncio
+    async def test_snapshot_degraded_when_camera_unreachable(self):
+        monitor = CameraHealthMonitor(interval=30, timeout=1)
+        monitor.database = "ok"
+        async with httpx.AsyncClient(transport=httpx.MockTransport(transport)) as client:
+            await monitor._probe_camera(client, "CAM-B", CAMERAS["CAM-B"])
+
+        result = monitor.snapshot()
+        assert result["status"] == "degraded"
+        assert result["cameras"] == {"CAM-B": "unreachable"}
+
+    def test_record_event_only_for_configured_cameras(self):
+        monitor = CameraHealthMonitor(interval=30, timeout=1)
+        with patch("app.services.camera_health.settings") as s:
+            s.CAMERAS = CAMERAS
+            monitor.record_event("CAM-A")
+            monitor.record_event("UNKNOWN-1.2.3.4")
+
+        assert monitor.cameras["CAM-A"].last_event_at is not None
+        assert "UNKNOWN-1.2.3.4" not in monitor.cameras
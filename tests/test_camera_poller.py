@@ -0,0 +1,66 @@
+# tests/test_camera_poller.py
+"""Unit tests for the alertStream poller supervisor."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import asyncio
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.services import camera_poller
+from app.services.camera_poller import PollerSupervisor, StreamState, _backoff_delay, _MIN_BACKOFF, _MAX_BACKOFF
+
+CAM = {"ip": "10.0.0.1", "user": "u", "password": "p"}
+
+EVENT = (b"--boundary\r\nContent-Type: application/xml\r\n\r\n"
+         b"<EventNotificationAlert><eventType>VMD</eventType></EventNotificationAlert>\r\n")
+
+
+class TestPollerSupervisor:
+    def test_backoff_is_jittered_and_bounded(self):
+        delays = {_backoff_delay(5) for _ in range(50)}
+        assert len(delays) > 1
+        assert all(_MIN_BACKOFF <= d <= _MAX_BACKOFF for d in delays)
+
+    @pytest.mark.asyncio
+    async def test_events_split_across_chunks_are_dispatched(self):
+        body = EVENT * 3
+        chunks = [body[i:i + 37] for i in range(0, len(body), 37)]
+
+        async def stream_body():
+            for c in chunks:
+                yield c
+
+        supervisor = PollerSupervisor()
+        supervisor._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda req: httpx.Response(200, content=stream_body()))
+        )
+        handled = AsyncMock()
+        with patch.object(camera_poller, "_handle_event", handled), \
+             patch.object(camera_poller, "_backoff_delay", return_value=3600):
+            supervisor.add_camera("CAM-A", CAM)
+            for _ in range(50):
+                await asyncio.sleep(0.01)
+                if handled.await_count >= 3:
+                    break
+            stream = supervisor.streams["CAM-A"]
+            assert handled.await_count == 3
+            assert stream.events_received == 3
+            await supervisor.remove_camera("CAM-A")
+
+        assert stream.state == StreamState.STOPPED
+        assert "CAM-A" not in supervisor.streams
+
+    @pytest.mark.asyncio
+    async def test_reconcile_adds_and_removes(self):
+        async def run_forever(self, stream, initial_delay=0.0):
+            await asyncio.sleep(3600)
+
+        supervisor = PollerSupervisor()
+        with patch.object(PollerSupervisor, "_run", run_forever):
+            supervisor.add_camera("CAM-A", CAM)
+            await supervisor.reconcile({"CAM-B": {**CAM, "ip": "10.0.0.2"}})
+            assert set(supervisor.streams) == {"CAM-B"}
+            await supervisor.stop()
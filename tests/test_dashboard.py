@@ -0,0 +1,83 @@
+# tests/test_dashboard.py
+"""Unit tests for the dashboard read model and its ETag endpoint."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import json
+from datetime import datetime
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.routers import dashboard as dashboard_router
+from app.services.dashboard import DashboardModel
+from app.services.event_bus import EventBus
+
+
+def make_model():
+    bus = EventBus(buffer_size=10, queue_size=10)
+    model = DashboardModel(latest_size=3)
+    bus.add_listener(model.on_message)
+    return bus, model
+
+
+def publish_alert(bus, alert_id, alert_type="violation", zone_id="Z1"):
+    bus.publish("alert", id=alert_id, alert_type=alert_type, camera_id="CAM-01", zone_id=zone_id,
+                event_type="fielddetection", description="d", triggered_at=datetime(2026, 3, 1, 8, 0),
+                incident_id=None)
+
+
+class TestDashboardModel:
+    def test_follows_bus_messages(self):
+        bus, model = make_model()
+        bus.publish("occupancy", zone_id="Z1", current_count=9, max_capacity=10, occupancy_percent=90.0,
+                    is_full=False, last_updated=None)
+        publish_alert(bus, 1)
+        publish_alert(bus, 2, "intrusion")
+        _, body = model.render()
+        summary = json.loads(body)
+        assert summary["zones"][0]["current_count"] == 9
+        assert summary["open_alerts"] == {"intrusion": 1, "violation": 1}
+        assert [a["id"] for a in summary["latest_alerts"]] == [2, 1]
+
+    def test_resolution_decrements_and_marks_latest(self):
+        bus, model = make_model()
+        publish_alert(bus, 1)
+        bus.publish("alert_resolved", alert_type="violation", count=1, zone_id="Z1", ids=[1])
+        summary = json.loads(model.render()[1])
+        assert summary["open_alerts"] == {}
+        assert summary["latest_alerts"][0]["is_resolved"] == 1
+
+    def test_latest_is_bounded(self):
+        bus, model = make_model()
+        for i in range(5):
+            publish_alert(bus, i)
+        assert [a["id"] for a in model.latest] == [4, 3, 2]
+
+    def test_etag_changes_only_with_state(self):
+        bus, model = make_model()
+        etag1, body1 = model.render()
+        etag2, body2 = model.render()
+        assert etag1 == etag2 and body1 is body2          # cached, not re-serialized
+        bus.publish("gate", gate="entry")                 # not part of the model's own state
+        assert model.render()[0] == etag1
+        publish_alert(bus, 1)
+        assert model.render()[0] != etag1
+
+
+class TestDashboardEndpoint:
+    def test_304_when_unchanged(self):
+        bus, model = make_model()
+        app = FastAPI()
+        app.include_router(dashboard_router.router)
+        with patch.object(dashboard_router, "dashboard", model):
+            client = TestClient(app)
+            first = client.get("/dashboard/summary")
+            assert first.status_code == 200
+            etag = first.headers["etag"]
+            assert client.get("/dashboard/summary", headers={"If-None-Match": etag}).status_code == 304
+            publish_alert(bus, 1)
+            changed = client.get("/dashboard/summary", headers={"If-None-Match": etag})
+            assert changed.status_code == 200
+            assert changed.json()["open_alerts_total"] == 1
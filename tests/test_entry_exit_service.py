@@ -60,3 +60,37 @@ class TestEntryExitService:
             mock_alert.assert_called_once()
             kwargs = mock_alert.call_args[1]
             assert "Unregistered" in kwargs.get("description", "")
+
+    @pytest.mark.asyncio
+    async def test_exit_closes_open_session(self):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = None
+
+        def close(db, exit_log):
+            exit_log.parking_duration = 3600
+            return MagicMock(plate_number="ABC-1234")
+
+        with patch("app.services.entry_exit_service.create_alert", new_callable=AsyncMock), \
+             patch("app.services.entry_exit_service.close_session", side_effect=close) as mock_close, \
+             patch("app.services.entry_exit_service.open_session") as mock_open, \
+             patch("app.services.entry_exit_service.apply_session_closed",
+                   side_effect=lambda plate: db.commit.assert_called()) as mock_apply:
+            await handle_anpr_event(make_anpr_event(gate="exit"), db)
+
+        mock_close.assert_called_once()
+        mock_open.assert_not_called()
+        mock_apply.assert_called_once_with("ABC-1234")   # index follows the commit
+        db.flush.assert_called_once()       # exit row has an id before the session references it
+
+    @pytest.mark.asyncio
+    async def test_failed_commit_leaves_open_sessions_untouched(self):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = None
+        db.commit.side_effect = RuntimeError("commit failed")
+
+        with patch("app.services.entry_exit_service.create_alert", new_callable=AsyncMock), \
+             patch("app.services.entry_exit_service.open_session"), \
+             patch("app.services.entry_exit_service.apply_session_opened") as mock_apply:
+            with pytest.raises(RuntimeError):
+                await handle_anpr_event(make_anpr_event(), db)
+        mock_apply.assert_not_called()
@@ -0,0 +1,90 @@
+# tests/test_event_bus.py
+"""Unit tests for the live feed pub/sub bus."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import json
+import pytest
+from datetime import datetime
+from app.services.event_bus import EventBus, RESET
+
+
+async def take(bus, sub, n):
+    out = []
+    async for msg in bus.messages(sub, timeout=0.01):
+        if msg is None:
+            break
+        out.append(msg)
+        if len(out) == n:
+            break
+    return out
+
+
+class TestEventBus:
+    @pytest.mark.asyncio
+    async def test_broadcast_serializes_once(self):
+        bus = EventBus(buffer_size=10, queue_size=10)
+        a, b = bus.subscribe(), bus.subscribe()
+        bus.publish("alert", zone_id="Z1", triggered_at=datetime(2026, 3, 1, 8, 0))
+        [ma] = await take(bus, a, 1)
+        [mb] = await take(bus, b, 1)
+        assert ma is mb
+        assert ma.sse is mb.sse
+        assert json.loads(ma.ws) == {"id": 1, "topic": "alert",
+                                     "data": {"zone_id": "Z1", "triggered_at": "2026-03-01T08:00:00"}}
+        assert ma.sse.startswith(b"id: 1\nevent: alert\ndata: ")
+
+    @pytest.mark.asyncio
+    async def test_topic_filter(self):
+        bus = EventBus(buffer_size=10, queue_size=10)
+        sub = bus.subscribe(["gate"])
+        bus.publish("alert", n=1)
+        bus.publish("gate", n=2)
+        msgs = await take(bus, sub, 5)
+        assert [m.topic for m in msgs] == ["gate"]
+
+    @pytest.mark.asyncio
+    async def test_resume_from_last_event_id(self):
+        bus = EventBus(buffer_size=10, queue_size=10)
+        for i in range(5):
+            bus.publish("occupancy", n=i)
+        sub = bus.subscribe(last_event_id=3)
+        bus.publish("occupancy", n=5)
+        msgs = await take(bus, sub, 10)
+        assert [m.id for m in msgs] == [4, 5, 6]
+
+    @pytest.mark.asyncio
+    async def test_resume_beyond_buffer_gets_reset(self):
+        bus = EventBus(buffer_size=3, queue_size=10)
+        for i in range(10):
+            bus.publish("occupancy", n=i)
+        sub = bus.subscribe(last_event_id=2)
+        msgs = await take(bus, sub, 1)
+        assert msgs[0].topic == RESET
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_never_blocks_and_catches_up_in_order(self):
+        bus = EventBus(buffer_size=100, queue_size=2)
+        slow = bus.subscribe()
+        for i in range(20):
+            bus.publish("alert", n=i)           # queue overflows after 2
+        assert slow.lagged and slow.queue.qsize() == 2
+        msgs = await take(bus, slow, 20)
+        assert [m.id for m in msgs] == list(range(1, 21))
+
+    @pytest.mark.asyncio
+    async def test_id_from_before_restart_resets(self):
+        bus = EventBus(buffer_size=10, queue_size=10)
+        bus.publish("alert", n=1)
+        sub = bus.subscribe(last_event_id=5000)
+        msgs = await take(bus, sub, 1)
+        assert msgs[0].topic == RESET
+
+    def test_unsubscribe(self):
+        bus = EventBus(buffer_size=10, queue_size=10)
+        sub = bus.subscribe()
+        bus.unsubscribe(sub)
+        bus.publish("alert", n=1)
+        assert sub.queue.empty()
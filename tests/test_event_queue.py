@@ -0,0 +1,113 @@
+# tests/test_event_queue.py
+"""Unit tests for the Postgres event work queue (DB calls mocked)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, AsyncMock, patch
+from datetime import datetime
+from app.services import event_queue, event_dispatcher, event_ingest
+from app.models.event_queue import EventDeadLetter
+
+
+def make_item(item_id, attempts=1, camera_event_id=None, done_handlers=None):
+    return SimpleNamespace(id=item_id, camera_ip="10.0.0.1", content_type="application/xml",
+                           raw_body=b"<x/>", attempts=attempts, enqueued_at=datetime.utcnow(),
+                           camera_event_id=camera_event_id, done_handlers=done_handlers)
+
+
+def make_event(event_type="fielddetection"):
+    return SimpleNamespace(event_type=event_type, detection_target="vehicle", region_id="zone-a",
+                           camera_id="CAM-01", plate_number=None)
+
+
+class TestEventQueue:
+    @pytest.mark.asyncio
+    async def test_batch_acks_successes_and_fails_errors(self):
+        db = MagicMock()
+        items = [make_item(1), make_item(2), make_item(3)]
+        ingest = AsyncMock(side_effect=[None, ValueError("bad xml"), None])
+
+        with patch.object(event_queue, "claim_batch", return_value=items), \
+             patch("app.services.event_ingest.ingest_raw_event", ingest), \
+             patch.object(event_queue, "ack") as mock_ack, \
+             patch.object(event_queue, "fail") as mock_fail:
+            claimed = await event_queue.process_batch(db)
+
+        assert claimed == 3
+        assert [c.args[1] for c in mock_ack.call_args_list] == [1, 3]
+        mock_fail.assert_called_once()
+        assert mock_fail.call_args.args[1].id == 2
+        db.rollback.assert_called_once()
+        # acks follow the handlers: the reorder stage would dispatch after the ack
+        assert all(c.kwargs["reorder"] is False for c in ingest.call_args_list)
+
+    def test_fail_schedules_retry_before_max_attempts(self):
+        db = MagicMock()
+        event_queue.fail(db, make_item(7, attempts=1), "boom")
+        db.add.assert_not_called()
+        db.execute.assert_called_once()
+        db.commit.assert_called_once()
+
+    def test_fail_dead_letters_after_max_attempts(self):
+        db = MagicMock()
+        item = make_item(7, attempts=event_queue.settings.EVENT_QUEUE_MAX_ATTEMPTS)
+        event_queue.fail(db, item, "boom")
+        dead = db.add.call_args.args[0]
+        assert isinstance(dead, EventDeadLetter)
+        assert dead.queue_id == 7 and dead.last_error == "boom"
+
+    @pytest.mark.asyncio
+    async def test_rows_lost_to_another_worker_are_skipped(self):
+        db = MagicMock()
+        items = [make_item(1), make_item(2)]
+        ingest = AsyncMock()
+        clock = iter([0.0, 0.0, 100.0, 100.0])        # the second item starts after the timeout
+
+        with patch.object(event_queue, "claim_batch", return_value=items), \
+             patch.object(event_queue, "extend_visibility", return_value=set()) as extend, \
+             patch.object(event_queue.time, "monotonic", side_effect=lambda: next(clock)), \
+             patch("app.services.event_ingest.ingest_raw_event", ingest), \
+             patch.object(event_queue, "ack") as mock_ack:
+            await event_queue.process_batch(db)
+
+        assert extend.call_args.args[1] == items[1:]
+        assert ingest.await_count == 1
+        assert [c.args[1] for c in mock_ack.call_args_list] == [1]
+
+
+class TestQueueProgress:
+    def test_done_handlers_round_trip(self):
+        db = MagicMock()
+        progress = event_queue.QueueProgress(db, make_item(1, camera_event_id=9, done_handlers="violation"))
+        assert progress.persisted
+        assert not progress.pending("violation") and progress.pending("intrusion")
+        progress.mark("intrusion")
+        assert progress.done == {"violation", "intrusion"}
+        db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_retry_does_not_store_the_event_again(self):
+        db = MagicMock()
+        progress = event_queue.QueueProgress(db, make_item(1, camera_event_id=9))
+        with patch.object(event_ingest, "parse_camera_event", return_value=MagicMock(camera_id="CAM-01")), \
+             patch.object(event_ingest, "save_camera_event") as save, \
+             patch.object(event_ingest, "dispatch_event", AsyncMock()) as dispatch:
+            await event_ingest.ingest_raw_event(b"<x/>", "10.0.0.1", "", db, reorder=False, progress=progress)
+        save.assert_not_called()
+        assert dispatch.call_args.args[2] is progress
+
+    @pytest.mark.asyncio
+    async def test_retry_skips_handlers_that_finished(self):
+        progress = event_queue.QueueProgress(MagicMock(), make_item(1, done_handlers="violation,snapshot"))
+        with patch.object(event_dispatcher, "handle_violation_event", AsyncMock()) as violation, \
+             patch.object(event_dispatcher, "handle_intrusion_event", AsyncMock()) as intrusion, \
+             patch.object(event_dispatcher, "fetch_snapshot", AsyncMock()) as snapshot:
+            await event_dispatcher.dispatch_event(make_event(), MagicMock(), progress)
+        violation.assert_not_awaited()
+        snapshot.assert_not_awaited()
+        intrusion.assert_awaited_once()
+        assert progress.done == {"violation", "snapshot", "intrusion"}
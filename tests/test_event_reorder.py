@@ -0,0 +1,78 @@
+# tests/test_event_reorder.py
+"""Unit tests for the per-camera trigger_time reorder buffer."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+from datetime import datetime, timedelta
+from app.services import event_reorder
+from app.services.event_reorder import ReorderBuffer
+from app.services.event_parser import ParsedCameraEvent
+
+T0 = datetime(2026, 3, 1, 8, 0, 0)
+
+
+def make_event(offset_s, event_type="regionEntrance", camera_id="CAM-04"):
+    return ParsedCameraEvent(
+        camera_id=camera_id, device_serial="TEST", channel_id=1, event_type=event_type,
+        detection_target="vehicle", region_id="parking-row-A", channel_name="Test",
+        trigger_time=T0 + timedelta(seconds=offset_s), raw_xml="<test/>",
+    )
+
+
+@pytest.fixture
+def dispatched():
+    order = []
+
+    async def record(event, db):
+        order.append((event.camera_id, (event.trigger_time - T0).total_seconds()))
+
+    with patch.object(event_reorder, "dispatch_event", record), \
+         patch.object(event_reorder, "SessionLocal", MagicMock()):
+        yield order
+
+
+class TestReorderBuffer:
+    @pytest.mark.asyncio
+    async def test_out_of_order_events_released_in_trigger_order(self, dispatched):
+        buf = ReorderBuffer(lateness=0.2)
+        for offset in (2, 0, 1):
+            buf.submit(make_event(offset))
+        await asyncio.sleep(0.3)
+        await buf.flush()
+        assert dispatched == [("CAM-04", 0), ("CAM-04", 1), ("CAM-04", 2)]
+        await buf.stop()
+
+    @pytest.mark.asyncio
+    async def test_watermark_releases_without_waiting(self, dispatched):
+        buf = ReorderBuffer(lateness=10)
+        buf.submit(make_event(0))
+        buf.submit(make_event(30))          # pushes the watermark past the first event
+        await asyncio.sleep(0.01)
+        assert dispatched == [("CAM-04", 0)]
+        await buf.stop()
+
+    @pytest.mark.asyncio
+    async def test_late_event_counted_and_still_dispatched(self, dispatched):
+        buf = ReorderBuffer(lateness=1)
+        buf.submit(make_event(0))
+        buf.submit(make_event(5))           # releases t=0
+        buf.submit(make_event(-3))          # older than what was released
+        await buf.flush()
+        assert buf.late_events == 1
+        assert ("CAM-04", -3) in dispatched
+        await buf.stop()
+
+    @pytest.mark.asyncio
+    async def test_cameras_are_independent(self, dispatched):
+        buf = ReorderBuffer(lateness=10)
+        buf.submit(make_event(100, camera_id="CAM-A"))
+        buf.submit(make_event(0, camera_id="CAM-B"))
+        await asyncio.sleep(0.01)
+        assert dispatched == []             # CAM-A's watermark doesn't release CAM-B
+        await buf.stop()
+        assert len(dispatched) == 2
@@ -0,0 +1,105 @@
+# tests/test_export_service.py
+"""Unit tests for streaming CSV / NDJSON / Parquet exports."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import csv
+import io
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+from app.models.camera_event import CameraEvent
+from app.routers import exports as exports_router
+from app.services import export_service
+from app.services.export_service import ExportFilter, stream_export
+
+T0 = datetime(2026, 3, 1, 8, 0, 0)
+
+
+@pytest.fixture
+def engine():
+    eng = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    CameraEvent.__table__.create(eng)
+    with eng.begin() as conn:
+        conn.execute(CameraEvent.__table__.insert(), [
+            {"id": i, "camera_id": f"CAM-0{i % 2}", "event_type": "fielddetection" if i % 3 else "VMD",
+             "raw_payload": f"<xml>{i}</xml>", "created_at": T0 + timedelta(minutes=i)}
+            for i in range(1, 11)
+        ])
+    return eng
+
+
+def export(engine, fmt="csv", chunk_rows=3, **filters):
+    return list(stream_export("events", fmt, ExportFilter(**filters), chunk_rows, engine))
+
+
+def read_csv(chunks):
+    return list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+
+
+class TestStreamExport:
+    def test_csv_streams_one_chunk_per_partition(self, engine):
+        chunks = export(engine)
+        assert len(chunks) == 4                                   # 10 rows in partitions of 3
+        rows = read_csv(chunks)
+        assert [int(r["id"]) for r in rows] == list(range(1, 11))  # oldest first
+        assert "raw_payload" not in rows[0]
+        assert rows[0]["created_at"] == (T0 + timedelta(minutes=1)).isoformat()
+        assert rows[0]["device_serial"] == ""
+
+    def test_filters(self, engine):
+        rows = read_csv(export(engine, camera_id="CAM-01", event_type="fielddetection"))
+        assert [int(r["id"]) for r in rows] == [1, 5, 7]
+
+    def test_time_range_is_half_open_and_utc(self, engine):
+        start = (T0 + timedelta(minutes=3)).replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=3)))
+        rows = read_csv(export(engine, start=start, end=T0 + timedelta(minutes=6)))
+        assert [int(r["id"]) for r in rows] == [3, 4, 5]
+
+    def test_empty_csv_still_has_header(self, engine):
+        rows = export(engine, camera_id="CAM-99")
+        assert b"".join(rows).decode().startswith("id,camera_id")
+        assert read_csv(rows) == []
+
+    def test_ndjson_with_raw(self, engine):
+        lines = b"".join(export(engine, "ndjson", include_raw=True)).decode().splitlines()
+        assert len(lines) == 10
+        first = json.loads(lines[0])
+        assert first["raw_payload"] == "<xml>1</xml>"
+        assert first["created_at"] == (T0 + timedelta(minutes=1)).isoformat()
+
+    def test_parquet_round_trip(self, engine):
+        pq = pytest.importorskip("pyarrow.parquet")
+        table = pq.read_table(io.BytesIO(b"".join(export(engine, "parquet"))))
+        assert table.num_rows == 10
+        assert table.num_row_groups == 4
+        assert table.column("id").to_pylist() == list(range(1, 11))
+
+
+class TestExportEndpoint:
+    def client(self):
+        app = FastAPI()
+        app.include_router(exports_router.router)
+        return TestClient(app)
+
+    def test_streams_csv_attachment(self, engine):
+        with patch.object(export_service, "default_engine", engine):
+            resp = self.client().get("/export/events", params={"camera_id": "CAM-00"})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+        assert resp.headers["content-disposition"].startswith('attachment; filename="events-')
+        assert len(read_csv([resp.content])) == 5
+
+    def test_unknown_dataset(self):
+        assert self.client().get("/export/nope").status_code == 404
+
+    def test_parquet_without_pyarrow(self):
+        with patch.object(exports_router, "parquet_available", return_value=False):
+            assert self.client().get("/export/events", params={"format": "parquet"}).status_code == 501
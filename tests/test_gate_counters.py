@@ -0,0 +1,45 @@
+# tests/test_gate_counters.py
+"""Unit tests for today's gate counters (Phase 2 — UC1)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from datetime import date, datetime
+from unittest.mock import MagicMock
+from app.services.gate_counters import GateCounters, DailyCounts
+from app.utils.time_utils import local_midnight_utc
+
+
+
+class TestGateCounters:
+    def test_local_midnight_in_utc(self):
+        # Riyadh is UTC+3: local midnight is 21:00 UTC the previous day
+        assert local_midnight_utc(date(2026, 3, 2), GateCounters("Asia/Riyadh").tz) == datetime(2026, 3, 1, 21, 0)
+
+    def test_record_counts_today_only(self):
+        c = GateCounters("Asia/Riyadh")
+        c.today = lambda: date(2026, 3, 2)
+        c.counts = DailyCounts(date(2026, 3, 2))
+        c.record("entry", datetime(2026, 3, 1, 22, 0))   # 01:00 local on 3/2
+        c.record("exit", datetime(2026, 3, 2, 8, 0))
+        c.record("entry", datetime(2026, 3, 1, 20, 0))   # 23:00 local on 3/1 — ignored
+        snap = c.snapshot()
+        assert (snap.entries, snap.exits) == (1, 1)
+
+    def test_rollover_at_local_midnight(self):
+        c = GateCounters("Asia/Riyadh")
+        c.today = lambda: date(2026, 3, 2)
+        c.counts = DailyCounts(date(2026, 3, 2), entries=40, exits=35)
+        c.today = lambda: date(2026, 3, 3)
+        snap = c.snapshot()
+        assert snap.day == date(2026, 3, 3)
+        assert (snap.entries, snap.exits) == (0, 0)
+
+    def test_load_uses_grouped_range_query(self):
+        c = GateCounters("Asia/Riyadh")
+        db = MagicMock()
+        db.query.return_value.filter.return_value.group_by.return_value.all.return_value = [("entry", 12), ("exit", 7)]
+        c.load(db)
+        assert c.loaded
+        assert (c.counts.entries, c.counts.exits) == (12, 7)
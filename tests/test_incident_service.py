@@ -0,0 +1,179 @@
+# tests/test_incident_service.py
+"""Unit tests for incident correlation (UC5 + UC6)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, AsyncMock, patch
+from app.models.incident import Incident
+from app.services import incident_service
+from app.services.incident_service import (
+    IncidentCorrelator, correlate_event, raise_incident_alert, recently_alerted,
+)
+from app.services.event_parser import ParsedCameraEvent
+
+
+def make_event(region_id="emergency-exit"):
+    return ParsedCameraEvent(
+        camera_id="CAM-01",
+        device_serial="TEST",
+        channel_id=1,
+        event_type="fielddetection",
+        detection_target="vehicle",
+        region_id=region_id,
+        channel_name="Test",
+        trigger_time=datetime.utcnow(),
+        raw_xml="<test/>",
+        event_state="active",
+    )
+
+
+def make_db():
+    db = MagicMock()
+
+    def add(row):
+        if isinstance(row, Incident):
+            row.id = 7
+    db.add.side_effect = add
+    return db
+
+
+@pytest.fixture
+def correlator():
+    c = IncidentCorrelator(window_seconds=30)
+    db = make_db()
+    with patch.object(incident_service, "incident_correlator", c), \
+         patch.object(incident_service, "SessionLocal", return_value=db), \
+         patch.object(incident_service, "fetch_snapshot", new_callable=AsyncMock, return_value=None) as snap:
+        c.db, c.snap = db, snap
+        yield c
+
+
+async def raise_both(event, db=None):
+    async with correlate_event(event):
+        await raise_incident_alert(db, "violation", event.camera_id, event.region_id, event.event_type, "v")
+        await raise_incident_alert(db, "intrusion", event.camera_id, event.region_id, event.event_type, "i")
+
+
+class TestIncidentCorrelator:
+    @pytest.mark.asyncio
+    async def test_one_event_one_incident_one_commit_one_snapshot(self, correlator):
+        await raise_both(make_event())
+        await asyncio.sleep(0)
+
+        incidents = [c.args[0] for c in correlator.db.add.call_args_list if isinstance(c.args[0], Incident)]
+        assert len(incidents) == 1 and incidents[0].alert_count == 2
+        alerts = correlator.db.add_all.call_args[0][0]
+        assert sorted(a.alert_type for a in alerts) == ["intrusion", "violation"]
+        assert {a.incident_id for a in alerts} == {7}
+        correlator.db.commit.assert_called_once()
+        correlator.snap.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_repeat_within_window_is_merged_without_writes(self, correlator):
+        await raise_both(make_event())
+        correlator.db.reset_mock()
+        await raise_both(make_event())
+        correlator.db.commit.assert_not_called()
+        assert correlator.suppressed == 2
+
+    @pytest.mark.asyncio
+    async def test_new_alert_type_joins_open_incident(self, correlator):
+        event = make_event()
+        async with correlate_event(event):
+            await raise_incident_alert(None, "violation", "CAM-01", "emergency-exit", "fielddetection", "v")
+        correlator.db.reset_mock()
+        await raise_incident_alert(None, "intrusion", "CAM-01", "emergency-exit", "fielddetection", "i")
+
+        correlator.db.execute.assert_called_once()            # UPDATE incidents, no new row
+        assert not any(isinstance(c.args[0], Incident) for c in correlator.db.add.call_args_list)
+        assert correlator.db.add_all.call_args[0][0][0].incident_id == 7
+        assert correlator.open["emergency-exit"].alert_count == 2
+
+    @pytest.mark.asyncio
+    async def test_window_expiry_opens_new_incident(self, correlator):
+        await raise_both(make_event())
+        correlator.open["emergency-exit"].last_alert_at -= timedelta(seconds=60)
+        correlator.db.reset_mock()
+        await raise_both(make_event())
+        assert any(isinstance(c.args[0], Incident) for c in correlator.db.add.call_args_list)
+
+    @pytest.mark.asyncio
+    async def test_suppressed_alerts_do_not_extend_the_window(self, correlator):
+        await raise_both(make_event())
+        opened_at = correlator.open["emergency-exit"].last_alert_at
+        correlator.open["emergency-exit"].last_alert_at = opened_at - timedelta(seconds=20)
+        await raise_both(make_event())                                   # suppressed
+        assert correlator.open["emergency-exit"].last_alert_at == opened_at - timedelta(seconds=20)
+        correlator.open["emergency-exit"].last_alert_at -= timedelta(seconds=20)
+        correlator.db.reset_mock()
+        await raise_both(make_event())                                   # persistent condition alerts again
+        assert any(isinstance(c.args[0], Incident) for c in correlator.db.add.call_args_list)
+
+    @pytest.mark.asyncio
+    async def test_resolved_incident_is_forgotten(self, correlator):
+        await raise_both(make_event())
+        correlator.forget(7)
+        assert "emergency-exit" not in correlator.open
+        correlator.db.reset_mock()
+        await raise_both(make_event())
+        assert len(correlator.db.add_all.call_args[0][0]) == 2          # not dropped as duplicates
+
+    @pytest.mark.asyncio
+    async def test_zones_are_separate_incidents(self, correlator):
+        await raise_both(make_event("emergency-exit"))
+        await raise_both(make_event("staff-only-area"))
+        assert set(correlator.open) == {"emergency-exit", "staff-only-area"}
+
+
+class TestResolveIncident:
+    @pytest.mark.asyncio
+    async def test_waits_for_queued_alerts_before_resolving(self):
+        from app.routers import incidents
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = Incident(
+            id=7, zone_id="emergency-exit", alert_types="intrusion,violation")
+        order = []
+        sink = MagicMock()
+        sink.wait_written = AsyncMock(side_effect=lambda t, z: order.append(("wait", t, z)))
+        db.execute.side_effect = lambda *a, **k: order.append(("update",)) or MagicMock(all=lambda: [])
+        correlator = MagicMock()
+        with patch.object(incidents, "alert_sink", sink), patch.object(incidents, "incident_correlator", correlator):
+            result = await incidents.resolve_incident(7, db)
+        correlator.forget.assert_called_once_with(7)
+        assert order == [("wait", "intrusion", "emergency-exit"), ("wait", "violation", "emergency-exit"), ("update",)]
+        assert result["status"] == "resolved"
+
+    @pytest.mark.asyncio
+    async def test_unknown_incident_is_404(self):
+        from fastapi import HTTPException
+        from app.routers import incidents
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = None
+        with pytest.raises(HTTPException) as exc:
+            await incidents.resolve_incident(99, db)
+        assert exc.value.status_code == 404
+
+
+class TestRecentlyAlerted:
+    @pytest.mark.asyncio
+    async def test_one_cooldown_query_per_zone_within_event(self):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.distinct.return_value.all.return_value = [("violation",)]
+        with patch.object(incident_service, "incident_correlator", IncidentCorrelator(30)):
+            async with correlate_event(make_event()):
+                assert recently_alerted(db, "violation", "emergency-exit")
+                assert not recently_alerted(db, "intrusion", "emergency-exit")
+        db.query.assert_called_once()
+
+    def test_open_incident_answers_without_query(self):
+        c = IncidentCorrelator(30)
+        c.open["Z1"] = incident_service.OpenIncident(1, "Z1", datetime.utcnow(), {"intrusion"}, 1)
+        db = MagicMock()
+        with patch.object(incident_service, "incident_correlator", c):
+            assert recently_alerted(db, "intrusion", "Z1")
+        db.query.assert_not_called()
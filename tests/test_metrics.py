@@ -0,0 +1,93 @@
+# tests/test_metrics.py
+"""Unit tests for the in-process Prometheus metrics."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.utils.metrics import MetricsRegistry
+
+
+def sample(text: str, prefix: str) -> float:
+    """Value of the first exposition line starting with `prefix`."""
+    line = next(l for l in text.splitlines() if l.startswith(prefix))
+    return float(line.rsplit(" ", 1)[1])
+
+
+class TestMetricsRegistry:
+    def test_histogram_buckets_are_cumulative_and_inclusive(self):
+        reg = MetricsRegistry()
+        h = reg.histogram("stage_seconds", "t", ("stage",), buckets=(0.1, 1.0))
+        child = h.labels("parse")
+        for v in (0.05, 0.1, 0.5, 3.0):
+            child.observe(v)
+        text = reg.render()
+        assert sample(text, 'stage_seconds_bucket{stage="parse",le="0.1"') == 2     # le is inclusive
+        assert sample(text, 'stage_seconds_bucket{stage="parse",le="1.0"') == 3
+        assert sample(text, 'stage_seconds_bucket{stage="parse",le="+Inf"') == 4
+        assert sample(text, 'stage_seconds_count{stage="parse"') == 4
+        assert sample(text, 'stage_seconds_sum{stage="parse"') == pytest.approx(3.65)
+        assert "# TYPE stage_seconds histogram" in text
+
+    def test_timer_observes_block(self):
+        reg = MetricsRegistry()
+        h = reg.histogram("block_seconds", "t")
+        with h.time():
+            pass
+        assert h.labels().counts[0] == 1
+
+    def test_counter_children_and_escaping(self):
+        reg = MetricsRegistry()
+        c = reg.counter("events_total", "e", ("camera_id", "event_type"))
+        c.labels("CAM-01", "VMD").inc()
+        c.labels("CAM-01", "VMD").inc(2)
+        c.labels('CAM"02', "x").inc()
+        text = reg.render()
+        assert sample(text, 'events_total{camera_id="CAM-01",event_type="VMD"') == 3
+        assert 'camera_id="CAM\\"02"' in text
+
+    def test_wrong_label_count(self):
+        c = MetricsRegistry().counter("x_total", "x", ("a",))
+        with pytest.raises(ValueError):
+            c.labels("a", "b")
+
+    def test_gauges_are_read_at_scrape_and_failures_skipped(self):
+        reg = MetricsRegistry()
+        depth = {"n": 1}
+        reg.gauge("queue_depth", "q", ("queue",), lambda: {("sink",): depth["n"]})
+        reg.gauge("broken", "b", (), lambda: 1 / 0)
+        reg.gauge("plain", "p", (), lambda: 7)
+        depth["n"] = 5
+        text = reg.render()
+        assert sample(text, 'queue_depth{queue="sink"') == 5
+        assert sample(text, "plain{") == 7
+        assert "broken{" not in text
+
+
+class TestMetricsEndpoint:
+    def test_requests_labelled_by_route_template(self):
+        from app.main import app
+        client = TestClient(app)
+        client.get("/api/v1/events/reorder")
+        text = client.get("/api/v1/metrics").text
+        assert 'damanat_http_requests_total{method="GET",route="/api/v1/events/reorder",status="200"' in text
+        assert 'damanat_http_request_duration_seconds_count{method="GET",route="/api/v1/events/reorder"' in text
+
+    def test_path_parameters_stay_templated(self):
+        from app.main import app
+        client = TestClient(app)
+        client.delete("/api/v1/pollers/NO-SUCH-CAMERA")
+        text = client.get("/api/v1/metrics").text
+        assert 'route="/api/v1/pollers/{cam_id}"' in text
+        assert "NO-SUCH-CAMERA" not in text
+
+    def test_request_that_raises_is_counted_as_500(self):
+        from app.main import app
+        client = TestClient(app, raise_server_exceptions=False)
+        with patch("app.services.event_reorder.reorder_buffer.stats", side_effect=RuntimeError("boom")):
+            assert client.get("/api/v1/events/reorder").status_code == 500
+        text = client.get("/api/v1/metrics").text
+        assert 'route="/api/v1/events/reorder",status="500"' in text
@@ -76,3 +76,44 @@ class TestOccupancyService:
             await handle_occupancy_event(make_event("regionExiting"), db)
 
         assert zone.current_count == 0
+
+
+class TestOccupancyAlertWithSink:
+    """Alert rows reach the table one sink batch later than the zone row."""
+
+    @pytest.fixture
+    def sink(self):
+        from app.services import alert_service, occupancy_service
+        sink = alert_service.AlertSink(batch_size=10, flush_seconds=0.05, queue_size=100)
+        sink._write = MagicMock()
+        with patch.object(alert_service, "alert_sink", sink), patch.object(occupancy_service, "alert_sink", sink):
+            yield sink
+
+    def zone_db(self, count):
+        zone = MagicMock(current_count=count, max_capacity=10)
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.side_effect = \
+            lambda: zone if db.query.call_args.args[0].__name__ == "ZoneOccupancy" else None   # no alert row yet
+        return zone, db
+
+    @pytest.mark.asyncio
+    async def test_queued_raise_counts_as_open(self, sink):
+        sink.start()
+        zone, db = self.zone_db(8)
+        await handle_occupancy_event(make_event("regionEntrance"), db)       # 9/10 → raise, queued
+        await handle_occupancy_event(make_event("regionEntrance"), db)       # 10/10 → still the same alert
+        await sink.stop()
+        assert sink._write.call_count == 1 and len(sink._write.call_args.args[0]) == 1
+
+    @pytest.mark.asyncio
+    async def test_clear_waits_for_queued_raise(self, sink):
+        sink.start()
+        zone, db = self.zone_db(8)
+        await handle_occupancy_event(make_event("regionEntrance"), db)       # raise, queued
+        zone.current_count = 7
+        writes_at_resolve = []
+        with patch("app.services.occupancy_service.resolve_occupancy_alert",
+                   side_effect=lambda db, zone_id: writes_at_resolve.append(sink._write.call_count) or 1):
+            await handle_occupancy_event(make_event("regionExiting"), db)    # 6/10 → clear
+        assert writes_at_resolve == [1]                                      # the raise was written first
+        await sink.stop()
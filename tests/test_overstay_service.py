@@ -0,0 +1,89 @@
+# tests/test_overstay_service.py
+"""Unit tests for the timer wheel and overstay alerts (Phase 2 — UC2)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import random
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, AsyncMock, patch
+from app.utils.timer_wheel import TimerWheel
+from app.services.overstay_service import OverstayMonitor, _epoch
+from app.services.parking_session_service import OpenSession
+
+ENTRY_TIME = datetime(2026, 3, 1, 8, 0, 0)
+
+
+class TestTimerWheel:
+    def test_fires_each_timer_once_on_time(self):
+        rng = random.Random(1)
+        wheel = TimerWheel(1.0, levels=3, start=0)
+        deadlines = {i: rng.randint(1, 400_000) for i in range(5000)}   # beyond the 3-level span too
+        for key, d in deadlines.items():
+            wheel.schedule(key, d)
+        for key in range(0, 5000, 5):
+            wheel.cancel(key)
+            deadlines.pop(key)
+
+        fired, now = {}, 0
+        while now < 400_100:
+            now += rng.randint(1, 300)
+            for key, _ in wheel.advance(now):
+                fired[key] = now
+        assert fired.keys() == deadlines.keys()
+        assert all(deadlines[k] <= fired[k] < deadlines[k] + 300 for k in fired)
+        assert len(wheel) == 0
+
+    def test_reschedule_replaces_deadline(self):
+        wheel = TimerWheel(1.0, start=0)
+        wheel.schedule("ABC", 10, "first")
+        wheel.schedule("ABC", 100, "second")
+        assert wheel.advance(50) == []
+        assert wheel.advance(100) == [("ABC", "second")]
+
+
+class TestOverstayMonitor:
+    def make_monitor(self):
+        m = OverstayMonitor({"visitor": 4, "unknown": 4}, tick_seconds=10)
+        m.wheel = TimerWheel(10, start=_epoch(ENTRY_TIME))
+        return m
+
+    def test_arms_only_types_with_allowance(self):
+        m = self.make_monitor()
+        m.on_open(OpenSession(1, "VIS-1", 10, ENTRY_TIME, vehicle_type="visitor"))
+        m.on_open(OpenSession(2, "EMP-1", 11, ENTRY_TIME, vehicle_type="employee"))
+        assert "VIS-1" in m.wheel and "EMP-1" not in m.wheel
+        assert m.wheel.deadline("VIS-1") == _epoch(ENTRY_TIME + timedelta(hours=4))
+
+    def test_exit_cancels_timer(self):
+        m = self.make_monitor()
+        m.on_open(OpenSession(1, "VIS-1", 10, ENTRY_TIME, vehicle_type="visitor"))
+        m.on_close("VIS-1")
+        assert len(m.wheel) == 0
+
+    @pytest.mark.asyncio
+    async def test_expired_timer_raises_alert_once(self):
+        m = self.make_monitor()
+        m.on_open(OpenSession(1, "VIS-1", 10, ENTRY_TIME, vehicle_type="visitor", camera_id="CAM-ENTRY"))
+        db = MagicMock()
+        db.execute.return_value.first.return_value = (1,)     # this worker claimed the session
+        with patch("app.services.overstay_service.SessionLocal", return_value=db), \
+             patch("app.services.overstay_service.create_alert", new_callable=AsyncMock) as mock_alert:
+            await m.tick(_epoch(ENTRY_TIME + timedelta(hours=3)))
+            mock_alert.assert_not_called()
+            await m.tick(_epoch(ENTRY_TIME + timedelta(hours=4, minutes=1)))
+            mock_alert.assert_called_once()
+            assert mock_alert.call_args.kwargs["alert_type"] == "overstay"
+
+    @pytest.mark.asyncio
+    async def test_already_claimed_by_other_worker(self):
+        m = self.make_monitor()
+        m.on_open(OpenSession(1, "VIS-1", 10, ENTRY_TIME, vehicle_type="visitor"))
+        db = MagicMock()
+        db.execute.return_value.first.return_value = None
+        with patch("app.services.overstay_service.SessionLocal", return_value=db), \
+             patch("app.services.overstay_service.create_alert", new_callable=AsyncMock) as mock_alert:
+            await m.tick(_epoch(ENTRY_TIME + timedelta(hours=5)))
+            mock_alert.assert_not_called()
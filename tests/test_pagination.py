@@ -0,0 +1,119 @@
+# tests/test_pagination.py
+"""Unit tests for keyset (cursor) pagination."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException, Response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models.camera_event import CameraEvent
+from app.utils.pagination import (
+    NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, paginate,
+)
+
+T0 = datetime(2026, 3, 1, 8, 0, 0)
+
+
+@pytest.fixture
+def db():
+    # one shared in-memory connection: the router test's sync endpoint runs in a worker thread
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    CameraEvent.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    for i in range(1, 24):
+        # pairs of rows share a timestamp so the id tie-break matters
+        session.add(CameraEvent(id=i, camera_id=f"CAM-0{i % 2}", event_type="fielddetection",
+                                created_at=T0 + timedelta(seconds=i // 2), raw_payload="<xml/>"))
+    session.commit()
+    yield session
+    session.close()
+
+
+def walk(db, q_factory, limit):
+    pages, cursor = [], None
+    while True:
+        response = Response()
+        rows = paginate(q_factory(), response, CameraEvent.id, cursor, limit,
+                        CameraEvent.created_at, "created_at")
+        pages.append([r.id for r in rows])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+
+
+class TestCursor:
+    def test_round_trip(self):
+        assert decode_cursor(encode_cursor(T0, 42)) == (T0, 42)
+        assert decode_cursor(encode_cursor(None, 7)) == (None, 7)
+
+    def test_malformed_cursor(self):
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+
+class TestPaginate:
+    def test_walks_every_row_once_newest_first(self, db):
+        pages = walk(db, lambda: db.query(CameraEvent), limit=5)
+        ids = [i for p in pages for i in p]
+        assert ids == sorted(range(1, 24), key=lambda i: (T0 + timedelta(seconds=i // 2), i), reverse=True)
+        assert [len(p) for p in pages] == [5, 5, 5, 5, 3]
+
+    def test_filtered_walk(self, db):
+        pages = walk(db, lambda: db.query(CameraEvent).filter(CameraEvent.camera_id == "CAM-01"), limit=4)
+        ids = [i for p in pages for i in p]
+        assert ids == sorted((i for i in range(1, 24) if i % 2), reverse=True)
+
+    def test_exact_multiple_has_no_empty_last_page(self, db):
+        response = Response()
+        rows = paginate(db.query(CameraEvent), response, CameraEvent.id, None, 23, CameraEvent.created_at, "created_at")
+        assert len(rows) == 23
+        assert NEXT_CURSOR_HEADER not in response.headers
+
+    def test_id_only_ascending(self, db):
+        response = Response()
+        rows = paginate(db.query(CameraEvent), response, CameraEvent.id, None, 10, descending=False)
+        assert [r.id for r in rows] == list(range(1, 11))
+        rows = paginate(db.query(CameraEvent), Response(), CameraEvent.id,
+                        response.headers[NEXT_CURSOR_HEADER], 10, descending=False)
+        assert [r.id for r in rows] == list(range(11, 21))
+
+    def test_bad_cursor_is_400(self, db):
+        with pytest.raises(HTTPException) as exc:
+            paginate(db.query(CameraEvent), Response(), CameraEvent.id, "garbage!", 5, CameraEvent.created_at)
+        assert exc.value.status_code == 400
+
+
+class TestEventsRouter:
+    @pytest.fixture
+    def client(self, db):
+        from fastapi.testclient import TestClient
+        from app.database import get_db
+        from app.main import app
+        app.dependency_overrides[get_db] = lambda: db
+        yield TestClient(app)
+        app.dependency_overrides.pop(get_db, None)
+
+    def test_raw_payload_only_with_include_raw(self, client):
+        lean = client.get("/api/v1/events", params={"limit": 3}).json()
+        assert len(lean) == 3 and all("raw_payload" not in e for e in lean)
+        raw = client.get("/api/v1/events", params={"limit": 3, "include_raw": True}).json()
+        assert [e["raw_payload"] for e in raw] == ["<xml/>"] * 3
+        assert raw[0]["id"] == lean[0]["id"] == 23
+
+
+class TestVehiclesInsideRouter:
+    @pytest.mark.parametrize("limit", [0, -1, 1001])
+    def test_limit_is_bounded(self, limit):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from app.routers import entry_exit
+        app = FastAPI()
+        app.include_router(entry_exit.router)
+        client = TestClient(app)
+        assert client.get("/entry-exit/inside", params={"limit": limit}).status_code == 422
+        assert client.get("/entry-exit/inside", params={"limit": 10}).status_code == 200
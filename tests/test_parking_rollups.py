@@ -0,0 +1,92 @@
+# tests/test_parking_rollups.py
+"""Unit tests for incremental parking rollups (Phase 2 — UC1 + UC2)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from datetime import date, datetime
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from app.services import parking_rollups
+
+
+class TestParkingRollups:
+    def test_record_upserts_local_hour_bucket(self):
+        db = MagicMock()
+        # 22:30 UTC on 3/1 is 01:30 on 3/2 in Riyadh
+        parking_rollups.record_rollup(db, "exit", datetime(2026, 3, 1, 22, 30), duration=3600)
+        stmt = db.execute.call_args[0][0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        assert "ON CONFLICT (bucket_date, bucket_hour, gate) DO UPDATE" in sql
+        assert params["bucket_date"] == date(2026, 3, 2)
+        assert params["bucket_hour"] == 1
+        assert params["duration_sum"] == 3600 and params["duration_count"] == 1
+
+    def test_entry_has_no_duration(self):
+        db = MagicMock()
+        parking_rollups.record_rollup(db, "entry", datetime(2026, 3, 1, 8, 0))
+        params = db.execute.call_args[0][0].compile(dialect=postgresql.dialect()).params
+        assert params["duration_sum"] == 0 and params["duration_count"] == 0
+
+    def test_record_takes_shared_rollup_lock(self):
+        db = MagicMock()
+        parking_rollups.record_rollup(db, "entry", datetime(2026, 3, 1, 8, 0))
+        assert "pg_advisory_xact_lock_shared" in str(db.execute.call_args_list[0].args[0])
+
+    def test_backfill_locks_then_upserts(self):
+        db = MagicMock()
+        parking_rollups.backfill_rollups(db, date(2026, 3, 1), date(2026, 3, 2))
+        statements = [str(c.args[0]) for c in db.execute.call_args_list]
+        assert "pg_advisory_xact_lock(" in statements[0]
+        assert "ON CONFLICT (bucket_date, bucket_hour, gate) DO UPDATE" in statements[-1]
+        db.commit.assert_called_once()
+
+    def test_daily_totals_and_range(self):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.group_by.return_value.all.return_value = [
+            (date(2026, 3, 1), "entry", 10, 0, 0),
+            (date(2026, 3, 1), "exit", 8, 8 * 1800, 8),
+            (date(2026, 3, 2), "entry", 5, 0, 0),
+            (date(2026, 3, 2), "exit", 2, 2 * 3600, 2),
+        ]
+        days = parking_rollups.daily_totals(db, date(2026, 3, 1), date(2026, 3, 2))
+        assert days[date(2026, 3, 1)].entries == 10
+        assert days[date(2026, 3, 1)].avg_duration_seconds == 1800
+
+        totals = parking_rollups.range_totals(db, date(2026, 3, 1), date(2026, 3, 2))
+        assert (totals.entries, totals.exits) == (15, 10)
+        assert totals.avg_duration_seconds == (8 * 1800 + 2 * 3600) / 10
+
+    def test_all_time_totals_sum_per_gate(self):
+        db = MagicMock()
+        db.query.return_value.group_by.return_value.all.return_value = [
+            ("entry", 40, None, None), ("exit", 30, 30 * 600, 30)]
+        totals = parking_rollups.all_time_totals(db)
+        assert (totals.entries, totals.exits, totals.avg_duration_seconds) == (40, 30, 600)
+
+
+class TestParkingStatsRouter:
+    def test_parking_time_without_parameters_covers_all_history(self):
+        from app.routers import parking_stats
+        with patch.object(parking_stats, "all_time_totals",
+                          return_value=parking_rollups.RollupTotals(duration_sum=5400, duration_count=3)) as all_time, \
+             patch.object(parking_stats, "range_totals") as ranged:
+            result = parking_stats.get_avg_parking_time(None, None, None, MagicMock())
+        all_time.assert_called_once()
+        ranged.assert_not_called()
+        assert result["avg_parking_minutes"] == 30.0
+
+    def test_daily_has_one_shape_for_a_day_and_a_range(self):
+        from app.routers import parking_stats
+        days = {date(2026, 3, 1): parking_rollups.RollupTotals(10, 8, 8 * 1800, 8),
+                date(2026, 3, 2): parking_rollups.RollupTotals(5, 2, 2 * 3600, 2)}
+        with patch.object(parking_stats, "daily_totals", return_value=days):
+            ranged = parking_stats.get_daily_stats(None, date(2026, 3, 1), date(2026, 3, 2), MagicMock())
+        with patch.object(parking_stats, "daily_totals", return_value={}):
+            single = parking_stats.get_daily_stats(date(2026, 3, 3), None, None, MagicMock())
+        assert set(ranged) == set(single)
+        assert (ranged["total_vehicles"], ranged["total_exits"], len(ranged["days"])) == (15, 10, 2)
+        assert ranged["avg_parking_minutes"] == round((8 * 1800 + 2 * 3600) / 10 / 60, 1)
+        assert single["days"] == [] and single["total_vehicles"] == 0
@@ -0,0 +1,77 @@
+# tests/test_parking_session_service.py
+"""Unit tests for open parking sessions (Phase 2 — UC1 + UC2)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
+from app.services import parking_session_service as sessions
+from app.services.parking_session_service import OpenSessionIndex, OpenSession
+
+ENTRY_TIME = datetime(2026, 3, 1, 8, 0, 0)
+
+
+def make_log(log_id, gate, event_time):
+    return SimpleNamespace(id=log_id, plate_number="ABC-1234", vehicle_id=None, vehicle_type="unknown",
+                           camera_id="CAM-ENTRY", gate=gate, event_time=event_time,
+                           matched_entry_id=None, parking_duration=None)
+
+
+@pytest.fixture
+def index():
+    idx = OpenSessionIndex()
+    idx.loaded = True
+    with patch.object(sessions, "open_sessions", idx):
+        yield idx
+
+
+class TestParkingSessions:
+    def test_entry_opens_session_in_memory_after_commit(self, index):
+        db = MagicMock()
+        db.execute.return_value.scalar_one.return_value = 11
+        session = sessions.open_session(db, make_log(1, "entry", ENTRY_TIME))
+        assert index.get("ABC-1234") is None            # not committed yet
+        sessions.apply_session_opened(session)
+        assert index.get("ABC-1234").session_id == 11
+        assert index.get("ABC-1234").entry_log_id == 1
+
+    def test_concurrent_entry_for_same_plate_retries(self, index):
+        db = MagicMock()
+        db.execute.return_value.scalar_one.return_value = 12
+        db.begin_nested.return_value.__enter__.side_effect = IntegrityError("INSERT", {}, Exception("uq"))
+        session = sessions.open_session(db, make_log(1, "entry", ENTRY_TIME))
+        assert session.session_id == 12
+        assert db.execute.call_count == 3               # expire + insert again, then NOTIFY
+
+    def test_exit_closes_session_and_cross_references(self, index):
+        index.add(OpenSession(11, "ABC-1234", 1, ENTRY_TIME))
+        db = MagicMock()
+        db.execute.return_value.first.return_value = SimpleNamespace(
+            id=11, entry_log_id=1, entry_time=ENTRY_TIME, vehicle_id=None, vehicle_type="unknown", camera_id="CAM-ENTRY")
+        exit_log = make_log(2, "exit", ENTRY_TIME + timedelta(hours=2))
+
+        session = sessions.close_session(db, exit_log)
+
+        assert session.entry_log_id == 1
+        assert exit_log.matched_entry_id == 1
+        assert exit_log.parking_duration == 7200
+        assert index.get("ABC-1234") is not None         # not committed yet
+        sessions.apply_session_closed(session.plate_number)
+        assert index.get("ABC-1234") is None
+
+    def test_exit_without_open_session(self, index):
+        db = MagicMock()
+        db.execute.return_value.first.return_value = None
+        assert sessions.close_session(db, make_log(2, "exit", ENTRY_TIME)) is None
+
+    def test_notify_from_other_worker_updates_index(self, index):
+        s = OpenSession(5, "XYZ-5678", 3, ENTRY_TIME, camera_id="CAM-ENTRY")
+        sessions._on_sessions_notify({"op": "open", "session": s.to_payload()})
+        assert index.get("XYZ-5678") == s
+        sessions._on_sessions_notify({"op": "close", "plate": "XYZ-5678"})
+        assert len(index) == 0
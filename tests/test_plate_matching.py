@@ -0,0 +1,52 @@
+# tests/test_plate_matching.py
+"""Unit tests for OCR-tolerant plate matching (Phase 2 — UC1 + UC2 + UC4)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.utils.plate_matching import PlateIndex, canonical_plate, bounded_levenshtein
+from app.services.parking_session_service import OpenSessionIndex, OpenSession
+
+
+class TestPlateMatching:
+    def test_confusables_share_a_canonical_key(self):
+        assert canonical_plate("ABC-1234") == canonical_plate("a8c 1234")
+        assert canonical_plate("SOL-1") == canonical_plate("501-1")
+
+    def test_bounded_levenshtein(self):
+        assert bounded_levenshtein("ABC1234", "ABC1234", 1) == 0
+        assert bounded_levenshtein("ABC1234", "ABC124", 1) == 1
+        assert bounded_levenshtein("ABC1234", "XYZ1234", 1) is None
+
+    def test_exact_read_ranks_before_confusable(self):
+        idx = PlateIndex()
+        idx.rebuild(["ABC-1234", "A8C-1234"])
+        assert idx.nearest("ABC1234")[0] == ("ABC-1234", 0)
+
+    def test_best_match_tolerates_misread_and_missing_char(self):
+        idx = PlateIndex()
+        idx.rebuild(["ABC-1234", "XYZ-5678"])
+        assert idx.best_match("A8C1234") == "ABC-1234"
+        assert idx.best_match("XYZ578") == "XYZ-5678"
+        assert idx.best_match("QQQ-0000") is None
+
+    def test_ambiguous_match_returns_none(self):
+        idx = PlateIndex()
+        idx.rebuild(["ABC-1234", "ABC-1235"])
+        assert idx.best_match("ABC-1236") is None
+
+    def test_remove(self):
+        idx = PlateIndex()
+        idx.add("ABC-1234")
+        idx.remove("ABC-1234")
+        assert len(idx) == 0
+        assert idx.nearest("ABC-1234") == []
+
+    def test_open_session_index_fuzzy_match(self):
+        sessions = OpenSessionIndex()
+        sessions.loaded = True
+        sessions.add(OpenSession(1, "ABC-1234", 10, None))
+        assert sessions.fuzzy_match("A8C1234") == "ABC-1234"
+        sessions.remove("ABC-1234")
+        assert sessions.fuzzy_match("A8C1234") is None
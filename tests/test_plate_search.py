@@ -0,0 +1,132 @@
+# tests/test_plate_search.py
+"""Unit tests for partial plate search (UC4)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session
+from app.services import plate_search
+from app.services.plate_search import search_gate_log, search_plates, search_registry
+
+
+def capture_sql(fn, *args):
+    """Run a search function against a session with no database; return the SQL it would send."""
+    captured = []
+    with patch.object(Query, "all", lambda self: captured.append(self.statement) or []):
+        fn(Session(), *args)
+    sql = str(captured[0].compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    return sql.replace("%%", "%")          # psycopg2 escaping of literal %
+
+
+class TestPlateSearchSql:
+    @pytest.fixture(autouse=True)
+    def trgm_installed(self):
+        with patch.object(plate_search, "installed_extensions", {"pg_trgm"}):
+            yield
+
+    def test_gate_log_filters_on_indexed_expression(self):
+        sql = capture_sql(search_gate_log, "1234", 20, datetime(2026, 1, 1))
+        # same expression as ix_entry_exit_log_plate_trgm, so the GIN index applies
+        assert "regexp_replace(upper(entry_exit_log.plate_number), '[^[:alnum:]]+', '', 'g') LIKE '%1234%'" in sql
+        assert "GROUP BY entry_exit_log.plate_number" in sql
+        assert "similarity(" in sql
+        assert "entry_exit_log.event_time >= '2026-01-01" in sql
+
+    def test_registry_ranks_exact_prefix_suffix(self):
+        sql = capture_sql(search_registry, "1234", 20)
+        assert "= '1234') THEN 0" in sql
+        assert "LIKE '1234%') THEN 1" in sql
+        assert "LIKE '%1234') THEN 2" in sql
+
+
+class TestPlateSearchWithoutTrigram:
+    @pytest.fixture(autouse=True)
+    def trgm_missing(self):
+        with patch.object(plate_search, "installed_extensions", set()):
+            yield
+
+    def test_queries_do_not_call_similarity(self):
+        for sql in (capture_sql(search_registry, "1234", 20),
+                    capture_sql(search_gate_log, "1234", 20, None)):
+            assert "similarity(" not in sql
+            assert "LIKE '%1234%'" in sql
+
+    def test_ranked_by_match_type_then_plate_or_last_seen(self):
+        registry = capture_sql(search_registry, "1234", 20)
+        assert registry.split("ORDER BY")[1].strip().startswith("CASE WHEN")
+        assert registry.split("ORDER BY")[1].split("LIMIT")[0].rstrip().endswith("vehicles.plate_number")
+        history = capture_sql(search_gate_log, "1234", 20, None)
+        assert "max(entry_exit_log.event_time) DESC" in history.split("ORDER BY")[1]
+
+    def test_rows_without_score(self):
+        vehicle = SimpleNamespace(plate_number="ABC-1234", owner_name="A", vehicle_type="employee", employee_id=None)
+        db = MagicMock()
+        db.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = \
+            [(vehicle, 1, None)]
+        assert search_registry(db, "ABC1", 20)[0]["score"] is None
+
+
+class TestSearchPlates:
+    def test_query_is_normalized_and_too_short_rejected(self):
+        with pytest.raises(ValueError):
+            search_plates(MagicMock(), "-1 2-")
+
+    def test_gate_history_marks_registered_plates(self):
+        history = [{"plate": "ABC-1234"}, {"plate": "XYZ-1234"}]
+        with patch.object(plate_search, "search_registry", return_value=[]) as registry, \
+             patch.object(plate_search, "search_gate_log", return_value=history), \
+             patch.object(plate_search, "lookup_vehicles_by_plates",
+                          return_value={"ABC-1234": SimpleNamespace(), "XYZ-1234": None}):
+            result = search_plates(MagicMock(), "c-1234 ")
+        registry.assert_called_once()
+        assert registry.call_args[0][1] == "C1234"
+        assert result["normalized"] == "C1234"
+        assert [h["registered"] for h in result["gate_history"]] == [True, False]
+
+
+class TestTrigramIndexSetup:
+    def test_extension_failure_is_logged_and_trigram_index_skipped(self):
+        from sqlalchemy.exc import ProgrammingError
+        from app import database
+        from app.models.vehicle import Vehicle
+        engine = MagicMock()
+        engine.begin.return_value.__enter__.return_value.execute.side_effect = \
+            ProgrammingError("CREATE EXTENSION", {}, Exception("permission denied"))
+        with patch.object(database, "engine", engine), patch.object(database, "installed_extensions", set()):
+            database.create_extensions()            # does not raise
+            trgm = next(i for i in Vehicle.__table__.indexes if i.name == "ix_vehicles_plate_trgm")
+            assert not database.extension_installed(None, trgm, None)
+            assert database._missing_indexes({}) and trgm not in database._missing_indexes({})
+
+    def test_large_table_indexes_are_deferred_at_startup(self):
+        from app import database
+        from app.models.camera_event import CameraEvent          # noqa
+        from app.models.parking_session import ParkingSession    # noqa
+        conn = MagicMock()
+        conn.execute.return_value = []               # no indexes exist yet
+        engine = MagicMock()
+        engine.begin.return_value.__enter__.return_value = conn
+        created = []
+        with patch.object(database, "engine", engine), \
+                patch("sqlalchemy.Index.create", lambda self, bind, checkfirst=False: created.append(self.name)):
+            database.upgrade_schema()
+        assert "uq_parking_sessions_open_plate" in created
+        assert not any(name.startswith(("ix_camera_events_", "ix_alerts_", "ix_entry_exit_log_", "ix_vehicles_"))
+                       for name in created)
+
+    def test_concurrent_index_sql(self):
+        from app.database import create_index_concurrently_sql
+        from app.models.parking_session import ParkingSession
+        from app.models.camera_event import CameraEvent
+        unique = next(i for i in ParkingSession.__table__.indexes if i.name == "uq_parking_sessions_open_plate")
+        plain = next(i for i in CameraEvent.__table__.indexes if i.name == "ix_camera_events_created_id")
+        assert create_index_concurrently_sql(unique).startswith(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_parking_sessions_open_plate")
+        assert create_index_concurrently_sql(plain) == \
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_camera_events_created_id ON camera_events (created_at, id)"
@@ -0,0 +1,77 @@
+# tests/test_poller_ownership.py
+"""Unit tests for advisory-lock based poller sharding (lock calls faked in memory)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from unittest.mock import MagicMock
+from app.services.poller_ownership import PollerOwnership
+
+CAMERAS = {f"CAM-{i:02d}": {"ip": f"10.0.0.{i}"} for i in range(10)}
+
+
+class FakeLocks:
+    """Stand-in for pg advisory locks shared by several workers."""
+
+    def __init__(self):
+        self.holders = {}      # cam_id -> worker
+        self.workers = set()
+
+
+def make_worker(locks: FakeLocks, key: int) -> PollerOwnership:
+    w = PollerOwnership(supervisor=MagicMock(), interval=15)
+
+    def connect():
+        w._conn, w.worker_key = object(), key
+        locks.workers.add(key)
+
+    def try_lock(cam_id):
+        if locks.holders.get(cam_id, w) is w:
+            locks.holders[cam_id] = w
+            return True
+        return False
+
+    w._connect = connect
+    w._count_live_workers = lambda: len(locks.workers)
+    w._try_lock = try_lock
+    w._unlock = lambda cam_id: locks.holders.pop(cam_id, None)
+    return w
+
+
+class TestPollerOwnership:
+    def test_single_worker_owns_everything(self):
+        w = make_worker(FakeLocks(), 1)
+        assert w._rebalance_locks(CAMERAS) == set(CAMERAS)
+
+    def test_second_worker_takes_over_half_without_duplicates(self):
+        locks = FakeLocks()
+        a, b = make_worker(locks, 1), make_worker(locks, 2)
+        a._rebalance_locks(CAMERAS)
+        b._rebalance_locks(CAMERAS)       # registers; a still holds all
+        a._rebalance_locks(CAMERAS)       # a releases surplus
+        b._rebalance_locks(CAMERAS)       # b picks it up
+
+        assert len(a.owned) == 5 and len(b.owned) == 5
+        assert not (a.owned & b.owned)
+
+    def test_failover_when_worker_dies(self):
+        locks = FakeLocks()
+        a, b = make_worker(locks, 1), make_worker(locks, 2)
+        for w in (a, b, a, b):
+            w._rebalance_locks(CAMERAS)
+
+        # b dies: Postgres drops its session locks
+        locks.workers.discard(2)
+        for cam_id in list(b.owned):
+            locks.holders.pop(cam_id)
+
+        assert a._rebalance_locks(CAMERAS) == set(CAMERAS)
+
+    def test_disconnect_invalidates_instead_of_pooling(self):
+        w = PollerOwnership(supervisor=MagicMock(), interval=15)
+        conn = w._conn = MagicMock()
+        w.owned = {"CAM-01"}
+        w._disconnect()
+        conn.invalidate.assert_called_once()     # a pooled session would keep its locks
+        assert w._conn is None and w.owned == set()
@@ -0,0 +1,73 @@
+# tests/test_sketches.py
+"""Unit tests for streaming sketches and the parking sketch store (Phase 2 — UC1 + UC2)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import random
+import pytest
+from datetime import date, datetime
+from unittest.mock import MagicMock
+from app.utils.sketches import TDigest, HyperLogLog
+from app.services.parking_sketches import SketchStore
+
+
+class TestTDigest:
+    def test_merged_quantiles_match_exact(self):
+        rng = random.Random(7)
+        values = [rng.expovariate(1 / 3600) for _ in range(20000)]
+        a, b = TDigest(), TDigest()
+        for i, v in enumerate(values):
+            (a if i % 2 else b).add(v)
+        a.merge(b)
+        values.sort()
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * len(values))]
+            assert abs(a.quantile(q) - exact) / exact < 0.02
+
+    def test_roundtrip_and_empty(self):
+        assert TDigest().quantile(0.5) is None
+        td = TDigest()
+        for v in range(1, 101):
+            td.add(v)
+        restored = TDigest.from_bytes(td.to_bytes())
+        assert restored.count == 100
+        assert restored.quantile(0.5) == pytest.approx(td.quantile(0.5))
+
+
+class TestHyperLogLog:
+    def test_merge_counts_union(self):
+        a, b = HyperLogLog(), HyperLogLog()
+        for i in range(30000):
+            a.add(f"PLATE-{i}")
+        for i in range(20000, 50000):
+            b.add(f"PLATE-{i}")
+        a.merge(b)
+        assert abs(a.count() - 50000) / 50000 < 0.05
+
+    def test_small_counts_exactish_and_roundtrip(self):
+        h = HyperLogLog()
+        for plate in ["ABC-1234", "XYZ-5678", "ABC-1234"]:
+            h.add(plate)
+        assert h.count() == 2
+        assert HyperLogLog.from_bytes(h.to_bytes()).count() == 2
+
+
+class TestSketchStore:
+    def test_record_buckets_by_local_day(self):
+        store = SketchStore()
+        store.record(datetime(2026, 3, 1, 22, 0), "ABC-1234", 3600)   # 01:00 on 3/2 in Riyadh
+        store.record(datetime(2026, 3, 1, 10, 0), "XYZ-5678")
+        assert store.pending(date(2026, 3, 2)).durations.count == 1
+        assert store.pending(date(2026, 3, 1)).plates.count() == 1
+
+    def test_failed_flush_keeps_deltas(self):
+        store = SketchStore()
+        store.record(datetime(2026, 3, 1, 10, 0), "ABC-1234", 600)
+        db = MagicMock()
+        db.execute.side_effect = RuntimeError("db down")
+        with pytest.raises(RuntimeError):
+            store.flush(db)
+        db.rollback.assert_called_once()
+        assert store.pending(date(2026, 3, 1)).durations.count == 1
@@ -0,0 +1,134 @@
+# tests/test_vehicle_import.py
+"""Unit tests for the streaming bulk vehicle import (UC4)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import threading
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from app.services import vehicle_import
+from app.services.vehicle_import import _upsert, import_vehicles, iter_records
+from app.services.vehicle_service import VehicleRegistryCache
+
+
+async def stream(*chunks: bytes):
+    for c in chunks:
+        yield c
+
+
+async def collect(agen):
+    return [item async for item in agen]
+
+
+def returned_row(plate, vehicle_id=1, inserted=True):
+    return SimpleNamespace(id=vehicle_id, plate_number=plate, owner_name="Ahmed", vehicle_type="employee",
+                           employee_id=None, is_registered=1, inserted=inserted)
+
+
+class TestParsing:
+    @pytest.mark.asyncio
+    async def test_csv_split_across_chunks_with_bom_and_quoted_newline(self):
+        body = ('\ufeffplate_number,owner_name,vehicle_type,notes\r\n'
+                'ABC-1,"Ahmed, Jr",employee,\n'
+                'ABC-2,Sara,visitor,"two\nlines"\n'
+                'ABC-3,Omar\n').encode()
+        records = await collect(iter_records(stream(body[:17], body[17:40], body[40:]), "csv"))
+        assert records[0] == (2, {"plate_number": "ABC-1", "owner_name": "Ahmed, Jr",
+                                  "vehicle_type": "employee", "notes": ""})
+        assert records[1] == (3, {"plate_number": "ABC-2", "owner_name": "Sara",
+                                  "vehicle_type": "visitor", "notes": "two\nlines"})
+        assert records[2] == (5, "expected 4 columns, got 2")
+
+    @pytest.mark.asyncio
+    async def test_csv_header_must_have_required_columns(self):
+        with pytest.raises(ValueError, match="vehicle_type"):
+            await collect(iter_records(stream(b"plate_number,owner_name\nA,B\n"), "csv"))
+
+    @pytest.mark.asyncio
+    async def test_ndjson_errors_are_per_line(self):
+        body = b'{"plate_number": "A"}\n\nnot json\n[1]\n{"plate_number": "B"}'
+        records = await collect(iter_records(stream(body), "ndjson"))
+        assert [line for line, _ in records] == [1, 3, 4, 5]
+        assert records[1][1].startswith("invalid JSON")
+        assert records[2][1] == "expected a JSON object"
+
+
+class TestImport:
+    def test_upsert_is_one_statement_per_batch(self):
+        db = MagicMock()
+        _upsert(db, [{"plate_number": "A", "owner_name": "x", "vehicle_type": "employee"}], update=True)
+        sql = str(db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (plate_number) DO UPDATE" in sql
+        assert "RETURNING" in sql and "xmax = 0" in sql
+
+    @pytest.mark.asyncio
+    async def test_batches_validation_errors_and_cache(self):
+        records = stream_records([
+            (2, {"plate_number": "A", "owner_name": "x", "vehicle_type": "employee"}),
+            (3, {"plate_number": "", "owner_name": "x", "vehicle_type": "employee"}),
+            (4, {"plate_number": "B", "owner_name": "y", "vehicle_type": "visitor"}),
+            (5, {"plate_number": "A", "owner_name": "z", "vehicle_type": "employee"}),
+            (6, "unterminated quoted field"),
+        ])
+        cache = VehicleRegistryCache()
+        cache.loaded = True
+        db = MagicMock()
+        db.execute.return_value.all.return_value = [returned_row("A", 1, inserted=False), returned_row("B", 2)]
+        with patch.object(vehicle_import, "registry_cache", cache), \
+             patch.object(vehicle_import, "registry_bulk_changed") as bulk_changed:
+            report = await import_vehicles(db, records, batch_size=10)
+        assert db.execute.call_count == 1                        # one upsert for the whole batch
+        assert (report.received, report.created, report.updated, report.failed) == (5, 1, 1, 3)
+        assert {e["line"] for e in report.errors} == {2, 3, 6}   # line 2 superseded by line 5
+        assert cache.get("B").id == 2
+        bulk_changed.assert_called_once_with(db)
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_retries_row_by_row(self):
+        records = stream_records([
+            (2, {"plate_number": "A", "owner_name": "x", "vehicle_type": "employee"}),
+            (3, {"plate_number": "B", "owner_name": "y" * 300, "vehicle_type": "employee"}),
+        ])
+        db = MagicMock()
+        ok = MagicMock()
+        ok.all.return_value = [returned_row("A")]
+        too_long = IntegrityError("INSERT", {}, Exception("value too long for type character varying(200)"))
+        db.execute.side_effect = [too_long, ok, too_long]
+        with patch.object(vehicle_import, "registry_bulk_changed"):
+            report = await import_vehicles(db, records, batch_size=10)
+        assert (report.created, report.failed) == (1, 1)
+        assert report.errors[0]["plate"] == "B" and "too long" in report.errors[0]["error"]
+
+    @pytest.mark.asyncio
+    async def test_no_update_counts_existing_as_skipped(self):
+        records = stream_records([
+            (2, {"plate_number": "A", "owner_name": "x", "vehicle_type": "employee"}),
+            (3, {"plate_number": "B", "owner_name": "y", "vehicle_type": "employee"}),
+        ])
+        db = MagicMock()
+        db.execute.return_value.all.return_value = [returned_row("B")]
+        with patch.object(vehicle_import, "registry_bulk_changed"):
+            report = await import_vehicles(db, records, update=False)
+        assert (report.created, report.skipped) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_database_writes_run_off_the_event_loop(self):
+        records = stream_records([(2, {"plate_number": "A", "owner_name": "x", "vehicle_type": "employee"})])
+        loop_thread, threads = threading.get_ident(), []
+        db = MagicMock()
+        db.execute.side_effect = lambda stmt: threads.append(threading.get_ident()) or MagicMock(
+            all=MagicMock(return_value=[returned_row("A")]))
+        with patch.object(vehicle_import, "registry_bulk_changed",
+                          side_effect=lambda db: threads.append(threading.get_ident())):
+            await import_vehicles(db, records)
+        assert len(threads) == 2 and loop_thread not in threads
+
+
+async def stream_records(items):
+    for item in items:
+        yield item
@@ -0,0 +1,88 @@
+# tests/test_vehicle_service.py
+"""Unit tests for the in-memory vehicle registry cache (UC4)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from app.services import vehicle_service
+from app.services.vehicle_service import VehicleRegistryCache, lookup_vehicle_by_plate
+
+
+def make_vehicle(plate="ABC-1234", vehicle_id=1):
+    return SimpleNamespace(id=vehicle_id, plate_number=plate, owner_name="Ahmed",
+                           vehicle_type="employee", employee_id="EMP-001", is_registered=1)
+
+
+@pytest.fixture
+def cache():
+    c = VehicleRegistryCache()
+    db = MagicMock()
+    db.query.return_value.all.return_value = [make_vehicle()]
+    c.load(db)
+    with patch.object(vehicle_service, "registry_cache", c):
+        yield c
+
+
+class TestVehicleRegistryCache:
+    def test_loaded_cache_answers_without_db(self, cache):
+        db = MagicMock()
+        assert lookup_vehicle_by_plate(db, "ABC-1234").owner_name == "Ahmed"
+        assert lookup_vehicle_by_plate(db, "XYZ-0000") is None
+        db.query.assert_not_called()
+
+    def test_unloaded_cache_falls_back_to_db(self):
+        db = MagicMock()
+        with patch.object(vehicle_service, "registry_cache", VehicleRegistryCache()):
+            lookup_vehicle_by_plate(db, "ABC-1234")
+        db.query.assert_called_once()
+
+    def test_refresh_plate_removes_deleted_vehicle(self, cache):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = None
+        cache.refresh_plate(db, "ABC-1234")
+        assert cache.get("ABC-1234") is None
+
+    def test_notify_from_other_worker_refreshes_plate(self, cache):
+        session = MagicMock()
+        session.query.return_value.filter.return_value.first.return_value = make_vehicle("NEW-0001", 2)
+        with patch.object(vehicle_service, "SessionLocal", return_value=session):
+            vehicle_service._on_registry_notify({"plate": "NEW-0001", "origin": "other"})
+        assert cache.get("NEW-0001").id == 2
+        session.close.assert_called_once()
+
+    def test_reload_notify_reloads_whole_registry(self, cache):
+        session = MagicMock()
+        session.query.return_value.all.return_value = [make_vehicle(), make_vehicle("NEW-0001", 2)]
+        with patch.object(vehicle_service, "SessionLocal", return_value=session):
+            vehicle_service._on_registry_notify({"reload": True, "origin": "other"})
+        assert cache.get("NEW-0001").id == 2
+
+
+class TestFuzzyRegistryLookup:
+    def test_confusable_read_matches_registered_plate(self, cache):
+        assert vehicle_service.fuzzy_lookup_vehicle("A8C1234").plate_number == "ABC-1234"
+
+    def test_one_real_character_off_stays_unknown(self, cache):
+        assert vehicle_service.fuzzy_lookup_vehicle("ABC-1235") is None
+        assert vehicle_service.fuzzy_lookup_vehicle("ABC-12345") is None
+
+
+class TestBatchLookup:
+    def test_cache_answers_in_request_order(self, cache):
+        db = MagicMock()
+        found = vehicle_service.lookup_vehicles_by_plates(db, ["XYZ-0000", "ABC-1234", "XYZ-0000"])
+        assert list(found) == ["XYZ-0000", "ABC-1234"]
+        assert found["ABC-1234"].owner_name == "Ahmed" and found["XYZ-0000"] is None
+        db.query.assert_not_called()
+
+    def test_unloaded_cache_uses_one_query(self):
+        db = MagicMock()
+        db.query.return_value.filter.return_value = [make_vehicle()]
+        with patch.object(vehicle_service, "registry_cache", VehicleRegistryCache()):
+            found = vehicle_service.lookup_vehicles_by_plates(db, ["ABC-1234", "XYZ-0000"])
+        db.query.assert_called_once()
+        assert found["ABC-1234"].id == 1 and found["XYZ-0000"] is None
@@ -5,14 +5,16 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+import time
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
-from datetime import datetime
+from datetime import datetime, timedelta
 from app.services.violation_service import handle_violation_event
+from app.services.dwell_tracker import DwellTracker
 from app.services.event_parser import ParsedCameraEvent
 
 
-def make_event(event_type="fielddetection", region_id="restricted-vip"):
+def make_event(event_type="fielddetection", region_id="restricted-vip", event_state=None):
     return ParsedCameraEvent(
         camera_id="CAM-01",
         device_serial="TEST",
@@ -23,6 +25,7 @@ def make_event(event_type="fielddetection", region_id="restricted-vip"):
         channel_name="Test",
         trigger_time=datetime.utcnow(),
         raw_xml="<test/>",
+        event_state=event_state,
     )
 
 
@@ -32,7 +35,7 @@ class TestViolationService:
         db = MagicMock()
         db.query.return_value.filter.return_value.first.return_value = None  # no recent
 
-        with patch("app.services.violation_service.create_alert", new_callable=AsyncMock) as mock_alert:
+        with patch("app.services.violation_service.raise_incident_alert", new_callable=AsyncMock) as mock_alert:
             await handle_violation_event(make_event(), db)
             mock_alert.assert_called_once()
 
@@ -40,7 +43,7 @@ class TestViolationService:
     async def test_non_restricted_zone_ignored(self):
         db = MagicMock()
 
-        with patch("app.services.violation_service.create_alert", new_callable=AsyncMock) as mock_alert:
+        with patch("app.services.violation_service.raise_incident_alert", new_callable=AsyncMock) as mock_alert:
             await handle_violation_event(make_event(region_id="regular-parking"), db)
             mock_alert.assert_not_called()
 
@@ -49,7 +52,7 @@ class TestViolationService:
         db = MagicMock()
         db.query.return_value.filter.return_value.first.return_value = None
 
-        with patch("app.services.violation_service.create_alert", new_callable=AsyncMock) as mock_alert:
+        with patch("app.services.violation_service.raise_incident_alert", new_callable=AsyncMock) as mock_alert:
             await handle_violation_event(make_event("linedetection", "any-zone"), db)
             mock_alert.assert_called_once()
 
@@ -58,6 +61,65 @@ class TestViolationService:
         db = MagicMock()
         db.query.return_value.filter.return_value.first.return_value = MagicMock()  # recent exists
 
-        with patch("app.services.violation_service.create_alert", new_callable=AsyncMock) as mock_alert:
+        with patch("app.services.violation_service.raise_incident_alert", new_callable=AsyncMock) as mock_alert:
             await handle_violation_event(make_event(), db)
             mock_alert.assert_not_called()
+
+
+class TestDwellViolations:
+    @pytest.mark.asyncio
+    async def test_dwell_zone_does_not_alert_on_entry(self):
+        db = MagicMock()
+        tracker = DwellTracker(AsyncMock(), idle_timeout=30, tick_seconds=1)
+        with patch("app.services.violation_service.dwell_tracker", tracker), \
+             patch("app.services.violation_service.raise_incident_alert", new_callable=AsyncMock) as mock_alert:
+            await handle_violation_event(make_event(region_id="no-parking-zone", event_state="active"), db)
+            mock_alert.assert_not_called()
+        assert ("CAM-01", "no-parking-zone") in tracker.states
+
+    @pytest.mark.asyncio
+    async def test_threshold_fires_once_while_parked(self):
+        on_threshold = AsyncMock()
+        t0 = datetime(2026, 3, 1, 8, 0, 0)
+        with patch("app.services.dwell_tracker.time") as clock:
+            clock.time.return_value = 1000.0
+            tracker = DwellTracker(on_threshold, idle_timeout=30, tick_seconds=1)
+            tracker.observe("CAM-01", "loading-bay", "active", t0, threshold_seconds=60)
+            for i in range(1, 6):      # heartbeats every 20s keep the dwell open past the threshold
+                clock.time.return_value = 1000.0 + 20 * i
+                tracker.observe("CAM-01", "loading-bay", "active", t0 + timedelta(seconds=20 * i), 60)
+                await tracker.tick()
+        on_threshold.assert_called_once()
+        assert on_threshold.call_args[0][0].alerted
+        assert on_threshold.call_args[0][0].dwell_seconds >= 60
+
+    @pytest.mark.asyncio
+    async def test_passing_through_does_not_alert(self):
+        on_threshold = AsyncMock()
+        tracker = DwellTracker(on_threshold, idle_timeout=30, tick_seconds=1)
+        t0 = datetime(2026, 3, 1, 8, 0, 0)
+        tracker.observe("CAM-01", "loading-bay", "active", t0, threshold_seconds=60)
+        closed = tracker.observe("CAM-01", "loading-bay", "inactive", t0 + timedelta(seconds=10), 60)
+        assert closed is not None and not closed.alerted
+        await tracker.tick(time.time() + 120)
+        on_threshold.assert_not_called()
+
+
+class TestResolveViolation:
+    def make_db(self, updated):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = MagicMock(zone_id="emergency-exit")
+        db.query.return_value.filter.return_value.update.return_value = updated
+        return db
+
+    def test_resolve_announces_once(self):
+        from app.routers.violations import resolve_violation
+        with patch("app.routers.violations.announce_resolved") as announce:
+            assert resolve_violation(5, self.make_db(updated=1))["status"] == "resolved"
+        announce.assert_called_once_with("violation", 1, "emergency-exit", [5])
+
+    def test_already_resolved_is_a_no_op(self):
+        from app.routers.violations import resolve_violation
+        with patch("app.routers.violations.announce_resolved") as announce:
+            assert resolve_violation(5, self.make_db(updated=0))["status"] == "already_resolved"
+        announce.assert_not_called()
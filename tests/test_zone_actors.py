@@ -0,0 +1,119 @@
+# tests/test_zone_actors.py
+"""Unit tests for single-writer zone actors (UC3)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+from datetime import datetime
+from app.services import zone_actors as actors
+from app.services.zone_actors import ZoneActorRegistry
+from app.services.event_parser import ParsedCameraEvent
+
+
+def make_event(event_type="regionEntrance", region_id="parking-row-A"):
+    return ParsedCameraEvent(
+        camera_id="CAM-03", device_serial="TEST", channel_id=1, event_type=event_type,
+        detection_target="vehicle", region_id=region_id, channel_name="Test",
+        trigger_time=datetime.utcnow(), raw_xml="<test/>",
+    )
+
+
+@pytest.fixture
+def db():
+    session = MagicMock()
+    session.query.return_value.filter.return_value.first.return_value = None   # zone not in DB yet
+    with patch.object(actors, "SessionLocal", return_value=session), \
+         patch.object(actors, "create_alert", new_callable=AsyncMock) as mock_alert:
+        session.mock_alert = mock_alert
+        yield session
+
+
+class TestZoneActors:
+    @pytest.mark.asyncio
+    async def test_burst_is_applied_in_order_with_one_write(self, db):
+        registry = ZoneActorRegistry(enabled=True)
+        for t in ("regionEntrance", "regionEntrance", "regionExiting", "regionEntrance"):
+            registry.tell_event(make_event(t))
+        await registry.actors["parking-row-A"].mailbox.join()
+
+        state = registry.actors["parking-row-A"].state
+        assert state.current_count == 2
+        assert db.commit.call_count == 1      # whole burst drained into one write
+        await registry.stop()
+
+    @pytest.mark.asyncio
+    async def test_zones_have_separate_actors(self, db):
+        registry = ZoneActorRegistry(enabled=True)
+        registry.tell_event(make_event(region_id="row-A"))
+        registry.tell_event(make_event(region_id="row-B"))
+        await registry.stop()
+        assert registry.actors == {}
+        assert db.add.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_ask_returns_state_after_write(self, db):
+        registry = ZoneActorRegistry(enabled=True)
+        state = await registry.ask("row-C", actors.SET_CAPACITY, 25)
+        assert state.max_capacity == 25 and state.persisted
+        assert await registry.ask("missing", actors.RESET) is None
+        assert "missing" not in registry.actors           # unknown zone: the actor retired
+        assert "row-C" in registry.actors
+        await registry.stop()
+
+    @pytest.mark.asyncio
+    async def test_threshold_raises_occupancy_alert(self, db):
+        registry = ZoneActorRegistry(enabled=True)
+        await registry.ask("row-D", actors.SET_CAPACITY, 1)
+        registry.tell_event(make_event(region_id="row-D"))
+        await registry.actors["row-D"].mailbox.join()
+        db.mock_alert.assert_called_once()
+        assert db.mock_alert.call_args.args[1] == "occupancy_full"
+        await registry.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_zone_alerts_once_then_resolves_when_drained(self, db):
+        registry = ZoneActorRegistry(enabled=True)
+        with patch.object(actors, "resolve_occupancy_alert") as resolve:
+            await registry.ask("row-E", actors.SET_CAPACITY, 10)
+            for t in ["regionEntrance"] * 9:
+                await registry.ask("row-E", actors.EVENT, make_event(t, "row-E"))
+            for t in ["regionExiting", "regionEntrance"] * 3:        # shuffling around the threshold
+                await registry.ask("row-E", actors.EVENT, make_event(t, "row-E"))
+            db.mock_alert.assert_called_once()
+
+            state = await registry.ask("row-E", actors.EVENT, make_event("regionExiting", "row-E"))
+            assert state.current_count == 8 and state.alert_active          # 80% — inside the hysteresis band
+            state = await registry.ask("row-E", actors.EVENT, make_event("regionExiting", "row-E"))
+            assert state.current_count == 7 and not state.alert_active      # 70% — below the clear threshold
+            resolve.assert_called_once_with(db, "row-E")
+        db.mock_alert.assert_called_once()
+        await registry.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_reloaded_and_reapplied(self, db):
+        registry = ZoneActorRegistry(enabled=True)
+        db.commit.side_effect = [RuntimeError("connection reset"), None]
+        with patch.object(actors, "_RETRY_BASE_SECONDS", 0):
+            for _ in range(3):
+                registry.tell_event(make_event(region_id="row-F"))
+            await registry.actors["row-F"].mailbox.join()
+        assert registry.actors["row-F"].state.current_count == 3      # applied once, not lost or doubled
+        db.rollback.assert_called_once()
+        await registry.stop()
+
+    @pytest.mark.asyncio
+    async def test_batch_dead_lettered_after_max_attempts(self, db, tmp_path):
+        registry = ZoneActorRegistry(enabled=True)
+        db.commit.side_effect = RuntimeError("db down")
+        path = tmp_path / "dead.jsonl"
+        with patch.object(actors, "_RETRY_BASE_SECONDS", 0), patch.object(actors, "DEAD_LETTER_PATH", str(path)):
+            with pytest.raises(RuntimeError):
+                await registry.ask("row-G", actors.EVENT, make_event(region_id="row-G"))
+        assert db.commit.call_count == actors.settings.ZONE_ACTOR_MAX_ATTEMPTS
+        assert '"zone_id": "row-G"' in path.read_text()
+        assert "row-G" not in registry.actors
+        await registry.stop()
@@ -0,0 +1,53 @@
+# tests/test_zone_rule_engine.py
+"""Unit tests for the compiled zone rule engine (UC5 + UC6)."""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from datetime import datetime, time
+from unittest.mock import MagicMock
+from app.services.zone_rule_engine import RuleEngine, CompiledRule, DEFAULT_RULES, NO_REGION
+
+NOON = datetime(2026, 3, 2, 12, 0)      # Monday
+NIGHT = datetime(2026, 3, 2, 23, 0)
+
+
+def default_engine():
+    return RuleEngine(CompiledRule(id=i + 1, **r) for i, r in enumerate(DEFAULT_RULES))
+
+
+class TestZoneRuleEngine:
+    def test_defaults_match_former_zone_sets(self):
+        e = default_engine()
+        assert "violation" in e.evaluate("restricted-vip", "CAM-01", "fielddetection", "vehicle", NOON)
+        assert "violation" in e.evaluate("any-zone", "CAM-01", "linedetection", "human", NOON)
+        assert e.evaluate("regular-parking", "CAM-01", "fielddetection", "vehicle", NOON) == {}
+        assert "intrusion" in e.evaluate(NO_REGION, "CAM-01", "fielddetection", "vehicle", NOON)
+
+    def test_after_hours_zone_follows_schedule(self):
+        e = default_engine()
+        assert e.evaluate("after-hours-zone", "CAM-01", "fielddetection", "vehicle", NOON) == {}
+        assert "intrusion" in e.evaluate("after-hours-zone", "CAM-01", "fielddetection", "vehicle", NIGHT)
+
+    def test_linedetection_beats_dwell_rule(self):
+        rule = default_engine().evaluate("loading-bay", "CAM-01", "linedetection", "vehicle", NOON)["violation"]
+        assert rule.event_type == "linedetection" and not rule.dwell_seconds
+
+    def test_camera_specific_rule_and_days(self):
+        e = RuleEngine([
+            CompiledRule(1, "violation", zone_id="gate-a", camera_id="CAM-09", days=frozenset({5, 6})),
+            CompiledRule(2, "violation", zone_id="gate-a", priority=-1, dwell_seconds=60),
+        ])
+        assert e.evaluate("gate-a", "CAM-09", "fielddetection", None, NOON)["violation"].id == 2   # Monday
+        assert e.evaluate("gate-a", "CAM-09", "fielddetection", None, datetime(2026, 3, 7, 12))["violation"].id == 1
+
+    def test_load_seeds_empty_table(self):
+        db = MagicMock()
+        db.query.return_value.count.return_value = 0
+        db.query.return_value.filter.return_value.all.return_value = []
+        e = RuleEngine()
+        e.load(db)
+        db.add_all.assert_called_once()
+        db.commit.assert_called_once()
+        assert e.loaded and len(e) == 0